@@ -0,0 +1,163 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+
+TELEMETRY_RECEIVE_PATH = "/api/telemetry/receive"
+TELEMETRY_BATCH_PATH = "/api/telemetry/receive/batch"
+SLEEP_RECORDS_PATH = "/api/SleepRecords"
+DAILY_DIET_PLANS_PATH = "/api/dailydietplans"
+LATEST_DIET_PLAN_ORDER = "-dailyDietPlanId"
+GENERATE_DIET_PLAN_PATH = "/api/dailydietplans/generate"
+RECIPES_PATH = "/api/recipes"
+DAILY_STATISTICS_PATH = "/api/statistics/daily"
+WEEKLY_STATISTICS_PATH = "/api/statistics/weekly"
+USER_PROFILES_PATH = "/api/userprofiles"
+RECOMMENDATIONS_PATH = "/api/recommendations/corrections"
+
+
+def idempotency_key(device_id: int, sequence: int) -> str:
+    return f"{device_id}-{sequence}"
+
+
+def build_telemetry_payload(device_id: int, telemetry_type: int, value: float,
+                            timestamp: Union[datetime, str], metadata: Optional[Dict] = None,
+                            key: Optional[str] = None) -> Dict:
+    payload = {
+        "deviceId": device_id,
+        "timestamp": timestamp if isinstance(timestamp, str) else timestamp.isoformat(),
+        "telemetryType": telemetry_type,
+        "value": float(value),
+        "metadata": metadata
+    }
+    if key is not None:
+        payload["idempotencyKey"] = key
+    return payload
+
+
+def build_telemetry_batch_payload(items: List[Dict]) -> Dict:
+    return {
+        "items": items
+    }
+
+
+def build_sleep_record_payload(device_id: int, sleep_data: Dict, key: Optional[str] = None) -> Dict:
+    payload = {
+        "deviceId": device_id,
+        **sleep_data
+    }
+    if key is not None:
+        payload.setdefault("idempotencyKey", key)
+    
+    if 'date' in payload and isinstance(payload['date'], datetime):
+        payload['date'] = payload['date'].date().isoformat()
+    if 'startTime' in payload and isinstance(payload['startTime'], datetime):
+        payload['startTime'] = payload['startTime'].isoformat()
+    if 'endTime' in payload and isinstance(payload['endTime'], datetime):
+        payload['endTime'] = payload['endTime'].isoformat()
+    
+    return payload
+
+
+def build_generate_diet_plan_payload(user_id: int, date: Optional[str] = None) -> Dict:
+    if date is None:
+        date = datetime.now().strftime('%Y-%m-%d')
+    
+    return {
+        "userId": user_id,
+        "date": date
+    }
+
+
+def daily_diet_plan_meals_path(plan_id: int) -> str:
+    return f"{DAILY_DIET_PLANS_PATH}/{plan_id}/meals"
+
+
+def recipe_path(recipe_id: int) -> str:
+    return f"{RECIPES_PATH}/{recipe_id}"
+
+
+def daily_statistics_path(date: datetime) -> str:
+    return f"{DAILY_STATISTICS_PATH}/{date.strftime('%Y-%m-%d')}"
+
+
+def weekly_statistics_path(start_date: datetime) -> str:
+    return f"{WEEKLY_STATISTICS_PATH}/{start_date.strftime('%Y-%m-%d')}"
+
+
+def week_start(date: datetime) -> datetime:
+    return date - timedelta(days=date.weekday())
+
+
+def user_profile_path(profile_id: int) -> str:
+    return f"{USER_PROFILES_PATH}/{profile_id}"
+
+
+def user_profile_details_path(profile_id: int) -> str:
+    return f"{USER_PROFILES_PATH}/{profile_id}/details"
+
+
+def list_query_params(params: Dict, limit: Optional[int] = None, order_by: Optional[str] = None) -> Dict:
+    params = dict(params)
+    if limit is not None:
+        params['limit'] = limit
+    if order_by:
+        params['orderBy'] = order_by
+    return params
+
+
+def payload_date(payload: Dict, *fields: str) -> Optional[datetime]:
+    for field in fields:
+        value = payload.get(field)
+        if isinstance(value, datetime):
+            return value
+        if isinstance(value, str):
+            try:
+                return datetime.strptime(value[:10], '%Y-%m-%d')
+            except ValueError:
+                continue
+    return None
+
+
+def as_list(data: Any) -> List:
+    return data if isinstance(data, list) else []
+
+
+def meal_recipe_ids(meals: Any) -> List[int]:
+    recipe_ids = []
+    for meal in as_list(meals):
+        if not isinstance(meal, dict):
+            continue
+        for recipe in as_list(meal.get('mealRecipes', meal.get('MealRecipes', []))):
+            if isinstance(recipe, dict):
+                recipe_id = recipe.get('recipeId', recipe.get('RecipeId'))
+                if recipe_id:
+                    recipe_ids.append(recipe_id)
+    return recipe_ids
+
+
+def extract_generated_plan_id(data: Any) -> Optional[int]:
+    if not isinstance(data, dict):
+        return None
+    
+    plan = data.get('plan')
+    if isinstance(plan, dict) and plan.get('dailyDietPlanId'):
+        return plan.get('dailyDietPlanId')
+    
+    return data.get('dailyDietPlanId')
+
+
+def latest_diet_plan_id(plans: Iterable[Any], date: Optional[datetime] = None) -> Optional[int]:
+    day = date.strftime('%Y-%m-%d') if date is not None else None
+    latest = latest_same_day = None
+    
+    for plan in plans or ():
+        if not isinstance(plan, dict) or not plan.get('dailyDietPlanId'):
+            continue
+        plan_id = plan['dailyDietPlanId']
+        if latest is None or plan_id > latest:
+            latest = plan_id
+        if day is not None and str(plan.get('dailyPlanCreatedAt') or '').startswith(day):
+            if latest_same_day is None or plan_id > latest_same_day:
+                latest_same_day = plan_id
+    
+    return latest_same_day if latest_same_day is not None else latest
@@ -0,0 +1,100 @@
+import argparse
+import json
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Tuple
+
+from api_payloads import build_telemetry_payload
+from payload_builder import JSON_BACKEND, TelemetryPayloadBuilder, decode_json, encode_json
+
+
+def generate_samples(count: int) -> List[Tuple[int, float, datetime]]:
+    started_at = datetime.now().replace(microsecond=0)
+    samples = []
+    for i in range(count):
+        telemetry_type = i % 2
+        value = float(random.randint(60, 180) if telemetry_type == 0 else random.randint(0, 50))
+        samples.append((telemetry_type, value, started_at + timedelta(seconds=i // 2)))
+    return samples
+
+
+def encode_baseline(device_id: int, samples: List[Tuple[int, float, datetime]]) -> List[bytes]:
+    return [json.dumps(build_telemetry_payload(device_id, telemetry_type, value, timestamp.isoformat())).encode('utf-8')
+            for telemetry_type, value, timestamp in samples]
+
+
+def encode_builder(device_id: int, samples: List[Tuple[int, float, datetime]]) -> List[bytes]:
+    builder = TelemetryPayloadBuilder(device_id)
+    encode = builder.encode
+    return [encode(telemetry_type, value, timestamp) for telemetry_type, value, timestamp in samples]
+
+
+def encode_builder_dicts(device_id: int, samples: List[Tuple[int, float, datetime]]) -> List[bytes]:
+    builder = TelemetryPayloadBuilder(device_id)
+    build = builder.build
+    return [encode_json(build(telemetry_type, value, timestamp)) for telemetry_type, value, timestamp in samples]
+
+
+def measure(func: Callable, repeats: int) -> Dict:
+    best = None
+    for _ in range(repeats):
+        started_at = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started_at
+        best = elapsed if best is None else min(best, elapsed)
+    
+    tracemalloc.start()
+    output = func()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del output
+    
+    return {
+        "time": best,
+        "peak": peak,
+        "retained": retained
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Мікробенчмарк побудови та серіалізації телеметрії")
+    parser.add_argument('--samples', type=int, default=100000)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--device-id', type=int, default=1)
+    args = parser.parse_args()
+    
+    samples = generate_samples(args.samples)
+    baseline_bodies = encode_baseline(args.device_id, samples)
+    variants = [
+        ("dict + json.dumps", lambda: encode_baseline(args.device_id, samples)),
+        (f"builder dict + {JSON_BACKEND}", lambda: encode_builder_dicts(args.device_id, samples)),
+        ("builder encode", lambda: encode_builder(args.device_id, samples))
+    ]
+    
+    for name, func in variants[1:]:
+        if [decode_json(body) for body in func()] != [json.loads(body) for body in baseline_bodies]:
+            raise AssertionError(f"Варіант '{name}' формує інший JSON")
+    
+    print(f"Записів: {args.samples}, JSON-бекенд: {JSON_BACKEND}")
+    print(f"{'варіант':>28} {'нс/запис':>10} {'записів/с':>12} {'пік, КБ':>10} {'утримано, КБ':>13}")
+    baseline = None
+    for name, func in variants:
+        result = measure(func, args.repeats)
+        baseline = baseline or result
+        print(f"{name:>28} {result['time'] / args.samples * 1e9:>10.0f} "
+              f"{args.samples / result['time']:>12.0f} {result['peak'] / 1024:>10.0f} {result['retained'] / 1024:>13.0f}"
+              + ("" if result is baseline else f"   (x{baseline['time'] / result['time']:.1f})"))
+    
+    items = [decode_json(body) for body in baseline_bodies]
+    batch = {"items": items}
+    stdlib_batch = measure(lambda: json.dumps(batch).encode('utf-8'), args.repeats)
+    backend_batch = measure(lambda: encode_json(batch), args.repeats)
+    print(f"Батч {len(items)} записів: json.dumps {stdlib_batch['time'] * 1000:.1f} мс, "
+          f"{JSON_BACKEND} {backend_batch['time'] * 1000:.1f} мс "
+          f"(x{stdlib_batch['time'] / backend_batch['time']:.1f})")
+
+
+if __name__ == '__main__':
+    main()
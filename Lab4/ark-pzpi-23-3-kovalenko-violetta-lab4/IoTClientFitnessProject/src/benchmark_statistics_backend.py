@@ -0,0 +1,75 @@
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Tuple
+
+from statistics_backend import BACKEND_NUMPY, BACKEND_PYTHON, default_backend
+from statistics_calculator import METRIC_HEART_RATE, StatisticsCalculator
+
+
+def generate_samples(count: int, days: int) -> Tuple[List[datetime], List[float]]:
+    started_at = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=days)
+    timestamps = sorted(started_at + timedelta(seconds=random.randrange(days * 86400)) for _ in range(count))
+    values = [float(random.randint(50, 190)) for _ in range(count)]
+    return timestamps, values
+
+
+def ingest(backend: str, timestamps: List[datetime], values: List[float]) -> StatisticsCalculator:
+    calculator = StatisticsCalculator(backend)
+    calculator.add_heart_rate_many(timestamps, values)
+    return calculator
+
+
+def report(calculator: StatisticsCalculator, start: datetime, days: int) -> List:
+    results = []
+    for offset in range(days):
+        date = start + timedelta(days=offset)
+        results.append(calculator.get_daily_heart_rate_stats(date))
+        results.append(calculator.get_heart_rate_zones(date))
+    results.append(calculator.get_weekly_heart_rate_trend(start))
+    for bucket in ('1d', '1h', '15m'):
+        results.append(calculator.aggregate(METRIC_HEART_RATE, start, start + timedelta(days=days), bucket))
+    return results
+
+
+def measure(func: Callable, repeats: int) -> float:
+    best = None
+    for _ in range(repeats):
+        started_at = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started_at
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Порівняння бекендів статистики пульсу")
+    parser.add_argument('--samples', type=int, default=200000)
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+    
+    if default_backend() != BACKEND_NUMPY:
+        print("NumPy не встановлено, доступний лише бекенд 'python' (pip install numpy)")
+        return
+    
+    timestamps, values = generate_samples(args.samples, args.days)
+    start = timestamps[0].replace(hour=0, minute=0, second=0, microsecond=0)
+    calculators: Dict[str, StatisticsCalculator] = {
+        backend: ingest(backend, timestamps, values) for backend in (BACKEND_PYTHON, BACKEND_NUMPY)
+    }
+    if report(calculators[BACKEND_PYTHON], start, args.days) != report(calculators[BACKEND_NUMPY], start, args.days):
+        raise AssertionError("Бекенд 'numpy' повертає інші результати, ніж 'python'")
+    
+    print(f"Записів: {args.samples}, днів: {args.days}")
+    print(f"{'бекенд':>8} {'завантаження, мс':>17} {'інтервали 15m, мс':>18}")
+    for backend, calculator in calculators.items():
+        ingest_time = measure(lambda: ingest(backend, timestamps, values), args.repeats)
+        bucket_time = measure(lambda: calculator.aggregate(METRIC_HEART_RATE, start, start + timedelta(days=args.days),
+                                                           '15m'), args.repeats)
+        print(f"{backend:>8} {ingest_time * 1000:>17.1f} {bucket_time * 1000:>18.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+import math
+from typing import Dict, Iterable, Optional
+
+
+class DailyAggregate:
+    
+    __slots__ = ('count', 'total', 'minimum', 'maximum', 'sum_squares', 'dirty', 'derived')
+    
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.minimum: Optional[float] = None
+        self.maximum: Optional[float] = None
+        self.sum_squares = 0.0
+        self.dirty = True
+        self.derived = {}
+    
+    @classmethod
+    def from_values(cls, values: Iterable[float]) -> "DailyAggregate":
+        aggregate = cls()
+        for value in values:
+            aggregate.add(value)
+        return aggregate
+    
+    def add(self, value: float):
+        value = float(value)
+        self.count += 1
+        self.total += value
+        self.sum_squares += value * value
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+        self.dirty = True
+    
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+    
+    @property
+    def std_dev(self) -> Optional[float]:
+        if not self.count:
+            return None
+        mean = self.total / self.count
+        return math.sqrt(max(0.0, self.sum_squares / self.count - mean * mean))
+    
+    def summary(self) -> Dict:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "min": self.minimum,
+            "max": self.maximum,
+            "avg": self.mean,
+            "stdDev": self.std_dev
+        }
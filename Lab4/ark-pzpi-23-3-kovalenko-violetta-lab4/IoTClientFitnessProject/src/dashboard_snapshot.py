@@ -0,0 +1,111 @@
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, Hashable, Iterable, List, Optional
+
+from api_payloads import meal_recipe_ids
+
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_PARTS = ('daily', 'weekly', 'recommendations', 'profile', 'dietPlan', 'recipes')
+
+STATUS_OK = 'ok'
+STATUS_EMPTY = 'empty'
+STATUS_TIMEOUT = 'timeout'
+STATUS_ERROR = 'error'
+STATUS_SKIPPED = 'skipped'
+
+FAILED_STATUSES = (STATUS_TIMEOUT, STATUS_ERROR)
+
+
+def dashboard_deadlines(config: Dict) -> Dict[str, float]:
+    dashboard_config = config.get('dashboard', {})
+    default = float(dashboard_config.get('deadline', 10))
+    overrides = dashboard_config.get('part_deadlines', {})
+    deadlines = {part: float(overrides.get(part, default)) for part in DASHBOARD_PARTS}
+    deadlines['recipes'] = max(deadlines['recipes'], deadlines['dietPlan'])
+    return deadlines
+
+
+class DashboardSnapshot:
+    
+    def __init__(self, user_id, date: datetime, deadlines: Dict[str, float]):
+        self.user_id = user_id
+        self.date = date
+        self.started_at = time.monotonic()
+        self._deadlines = {part: self.started_at + deadlines[part] for part in DASHBOARD_PARTS}
+        self.data: Dict[str, Any] = {part: None for part in DASHBOARD_PARTS}
+        self.parts: Dict[str, Dict] = {}
+        self._pending_recipes = 0
+    
+    def time_left(self, parts: Iterable[str]) -> float:
+        return max(0.0, min(self._deadlines[part] for part in parts) - time.monotonic())
+    
+    def is_expired(self, part: str) -> bool:
+        return time.monotonic() >= self._deadlines[part]
+    
+    def resolve(self, part: str, key: Hashable, future) -> List[int]:
+        try:
+            value = future.result()
+        except Exception as e:
+            logger.warning("[API] Частину панелі '%s' не отримано: %s", part, e)
+            if part == 'recipes':
+                return self._add_recipe(key, None)
+            self._mark(part, STATUS_ERROR, str(e) or type(e).__name__)
+            if part == 'dietPlan':
+                self._mark('recipes', STATUS_SKIPPED)
+            return []
+        
+        if part == 'recipes':
+            return self._add_recipe(key, value)
+        
+        self.data[part] = value
+        self._mark(part, STATUS_OK if value else STATUS_EMPTY)
+        if part != 'dietPlan':
+            return []
+        if not isinstance(value, dict):
+            self._mark('recipes', STATUS_SKIPPED)
+            return []
+        
+        recipe_ids = list(dict.fromkeys(meal_recipe_ids(value.get('meals', []))))
+        self.data['recipes'] = {}
+        self._pending_recipes = len(recipe_ids)
+        if not recipe_ids:
+            self._mark('recipes', STATUS_EMPTY)
+        return recipe_ids
+    
+    def expire(self, part: str):
+        if part in self.parts:
+            return
+        logger.warning("[API] Частина панелі '%s' не встигла за %.1f сек", part,
+                       self._deadlines[part] - self.started_at)
+        self._mark(part, STATUS_TIMEOUT)
+    
+    def to_dict(self) -> Dict:
+        parts = {part: self.parts.get(part, {"status": STATUS_SKIPPED}) for part in DASHBOARD_PARTS}
+        failed = [part for part, entry in parts.items() if entry['status'] in FAILED_STATUSES]
+        
+        return {
+            "userId": self.user_id,
+            "date": self.date.strftime('%Y-%m-%d'),
+            "elapsed": round(time.monotonic() - self.started_at, 3),
+            "complete": not failed,
+            "failed": failed,
+            "parts": parts,
+            **self.data
+        }
+    
+    def _add_recipe(self, recipe_id: int, recipe: Optional[Dict]) -> List[int]:
+        if recipe is not None:
+            self.data['recipes'][recipe_id] = recipe
+        self._pending_recipes -= 1
+        if self._pending_recipes == 0:
+            self._mark('recipes', STATUS_OK if self.data['recipes'] else STATUS_EMPTY)
+        return []
+    
+    def _mark(self, part: str, status: str, error: Optional[str] = None):
+        entry = {"status": status, "elapsed": round(time.monotonic() - self.started_at, 3)}
+        if error is not None:
+            entry["error"] = error
+        self.parts[part] = entry
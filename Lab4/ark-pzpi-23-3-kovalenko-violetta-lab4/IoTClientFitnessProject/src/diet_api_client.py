@@ -1,5 +1,13 @@
-from typing import Dict, List, Optional
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
 from base_api_client import BaseApiClient
+from api_payloads import (DAILY_DIET_PLANS_PATH, GENERATE_DIET_PLAN_PATH, LATEST_DIET_PLAN_ORDER, as_list,
+                          build_generate_diet_plan_payload, daily_diet_plan_meals_path,
+                          extract_generated_plan_id, latest_diet_plan_id, list_query_params, recipe_path)
+
+
+logger = logging.getLogger(__name__)
 
 
 class DietApiClient(BaseApiClient):
@@ -8,47 +16,53 @@ class DietApiClient(BaseApiClient):
         if user_id is None:
             user_id = self.user_id
         
-        url = f"{self.base_url}/api/dailydietplans"
+        url = f"{self.base_url}{DAILY_DIET_PLANS_PATH}"
         params = {"userId": user_id}
         
-        print(f"[API] Запит планів дієти: user_id={user_id}")
+        logger.debug("[API] Запит планів дієти: user_id=%s", user_id)
         response = self._make_request('GET', url, params=params)
         
         if response:
-            plans = response.json()
-            print(f"[API] Отримано планів: {len(plans) if isinstance(plans, list) else 'не список'}")
-            if isinstance(plans, list) and len(plans) > 0:
-                for i, plan in enumerate(plans):
-                    plan_id = plan.get('dailyDietPlanId')
-                    plan_date = plan.get('dailyPlanCreatedAt', 'N/A')
-                    print(f"[API]   План {i+1}: ID={plan_id}, дата={plan_date}")
-            return plans if isinstance(plans, list) else []
+            plans = as_list(response.json())
+            logger.debug("[API] Отримано планів: %d", len(plans))
+            if logger.isEnabledFor(logging.DEBUG):
+                for i, plan in enumerate(plans, 1):
+                    logger.debug("[API]   План %d: ID=%s, дата=%s", i, plan.get('dailyDietPlanId'),
+                                 plan.get('dailyPlanCreatedAt', 'N/A'))
+            return plans
         return []
     
+    def iter_daily_diet_plans(self, user_id: Optional[int] = None, limit: Optional[int] = None,
+                              order_by: Optional[str] = None) -> Iterator[Dict]:
+        if user_id is None:
+            user_id = self.user_id
+        
+        url = f"{self.base_url}{DAILY_DIET_PLANS_PATH}"
+        plans = self._open_json_stream(url, list_query_params({"userId": user_id}, limit, order_by), limit)
+        return plans if plans is not None else iter(())
+    
+    def get_latest_daily_diet_plan_id(self, user_id: Optional[int] = None,
+                                      date: Optional[datetime] = None) -> Optional[int]:
+        if user_id is None:
+            user_id = self.user_id
+        
+        if date is not None:
+            return latest_diet_plan_id(self.iter_daily_diet_plans(user_id), date)
+        
+        url = f"{self.base_url}{DAILY_DIET_PLANS_PATH}"
+        params = list_query_params({"userId": user_id}, 1, LATEST_DIET_PLAN_ORDER)
+        return latest_diet_plan_id(self._open_json_stream(url, params))
+    
     def get_daily_diet_plan(self, plan_id: int) -> Optional[Dict]:
-        url = f"{self.base_url}/api/dailydietplans/{plan_id}/meals"
+        url = f"{self.base_url}{daily_diet_plan_meals_path(plan_id)}"
         
-        print(f"[API] Запит плану дієти: plan_id={plan_id}")
+        logger.debug("[API] Запит плану дієти: plan_id=%s", plan_id)
         response = self._make_request('GET', url)
         
         if response:
             data = response.json()
-            print(f"[API] Отримано план дієти: {list(data.keys()) if isinstance(data, dict) else type(data)}")
-            if isinstance(data, dict):
-                meals = data.get('meals', [])
-                print(f"[API] ========== ДАНІ ВІД СЕРВЕРА ==========")
-                print(f"[API] Знайдено прийомів їжі: {len(meals)}")
-                if meals:
-                    print(f"[API] Перший прийом ключі: {list(meals[0].keys()) if isinstance(meals[0], dict) else type(meals[0])}")
-                    for i, meal in enumerate(meals, 1):
-                        if isinstance(meal, dict):
-                            print(f"[API] Прийом {i}: mealTime={meal.get('mealTime', meal.get('MealTime', 'N/A'))}, "
-                                  f"mealOrder={meal.get('mealOrder', meal.get('MealOrder', 'N/A'))}, "
-                                  f"mealId={meal.get('mealId', meal.get('MealId', 'N/A'))}")
-                        else:
-                            print(f"[API] Прийом {i}: НЕ СЛОВНИК! Тип: {type(meal)}")
-                else:
-                    print(f"[API] ПРИЙОМІВ НЕ ЗНАЙДЕНО! Структура даних: {list(data.keys())}")
+            if logger.isEnabledFor(logging.DEBUG):
+                self._log_diet_plan(data)
             return data
         return None
     
@@ -56,43 +70,59 @@ class DietApiClient(BaseApiClient):
         if user_id is None:
             user_id = self.user_id
         
-        from datetime import datetime
-        if date is None:
-            date = datetime.now().strftime('%Y-%m-%d')
+        url = f"{self.base_url}{GENERATE_DIET_PLAN_PATH}"
+        payload = build_generate_diet_plan_payload(user_id, date)
         
-        url = f"{self.base_url}/api/dailydietplans/generate"
-        payload = {
-            "userId": user_id,
-            "date": date
-        }
-        
-        print(f"[API] Генерація нового плану дієти: user_id={user_id}, date={date}")
+        logger.info("[API] Генерація нового плану дієти: user_id=%s, date=%s", user_id, payload['date'])
         response = self._make_request('POST', url, payload=payload)
         
         if response:
+            self.invalidate_cache(DAILY_DIET_PLANS_PATH)
             data = response.json()
-            print(f"[API] План дієти згенеровано")
-            print(f"[API] Структура відповіді: {list(data.keys()) if isinstance(data, dict) else type(data)}")
-            
-            if isinstance(data, dict):
-                plan = data.get('plan', {})
-                if plan:
-                    plan_id = plan.get('dailyDietPlanId')
-                    print(f"[API] ID згенерованого плану: {plan_id}")
-                else:
-                    plan_id = data.get('dailyDietPlanId')
-                    if plan_id:
-                        print(f"[API] ID згенерованого плану (в корені): {plan_id}")
-            
+            logger.info("[API] План дієти згенеровано, ID=%s", extract_generated_plan_id(data))
             return data
         return None
     
     def get_recipe(self, recipe_id: int) -> Optional[Dict]:
-        url = f"{self.base_url}/api/recipes/{recipe_id}"
+        url = f"{self.base_url}{recipe_path(recipe_id)}"
         
         response = self._make_request('GET', url)
         
         if response:
             return response.json()
         return None
+    
+    def get_recipes(self, recipe_ids: Iterable[int]) -> Dict[int, Dict]:
+        unique_ids = list(dict.fromkeys(recipe_id for recipe_id in recipe_ids if recipe_id))
+        if len(unique_ids) > 1:
+            results = self._get_worker_pool().map(self._fetch_recipe, unique_ids)
+        else:
+            results = map(self._fetch_recipe, unique_ids)
+        
+        recipes = {recipe_id: recipe for recipe_id, recipe in zip(unique_ids, results) if recipe is not None}
+        logger.debug("[API] Завантажено рецептів: %d з %d", len(recipes), len(unique_ids))
+        return recipes
+    
+    def _fetch_recipe(self, recipe_id: int) -> Optional[Dict]:
+        try:
+            return self.get_recipe(recipe_id)
+        except ValueError as e:
+            logger.warning("[API] Помилка парсингу рецепта %s: %s", recipe_id, e)
+            return None
+    
+    def _log_diet_plan(self, data):
+        if not isinstance(data, dict):
+            logger.debug("[API] Отримано план дієти: %s", type(data))
+            return
+        
+        meals = data.get('meals', [])
+        logger.debug("[API] Отримано план дієти: %s, прийомів їжі: %d", list(data.keys()), len(meals))
+        for i, meal in enumerate(meals, 1):
+            if isinstance(meal, dict):
+                logger.debug("[API] Прийом %d: mealTime=%s, mealOrder=%s, mealId=%s", i,
+                             meal.get('mealTime', meal.get('MealTime', 'N/A')),
+                             meal.get('mealOrder', meal.get('MealOrder', 'N/A')),
+                             meal.get('mealId', meal.get('MealId', 'N/A')))
+            else:
+                logger.debug("[API] Прийом %d: не словник, тип: %s", i, type(meal))
 
@@ -0,0 +1,118 @@
+import math
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence
+
+
+MIN_BPM = 30
+MAX_BPM = 230
+ZONE_LIMITS = (0.5, 0.6, 0.7, 0.8, 0.9)
+DEFAULT_MAX_HEART_RATE = 190
+
+
+def percentile_of(kth: Callable[[int], float], count: int, percent: float) -> float:
+    rank = min(100.0, max(0.0, float(percent))) / 100 * (count - 1)
+    low = math.floor(rank)
+    lower = kth(low)
+    if rank == low:
+        return float(lower)
+    upper = kth(low + 1)
+    return float(lower + (upper - lower) * (rank - low))
+
+
+def median_of(kth: Callable[[int], float], count: int) -> float:
+    middle = count // 2
+    if count % 2:
+        return float(kth(middle))
+    return float((kth(middle - 1) + kth(middle)) / 2)
+
+
+def zone_bounds(max_heart_rate: float = DEFAULT_MAX_HEART_RATE) -> List[int]:
+    return [math.ceil(max_heart_rate * limit) for limit in ZONE_LIMITS]
+
+
+def zone_table(bounds: Sequence[int], count_below: Callable[[int], int], count: int) -> List[Dict]:
+    edges = [MIN_BPM] + [min(MAX_BPM + 1, max(MIN_BPM, bound)) for bound in bounds] + [MAX_BPM + 1]
+    below = [0] + [count_below(edge) for edge in edges[1:-1]] + [count]
+    zones = []
+    for zone in range(len(edges) - 1):
+        samples = below[zone + 1] - below[zone]
+        zones.append({
+            "zone": zone,
+            "minBpm": edges[zone],
+            "maxBpm": edges[zone + 1] - 1,
+            "samples": samples,
+            "share": round(samples / count, 4) if count else 0.0
+        })
+    return zones
+
+
+class HeartRateHistogram:
+    
+    __slots__ = ('bins', 'count', 'outliers')
+    
+    def __init__(self):
+        self.bins = [0] * (MAX_BPM - MIN_BPM + 1)
+        self.count = 0
+        self.outliers = 0
+    
+    @classmethod
+    def from_values(cls, values: Iterable[float]) -> "HeartRateHistogram":
+        histogram = cls()
+        for value in values:
+            histogram.add(value)
+        return histogram
+    
+    @property
+    def exact(self) -> bool:
+        return self.outliers == 0
+    
+    def add(self, value: float):
+        self.count += 1
+        if not MIN_BPM <= value <= MAX_BPM or value != int(value):
+            self.outliers += 1
+            return
+        self.bins[int(value) - MIN_BPM] += 1
+    
+    def kth(self, index: int) -> int:
+        seen = 0
+        for offset, samples in enumerate(self.bins):
+            seen += samples
+            if seen > index:
+                return MIN_BPM + offset
+        raise IndexError(index)
+    
+    def median(self) -> float:
+        return median_of(self.kth, self.count)
+    
+    def percentile(self, percent: float) -> float:
+        return percentile_of(self.kth, self.count, percent)
+    
+    def count_below(self, bpm: int) -> int:
+        return sum(self.bins[:max(0, bpm - MIN_BPM)])
+    
+    def zones(self, bounds: Sequence[int]) -> List[Dict]:
+        return zone_table(bounds, self.count_below, self.count)
+
+
+class SortedSamples:
+    
+    __slots__ = ('values', 'count')
+    
+    def __init__(self, values: Iterable[float]):
+        self.values = sorted(values)
+        self.count = len(self.values)
+    
+    def kth(self, index: int) -> float:
+        return self.values[index]
+    
+    def median(self) -> float:
+        return median_of(self.kth, self.count)
+    
+    def percentile(self, percent: float) -> float:
+        return percentile_of(self.kth, self.count, percent)
+    
+    def count_below(self, bpm: int) -> int:
+        return bisect_left(self.values, bpm)
+    
+    def zones(self, bounds: Sequence[int]) -> List[Dict]:
+        return zone_table(bounds, self.count_below, self.count)
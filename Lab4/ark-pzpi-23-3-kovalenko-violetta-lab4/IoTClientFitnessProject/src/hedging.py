@@ -0,0 +1,124 @@
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+from request_metrics import MetricsSink
+
+
+HEDGE_PRIMARY = 'primary'
+HEDGE_SECONDARY = 'hedge'
+
+
+def is_answer(future) -> bool:
+    if future.cancelled() or future.exception() is not None:
+        return False
+    return future.result().status_code < 500
+
+
+def first_answer(done: Iterable) -> Optional[Any]:
+    return next((future for future in done if is_answer(future)), None)
+
+
+def discard_response(future):
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+class HedgePolicy:
+    
+    def __init__(self, percentile: float = 0.95, min_delay: float = 0.05, max_delay: float = 2.0,
+                 min_samples: int = 20, max_ratio: float = 0.1, endpoints=None, max_workers: int = 16):
+        self.percentile = min(0.999, max(0.5, float(percentile)))
+        self.min_delay = max(0.0, float(min_delay))
+        self.max_delay = max(self.min_delay, float(max_delay))
+        self.min_samples = max(1, int(min_samples))
+        self.max_ratio = max(0.0, float(max_ratio))
+        self.endpoints = {endpoint.lower() for endpoint in endpoints} if endpoints else None
+        self.max_workers = max(2, int(max_workers))
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+    
+    def delay_for(self, endpoint: str, metrics: MetricsSink) -> Optional[float]:
+        if not endpoint.startswith('GET ') or (self.endpoints is not None and endpoint.lower() not in self.endpoints):
+            return None
+        if metrics.sample_count(endpoint) < self.min_samples:
+            return None
+        latency = metrics.percentile(endpoint, self.percentile)
+        if latency is None:
+            return None
+        
+        with self._lock:
+            self._get(endpoint)['eligible'] += 1
+        return min(self.max_delay, max(self.min_delay, latency))
+    
+    def start(self, endpoint: str, has_capacity: bool = True) -> bool:
+        with self._lock:
+            counters = self._get(endpoint)
+            if not has_capacity:
+                counters['throttled'] += 1
+                return False
+            if counters['hedged'] + 1 > self.max_ratio * counters['eligible']:
+                counters['budgetExhausted'] += 1
+                return False
+            counters['hedged'] += 1
+            return True
+    
+    def record(self, endpoint: str, winner: Optional[str], cancelled: bool):
+        with self._lock:
+            counters = self._get(endpoint)
+            if winner == HEDGE_PRIMARY:
+                counters['primaryWins'] += 1
+            elif winner == HEDGE_SECONDARY:
+                counters['hedgeWins'] += 1
+            else:
+                counters['bothFailed'] += 1
+            if cancelled:
+                counters['cancelled'] += 1
+    
+    def get_stats(self) -> Dict:
+        with self._lock:
+            endpoints = {endpoint: dict(counters) for endpoint, counters in sorted(self._counters.items())}
+        
+        eligible = sum(counters['eligible'] for counters in endpoints.values())
+        hedged = sum(counters['hedged'] for counters in endpoints.values())
+        for counters in endpoints.values():
+            counters['hedgeRate'] = round(counters['hedged'] / counters['eligible'], 4) if counters['eligible'] else 0.0
+        return {
+            "percentile": self.percentile,
+            "maxRatio": self.max_ratio,
+            "eligible": eligible,
+            "hedged": hedged,
+            "hedgeRate": round(hedged / eligible, 4) if eligible else 0.0,
+            "primaryWins": sum(counters['primaryWins'] for counters in endpoints.values()),
+            "hedgeWins": sum(counters['hedgeWins'] for counters in endpoints.values()),
+            "endpoints": endpoints
+        }
+    
+    def _get(self, endpoint: str) -> Dict[str, int]:
+        counters = self._counters.get(endpoint)
+        if counters is None:
+            counters = self._counters[endpoint] = {
+                "eligible": 0,
+                "hedged": 0,
+                "budgetExhausted": 0,
+                "throttled": 0,
+                "primaryWins": 0,
+                "hedgeWins": 0,
+                "bothFailed": 0,
+                "cancelled": 0
+            }
+        return counters
+
+
+def create_hedge_policy(config: Dict) -> Optional[HedgePolicy]:
+    hedging_config = config.get('hedging', {})
+    if not hedging_config.get('enabled', False):
+        return None
+    return HedgePolicy(
+        percentile=hedging_config.get('percentile', 0.95),
+        min_delay=hedging_config.get('min_delay', 0.05),
+        max_delay=hedging_config.get('max_delay', 2.0),
+        min_samples=hedging_config.get('min_samples', 20),
+        max_ratio=hedging_config.get('max_ratio', 0.1),
+        endpoints=hedging_config.get('endpoints'),
+        max_workers=hedging_config.get('max_workers', 16)
+    )
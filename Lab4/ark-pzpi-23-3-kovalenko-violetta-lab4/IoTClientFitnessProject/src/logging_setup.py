@@ -0,0 +1,102 @@
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from typing import Dict, Optional
+
+
+FILE_FORMAT = '%(asctime)s %(levelname)-7s %(threadName)s %(name)s: %(message)s'
+CONSOLE_FORMAT = '%(message)s'
+
+_lock = threading.Lock()
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+_settings = None
+
+
+def parse_level(level) -> int:
+    if isinstance(level, int):
+        return level
+    value = logging.getLevelName(str(level).upper())
+    return value if isinstance(value, int) else logging.INFO
+
+
+def resolve_log_path(path: Optional[str]) -> Optional[str]:
+    if not path:
+        return None
+    if os.path.isabs(path):
+        return path
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_dir, path)
+
+
+def configure_logging(config: Dict) -> bool:
+    global _listener, _queue_handler, _settings
+    
+    logging_config = config.get('logging', {})
+    settings = (
+        parse_level(logging_config.get('level', 'INFO')),
+        resolve_log_path(logging_config.get('file')),
+        bool(logging_config.get('console', True)),
+        int(logging_config.get('max_bytes', 5 * 1024 * 1024)),
+        int(logging_config.get('backup_count', 3))
+    )
+    level, path, console, max_bytes, backup_count = settings
+    
+    with _lock:
+        if settings == _settings:
+            return False
+        
+        handlers = []
+        if console:
+            console_handler = logging.StreamHandler(sys.stdout)
+            console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+            handlers.append(console_handler)
+        if path:
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                file_handler = logging.handlers.RotatingFileHandler(
+                    path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8', delay=True
+                )
+                file_handler.setFormatter(logging.Formatter(FILE_FORMAT))
+                handlers.append(file_handler)
+            except OSError as e:
+                sys.stderr.write(f"[Logging] Не вдалося відкрити файл журналу {path}: {e}\n")
+        
+        _stop_listener()
+        root = logging.getLogger()
+        log_queue = queue.SimpleQueue()
+        _queue_handler = logging.handlers.QueueHandler(log_queue)
+        root.addHandler(_queue_handler)
+        root.setLevel(level)
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        _settings = settings
+        return True
+
+
+def shutdown_logging():
+    global _settings
+    
+    with _lock:
+        _stop_listener()
+        _settings = None
+
+
+def _stop_listener():
+    global _listener, _queue_handler
+    
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
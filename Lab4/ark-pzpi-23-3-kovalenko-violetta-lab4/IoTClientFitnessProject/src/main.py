@@ -40,6 +40,8 @@ def main():
         
         gui.run()
         
+        api_client.close()
+        
     except Exception as e:
         print(f"\nПомилка ініціалізації: {e}")
         import traceback
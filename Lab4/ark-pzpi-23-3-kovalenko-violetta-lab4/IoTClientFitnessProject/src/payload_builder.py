@@ -0,0 +1,90 @@
+import json
+import math
+from datetime import datetime
+from typing import Dict, List, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from api_payloads import build_telemetry_payload, idempotency_key
+from sequence_journal import SequenceJournal
+
+
+JSON_BACKEND = 'orjson' if orjson is not None else 'json'
+
+_json_encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), allow_nan=False)
+_TELEMETRY_TEMPLATE = '{"deviceId":%d,"timestamp":"%s","telemetryType":%d,"value":%r,"metadata":null}'
+_KEYED_TELEMETRY_TEMPLATE = _TELEMETRY_TEMPLATE[:-1] + ',"idempotencyKey":"%d-%d"}'
+
+
+def encode_json(payload) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload)
+        except TypeError:
+            pass
+    return _json_encoder.encode(payload).encode('utf-8')
+
+
+def decode_json(data: Union[bytes, str]):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class TelemetryPayloadBuilder:
+    
+    def __init__(self, device_id: int, journal: Optional[SequenceJournal] = None):
+        self.device_id = device_id
+        self.journal = journal
+        self._use_template = type(device_id) is int
+        self._last_timestamp = (None, None)
+    
+    def format_timestamp(self, timestamp: Union[datetime, str]) -> str:
+        last_timestamp, last_text = self._last_timestamp
+        if timestamp is last_timestamp:
+            return last_text
+        if isinstance(timestamp, str):
+            return timestamp
+        
+        text = timestamp.isoformat()
+        self._last_timestamp = (timestamp, text)
+        return text
+    
+    def next_key(self) -> Optional[str]:
+        if self.journal is None:
+            return None
+        return idempotency_key(self.device_id, self.journal.take(self.device_id))
+    
+    def with_keys(self, items: List[Dict]) -> List[Dict]:
+        if self.journal is None or all('idempotencyKey' in item for item in items):
+            return items
+        
+        keyed = []
+        for item in items:
+            if 'idempotencyKey' not in item:
+                device_id = item.get('deviceId', self.device_id)
+                item = {**item, "idempotencyKey": idempotency_key(device_id, self.journal.take(device_id))}
+            keyed.append(item)
+        return keyed
+    
+    def build(self, telemetry_type: int, value: float, timestamp: Union[datetime, str],
+              metadata: Optional[Dict] = None) -> Dict:
+        return build_telemetry_payload(self.device_id, telemetry_type, value,
+                                       self.format_timestamp(timestamp), metadata, self.next_key())
+    
+    def encode(self, telemetry_type: int, value: float, timestamp: Union[datetime, str],
+               metadata: Optional[Dict] = None) -> bytes:
+        value = float(value)
+        if (metadata is not None or not self._use_template or not isinstance(telemetry_type, int)
+                or not isinstance(timestamp, datetime) or not math.isfinite(value)):
+            return encode_json(self.build(telemetry_type, value, timestamp, metadata))
+        
+        if self.journal is not None:
+            return (_KEYED_TELEMETRY_TEMPLATE % (self.device_id, self.format_timestamp(timestamp), telemetry_type,
+                                                 value, self.device_id,
+                                                 self.journal.take(self.device_id))).encode('utf-8')
+        return (_TELEMETRY_TEMPLATE % (self.device_id, self.format_timestamp(timestamp),
+                                       telemetry_type, value)).encode('utf-8')
@@ -0,0 +1,59 @@
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from compression import CompressionNegotiator
+from payload_builder import encode_json
+from telemetry_codec import BatchFormatNegotiator
+
+
+class RequestBody:
+    
+    def __init__(self, url: str, compression: CompressionNegotiator,
+                 formats: Optional[BatchFormatNegotiator] = None,
+                 payload: Optional[Dict] = None, data: Optional[bytes] = None):
+        self.host = urlsplit(url).netloc
+        self.compression = compression
+        self.formats = formats
+        self.payload = payload
+        self.data = data
+        self.body: Optional[bytes] = None
+        self.wire_body: Optional[bytes] = None
+        self.content_type: Optional[str] = None
+        self.encoding: Optional[str] = None
+    
+    def encode(self, headers: Optional[Dict] = None) -> Dict:
+        if self.payload is not None and self.formats is not None:
+            self.body, self.content_type = self.formats.encode(self.host, self.payload)
+        elif self.payload is not None:
+            self.body, self.content_type = encode_json(self.payload), None
+        else:
+            self.body, self.content_type = self.data, None
+        
+        if self.body is not None:
+            self.wire_body, self.encoding = self.compression.encode(self.host, self.body)
+        else:
+            self.wire_body, self.encoding = None, None
+        
+        request_headers = dict(headers or {})
+        if self.content_type is not None:
+            request_headers['Content-Type'] = self.content_type
+        if self.encoding is not None:
+            request_headers['Content-Encoding'] = self.encoding
+        return request_headers
+    
+    def accept(self, response) -> bool:
+        if self.body is not None:
+            self.compression.record_request(len(self.body), len(self.wire_body), self.encoding)
+        
+        if self.formats is not None and self.formats.should_reject(response.headers, response.status_code,
+                                                                   self.content_type):
+            self.formats.reject(self.host, self.content_type, response.headers.get('Accept-Post'))
+            return False
+        if self.encoding is not None and self.compression.is_rejected(response.headers, response.status_code,
+                                                                      self.encoding, response.text):
+            self.compression.reject(self.host, self.encoding, response.headers.get('Accept-Encoding'))
+            return False
+        
+        if self.formats is not None and self.payload is not None:
+            self.formats.record(self.payload, self.body, self.content_type)
+        return True
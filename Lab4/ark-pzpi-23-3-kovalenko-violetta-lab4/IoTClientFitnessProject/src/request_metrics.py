@@ -0,0 +1,225 @@
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+METRIC_PREFIX = 'fitness_api_client'
+PERCENTILES = (0.5, 0.95, 0.99)
+
+
+def default_latency_buckets() -> List[float]:
+    buckets = []
+    bound = 0.001
+    while bound < 60:
+        buckets.append(round(bound, 6))
+        bound *= 1.25
+    buckets.append(60.0)
+    return buckets
+
+
+class LatencyHistogram:
+    
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = list(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def observe(self, seconds: float):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+    
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        
+        rank = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if not bucket_count or cumulative + bucket_count < rank:
+                cumulative += bucket_count
+                continue
+            lower = self.buckets[index - 1] if index > 0 else 0.0
+            upper = self.buckets[index] if index < len(self.buckets) else self.max
+            upper = min(upper, self.max)
+            lower = min(lower, upper)
+            return lower + (upper - lower) * (rank - cumulative) / bucket_count
+        return self.max
+    
+    def cumulative_counts(self) -> Iterable[Tuple[str, int]]:
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            cumulative += bucket_count
+            yield repr(bound), cumulative
+        yield '+Inf', self.count
+    
+    def snapshot(self) -> Dict:
+        summary = {f"p{int(q * 100)}": _round(self.percentile(q)) for q in PERCENTILES}
+        return {
+            "count": self.count,
+            "avg": _round(self.total / self.count) if self.count else None,
+            "max": _round(self.max) if self.count else None,
+            **summary
+        }
+
+
+class MetricsSink:
+    
+    def observe_latency(self, endpoint: str, seconds: float, outcome: str):
+        pass
+    
+    def increment(self, endpoint: str, name: str, value: int = 1):
+        pass
+    
+    def add_bytes(self, endpoint: str, sent: int = 0, received: int = 0):
+        pass
+    
+    def track_in_flight(self, endpoint: str, delta: int):
+        pass
+    
+    def percentile(self, endpoint: str, q: float) -> Optional[float]:
+        return None
+    
+    def sample_count(self, endpoint: str) -> int:
+        return 0
+    
+    def snapshot(self) -> Optional[Dict]:
+        return None
+    
+    def export_prometheus(self) -> str:
+        return ''
+
+
+class _EndpointMetrics:
+    
+    def __init__(self, buckets: Sequence[float]):
+        self.latency = LatencyHistogram(buckets)
+        self.outcomes: Dict[str, int] = {}
+        self.events: Dict[str, int] = {}
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+
+class InMemoryMetrics(MetricsSink):
+    
+    def __init__(self, buckets: Optional[Sequence[float]] = None):
+        self.buckets = sorted(buckets) if buckets else default_latency_buckets()
+        self._endpoints: Dict[str, _EndpointMetrics] = {}
+        self._lock = threading.Lock()
+    
+    def observe_latency(self, endpoint: str, seconds: float, outcome: str):
+        with self._lock:
+            metrics = self._get(endpoint)
+            metrics.latency.observe(seconds)
+            metrics.outcomes[outcome] = metrics.outcomes.get(outcome, 0) + 1
+    
+    def increment(self, endpoint: str, name: str, value: int = 1):
+        with self._lock:
+            events = self._get(endpoint).events
+            events[name] = events.get(name, 0) + value
+    
+    def add_bytes(self, endpoint: str, sent: int = 0, received: int = 0):
+        with self._lock:
+            metrics = self._get(endpoint)
+            metrics.bytes_sent += sent
+            metrics.bytes_received += received
+    
+    def track_in_flight(self, endpoint: str, delta: int):
+        with self._lock:
+            metrics = self._get(endpoint)
+            metrics.in_flight += delta
+            metrics.max_in_flight = max(metrics.max_in_flight, metrics.in_flight)
+    
+    def percentile(self, endpoint: str, q: float) -> Optional[float]:
+        with self._lock:
+            metrics = self._endpoints.get(endpoint)
+            return metrics.latency.percentile(q) if metrics is not None else None
+    
+    def sample_count(self, endpoint: str) -> int:
+        with self._lock:
+            metrics = self._endpoints.get(endpoint)
+            return metrics.latency.count if metrics is not None else 0
+    
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                endpoint: {
+                    "latency": metrics.latency.snapshot(),
+                    "outcomes": dict(metrics.outcomes),
+                    "events": dict(metrics.events),
+                    "bytesSent": metrics.bytes_sent,
+                    "bytesReceived": metrics.bytes_received,
+                    "inFlight": metrics.in_flight,
+                    "maxInFlight": metrics.max_in_flight
+                }
+                for endpoint, metrics in sorted(self._endpoints.items())
+            }
+    
+    def export_prometheus(self) -> str:
+        name = METRIC_PREFIX
+        lines = [
+            f"# HELP {name}_request_duration_seconds Тривалість HTTP-спроби до отримання відповіді",
+            f"# TYPE {name}_request_duration_seconds histogram"
+        ]
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+            for endpoint, metrics in endpoints:
+                label = _label(endpoint)
+                for bound, cumulative in metrics.latency.cumulative_counts():
+                    lines.append(f'{name}_request_duration_seconds_bucket{{endpoint="{label}",le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_request_duration_seconds_sum{{endpoint="{label}"}} {metrics.latency.total!r}')
+                lines.append(f'{name}_request_duration_seconds_count{{endpoint="{label}"}} {metrics.latency.count}')
+            
+            lines.append(f"# HELP {name}_responses_total Результати HTTP-спроб за кодом статусу або типом помилки")
+            lines.append(f"# TYPE {name}_responses_total counter")
+            for endpoint, metrics in endpoints:
+                for outcome, value in sorted(metrics.outcomes.items()):
+                    lines.append(f'{name}_responses_total{{endpoint="{_label(endpoint)}",outcome="{_label(outcome)}"}} {value}')
+            
+            lines.append(f"# HELP {name}_events_total Запити, повтори, таймаути та відмови клієнта")
+            lines.append(f"# TYPE {name}_events_total counter")
+            for endpoint, metrics in endpoints:
+                for event, value in sorted(metrics.events.items()):
+                    lines.append(f'{name}_events_total{{endpoint="{_label(endpoint)}",event="{_label(event)}"}} {value}')
+            
+            for metric, attribute, help_text in (
+                ('bytes_sent_total', 'bytes_sent', "Надіслано байтів у тілах запитів"),
+                ('bytes_received_total', 'bytes_received', "Отримано байтів у тілах відповідей")
+            ):
+                lines.append(f"# HELP {name}_{metric} {help_text}")
+                lines.append(f"# TYPE {name}_{metric} counter")
+                for endpoint, metrics in endpoints:
+                    lines.append(f'{name}_{metric}{{endpoint="{_label(endpoint)}"}} {getattr(metrics, attribute)}')
+            
+            lines.append(f"# HELP {name}_in_flight Запити, що виконуються зараз")
+            lines.append(f"# TYPE {name}_in_flight gauge")
+            for endpoint, metrics in endpoints:
+                lines.append(f'{name}_in_flight{{endpoint="{_label(endpoint)}"}} {metrics.in_flight}')
+        return '\n'.join(lines) + '\n'
+    
+    def _get(self, endpoint: str) -> _EndpointMetrics:
+        metrics = self._endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self._endpoints[endpoint] = _EndpointMetrics(self.buckets)
+        return metrics
+
+
+def create_metrics_sink(config: Dict) -> MetricsSink:
+    metrics_config = config.get('metrics', {})
+    if not metrics_config.get('enabled', True):
+        return MetricsSink()
+    return InMemoryMetrics(metrics_config.get('latency_buckets'))
+
+
+def _label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 4) if value is not None else None
@@ -0,0 +1,111 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+
+
+class CacheEntry:
+    
+    def __init__(self, response: Any, endpoint: str, ttl: float):
+        self.response = response
+        self.endpoint = endpoint
+        self.expires_at = time.monotonic() + ttl
+        self.etag = response.headers.get('ETag')
+        self.last_modified = response.headers.get('Last-Modified')
+    
+    def is_fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+    
+    def can_revalidate(self) -> bool:
+        return bool(self.etag or self.last_modified)
+    
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    
+    def __init__(self, max_entries: int = 256, ttls: Optional[Dict[str, float]] = None,
+                 default_ttl: float = 0):
+        self.max_entries = max(1, int(max_entries))
+        self.ttls = {endpoint.lower(): float(ttl) for endpoint, ttl in (ttls or {}).items()}
+        self.default_ttl = float(default_ttl)
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict] = None) -> str:
+        if not params:
+            return url
+        return f"{url}?{urlencode(sorted(params.items()), doseq=True)}"
+    
+    def ttl_for(self, endpoint: str) -> float:
+        return self.ttls.get(endpoint.lower(), self.default_ttl)
+    
+    def is_cacheable(self, endpoint: str) -> bool:
+        return self.ttl_for(endpoint) > 0
+    
+    def lookup(self, endpoint: str, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not entry.is_fresh() and not entry.can_revalidate():
+                del self._entries[key]
+                entry = None
+            
+            if entry is not None:
+                self._entries.move_to_end(key)
+            
+            self._count(endpoint, 'hits' if entry is not None and entry.is_fresh() else 'misses')
+            return entry
+    
+    def store(self, endpoint: str, key: str, response: Any):
+        if 'no-store' in response.headers.get('Cache-Control', '').lower():
+            return
+        
+        entry = CacheEntry(response, endpoint, self.ttl_for(endpoint))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._count(evicted.endpoint, 'evictions')
+    
+    def revalidate(self, endpoint: str, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry.expires_at = time.monotonic() + self.ttl_for(endpoint)
+            self._count(endpoint, 'revalidations')
+            return entry
+    
+    def invalidate(self, prefix: str) -> int:
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                entry = self._entries.pop(key)
+                self._count(entry.endpoint, 'invalidations')
+            return len(keys)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "maxEntries": self.max_entries,
+                "endpoints": {endpoint: dict(counters) for endpoint, counters in self._counters.items()}
+            }
+    
+    def _count(self, endpoint: str, name: str):
+        counters = self._counters.setdefault(endpoint, {})
+        counters[name] = counters.get(name, 0) + 1
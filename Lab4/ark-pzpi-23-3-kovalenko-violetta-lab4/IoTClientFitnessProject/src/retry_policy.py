@@ -0,0 +1,40 @@
+import random
+import time
+from typing import Optional
+
+
+class RetryPolicy:
+    
+    def __init__(self, max_attempts: int = 3, base_delay: float = 1.0, max_delay: float = 30.0,
+                 deadline: Optional[float] = 15.0, multiplier: float = 2.0):
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay = max(0.0, float(base_delay))
+        self.max_delay = max(self.base_delay, float(max_delay))
+        self.deadline = float(deadline) if deadline else None
+        self.multiplier = max(1.0, float(multiplier))
+    
+    def backoff(self, attempt: int) -> float:
+        ceiling = min(self.max_delay, self.base_delay * (self.multiplier ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+    
+    def remaining(self, started_at: float) -> Optional[float]:
+        if self.deadline is None:
+            return None
+        return self.deadline - (time.monotonic() - started_at)
+    
+    def attempt_timeout(self, started_at: float, timeout: float) -> float:
+        remaining = self.remaining(started_at)
+        if remaining is None:
+            return timeout
+        return max(0.1, min(timeout, remaining))
+    
+    def next_delay(self, attempt: int, started_at: float, minimum: Optional[float] = None) -> Optional[float]:
+        if attempt >= self.max_attempts:
+            return None
+        
+        delay = max(self.backoff(attempt), minimum or 0.0)
+        remaining = self.remaining(started_at)
+        if remaining is not None and remaining <= delay:
+            return None
+        
+        return delay
@@ -0,0 +1,132 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+
+logger = logging.getLogger(__name__)
+
+
+class SequenceJournal:
+    
+    _instances: Dict[str, "SequenceJournal"] = {}
+    _instances_lock = threading.Lock()
+    
+    @classmethod
+    def open(cls, path: str, reserve_block: int = 1000) -> "SequenceJournal":
+        path = os.path.abspath(path)
+        with cls._instances_lock:
+            journal = cls._instances.get(path)
+            if journal is None:
+                journal = cls._instances[path] = cls(path, reserve_block)
+            return journal
+    
+    def __init__(self, path: str, reserve_block: int = 1000):
+        self.path = path
+        self.lock_path = f"{path}.lock"
+        self.reserve_block = max(1, int(reserve_block))
+        self.writes = 0
+        self._lock = threading.Lock()
+        self._next: Dict[str, int] = {}
+        self._reserved: Dict[str, int] = {}
+        self._floor = 0
+    
+    def take(self, device_id, count: int = 1) -> int:
+        key = str(device_id)
+        count = max(1, int(count))
+        with self._lock:
+            first = self._next.get(key)
+            if first is None or first + count - 1 > self._reserved[key]:
+                first = self._reserve(key, first, count)
+            self._next[key] = first + count
+            return first
+    
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "path": self.path,
+                "reserveBlock": self.reserve_block,
+                "writes": self.writes,
+                "devices": {
+                    key: {"next": self._next.get(key, reserved + 1), "reserved": reserved}
+                    for key, reserved in sorted(self._reserved.items())
+                }
+            }
+    
+    def _reserve(self, key: str, first: Optional[int], count: int) -> int:
+        lock_file = self._lock_file()
+        try:
+            persisted = self._load()
+            reserved = max(persisted.get(key, self._floor), self._reserved.get(key, self._floor))
+            if first is None or reserved != self._reserved.get(key):
+                first = reserved + 1
+            self._reserved[key] = first + count - 1 + self.reserve_block
+            for other, value in self._reserved.items():
+                persisted[other] = max(persisted.get(other, 0), value)
+            self._save(persisted)
+            return first
+        finally:
+            self._unlock_file(lock_file)
+    
+    def _lock_file(self):
+        self._ensure_directory()
+        lock_file = open(self.lock_path, 'a+b')
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            elif msvcrt is not None:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        except OSError:
+            lock_file.close()
+            raise
+        return lock_file
+    
+    def _unlock_file(self, lock_file):
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            lock_file.close()
+    
+    def _load(self) -> Dict[str, int]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return {str(key): int(value) for key, value in data.get('reserved', {}).items()}
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            self._floor = max(self._floor, int(time.time() * 1000))
+            logger.error("[Journal] Журнал послідовностей %s пошкоджено (%s), нумерацію продовжено з %d",
+                         self.path, e, self._floor)
+            return {}
+    
+    def _save(self, reserved: Dict[str, int]):
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({"reserved": reserved}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        self.writes += 1
+    
+    def _ensure_directory(self):
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
@@ -0,0 +1,160 @@
+import random
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+
+DEFAULT_ROUTE = '*'
+
+
+class FaultProfile:
+    
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, slow_rate: float = 0.0,
+                 slow_latency: float = 0.0, error_rate: float = 0.0, error_status: int = 503,
+                 retry_after: Optional[float] = None):
+        self.latency = max(0.0, float(latency))
+        self.jitter = max(0.0, float(jitter))
+        self.slow_rate = min(1.0, max(0.0, float(slow_rate)))
+        self.slow_latency = max(0.0, float(slow_latency))
+        self.error_rate = min(1.0, max(0.0, float(error_rate)))
+        self.error_status = int(error_status)
+        self.retry_after = retry_after
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "FaultProfile":
+        return cls(
+            latency=data.get('latency', 0.0),
+            jitter=data.get('jitter', 0.0),
+            slow_rate=data.get('slow_rate', 0.0),
+            slow_latency=data.get('slow_latency', 0.0),
+            error_rate=data.get('error_rate', 0.0),
+            error_status=data.get('error_status', 503),
+            retry_after=data.get('retry_after')
+        )
+    
+    def is_active(self) -> bool:
+        return bool(self.latency or self.jitter or self.slow_rate or self.error_rate)
+    
+    def to_dict(self) -> Dict:
+        return {
+            "latency": self.latency,
+            "jitter": self.jitter,
+            "slow_rate": self.slow_rate,
+            "slow_latency": self.slow_latency,
+            "error_rate": self.error_rate,
+            "error_status": self.error_status,
+            "retry_after": self.retry_after
+        }
+
+
+class FaultInjector:
+    
+    def __init__(self, profiles: Optional[Dict[str, FaultProfile]] = None, seed: Optional[int] = None):
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._routes: Dict[str, Optional[str]] = {}
+        self.configure(profiles or {})
+    
+    def configure(self, profiles: Dict[str, FaultProfile]):
+        with self._lock:
+            self._profiles = dict(profiles)
+            self._prefixes = sorted((name for name in self._profiles if name != DEFAULT_ROUTE), key=len, reverse=True)
+            self._routes = {}
+    
+    def decide(self, route: str) -> Tuple[float, Optional[int]]:
+        with self._lock:
+            profile = self._profile(route)
+            if profile is None or not profile.is_active():
+                return 0.0, None
+            delay = profile.latency + self._random.random() * profile.jitter
+            if profile.slow_rate and self._random.random() < profile.slow_rate:
+                delay += profile.slow_latency
+            if profile.error_rate and self._random.random() < profile.error_rate:
+                return delay, profile.error_status
+            return delay, None
+    
+    def retry_after(self, route: str) -> Optional[float]:
+        with self._lock:
+            profile = self._profile(route)
+            return profile.retry_after if profile is not None else None
+    
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {name: profile.to_dict() for name, profile in sorted(self._profiles.items())}
+    
+    def _profile(self, route: str) -> Optional[FaultProfile]:
+        if route not in self._routes:
+            name = next((prefix for prefix in self._prefixes if route.startswith(prefix)), None)
+            if name is None and DEFAULT_ROUTE in self._profiles:
+                name = DEFAULT_ROUTE
+            self._routes[route] = name
+        name = self._routes[route]
+        return self._profiles[name] if name is not None else None
+
+
+class RequestAccounting:
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        with self._lock:
+            self._routes: Dict[str, Dict] = {}
+            self._started = time.monotonic()
+    
+    def record(self, route: str, status: int, bytes_in: int, bytes_out: int, elapsed: float,
+               injected: bool = False, content_type: Optional[str] = None):
+        with self._lock:
+            counters = self._routes.get(route)
+            if counters is None:
+                counters = self._routes[route] = {
+                    "requests": 0,
+                    "statuses": {},
+                    "contentTypes": {},
+                    "injectedErrors": 0,
+                    "bytesIn": 0,
+                    "bytesOut": 0,
+                    "totalTime": 0.0,
+                    "maxTime": 0.0
+                }
+            counters['requests'] += 1
+            counters['statuses'][status] = counters['statuses'].get(status, 0) + 1
+            if content_type is not None:
+                counters['contentTypes'][content_type] = counters['contentTypes'].get(content_type, 0) + 1
+            if injected:
+                counters['injectedErrors'] += 1
+            counters['bytesIn'] += bytes_in
+            counters['bytesOut'] += bytes_out
+            counters['totalTime'] += elapsed
+            counters['maxTime'] = max(counters['maxTime'], elapsed)
+    
+    def get_stats(self) -> Dict:
+        with self._lock:
+            elapsed = time.monotonic() - self._started
+            routes = {}
+            for route, counters in sorted(self._routes.items()):
+                routes[route] = {
+                    **counters,
+                    "statuses": {str(status): count for status, count in sorted(counters['statuses'].items())},
+                    "contentTypes": dict(counters['contentTypes']),
+                    "avgTime": round(counters['totalTime'] / counters['requests'], 6),
+                    "totalTime": round(counters['totalTime'], 3),
+                    "maxTime": round(counters['maxTime'], 6)
+                }
+        
+        total = sum(counters['requests'] for counters in routes.values())
+        return {
+            "uptime": round(elapsed, 3),
+            "requests": total,
+            "requestsPerSecond": round(total / elapsed, 1) if elapsed > 0 else 0.0,
+            "injectedErrors": sum(counters['injectedErrors'] for counters in routes.values()),
+            "routes": routes
+        }
+
+
+def parse_fault_profiles(config: Dict) -> Dict[str, FaultProfile]:
+    profiles = {DEFAULT_ROUTE: FaultProfile.from_dict(config)}
+    for route, overrides in (config.get('routes') or {}).items():
+        profiles[route] = FaultProfile.from_dict({**config, **overrides})
+    return profiles
@@ -0,0 +1,390 @@
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+
+HEART_RATE_TYPE = 0
+STEPS_TYPE = 1
+DIET_CORRECTION_TYPE = 5
+MEAL_TIMES = (0, 1, 2)
+PLAN_ORDER_FIELDS = ('dailydietplanid', 'dailyplancreatedat')
+SLEEP_FIELDS = ('totalSleepMinutes', 'deepSleepMinutes', 'lightSleepMinutes', 'awakeMinutes')
+
+
+class StandInError(Exception):
+    
+    def __init__(self, status: int, message: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers
+
+
+def _day(value) -> Optional[str]:
+    if not isinstance(value, str) or len(value) < 10:
+        return None
+    try:
+        return datetime.strptime(value[:10], '%Y-%m-%d').strftime('%Y-%m-%d')
+    except ValueError:
+        return None
+
+
+def _average(values: List[float]) -> Optional[float]:
+    return sum(values) / len(values) if values else None
+
+
+def _trend(values: List[float]) -> Optional[float]:
+    if sum(1 for value in values if value != 0) < 6:
+        return None
+    first = sum(values[:3]) / 3
+    if first == 0:
+        return None
+    return (sum(values[-3:]) / 3 - first) / first
+
+
+class _DayTotals:
+    
+    __slots__ = ('steps', 'heart_rate_count', 'heart_rate_sum', 'heart_rate_min', 'heart_rate_max',
+                 'sleep', 'sleep_quality')
+    
+    def __init__(self):
+        self.steps = 0.0
+        self.heart_rate_count = 0
+        self.heart_rate_sum = 0.0
+        self.heart_rate_min: Optional[float] = None
+        self.heart_rate_max: Optional[float] = None
+        self.sleep = dict.fromkeys(SLEEP_FIELDS, 0)
+        self.sleep_quality: List[float] = []
+    
+    def add_sample(self, telemetry_type: int, value: float):
+        if telemetry_type == STEPS_TYPE:
+            self.steps += value
+        elif telemetry_type == HEART_RATE_TYPE:
+            self.heart_rate_count += 1
+            self.heart_rate_sum += value
+            self.heart_rate_min = value if self.heart_rate_min is None else min(self.heart_rate_min, value)
+            self.heart_rate_max = value if self.heart_rate_max is None else max(self.heart_rate_max, value)
+    
+    def add_sleep(self, record: Dict):
+        for field in SLEEP_FIELDS:
+            self.sleep[field] += int(record.get(field) or 0)
+        if record.get('sleepQuality') is not None:
+            self.sleep_quality.append(float(record['sleepQuality']))
+    
+    def to_dict(self) -> Dict:
+        return {
+            "steps": self.steps,
+            "heartRateAvg": self.heart_rate_sum / self.heart_rate_count if self.heart_rate_count else None,
+            "heartRateMin": self.heart_rate_min,
+            "heartRateMax": self.heart_rate_max,
+            "heartRateSamples": self.heart_rate_count,
+            **self.sleep,
+            "sleepQualityAvg": _average(self.sleep_quality),
+            "trainingCount": 0,
+            "trainingDurationMinutes": 0,
+            "trainingIntensityAvg": None,
+            "trainingCalories": 0
+        }
+
+
+class StandInState:
+    
+    def __init__(self, users: int = 3, recipes: int = 24, plans_per_user: int = 3,
+                 recommendations_per_user: int = 2):
+        self.samples: List[Dict] = []
+        self.sleep_records: List[Dict] = []
+        self.duplicates = 0
+        self._keys: Set[str] = set()
+        self._days: Dict[str, _DayTotals] = {}
+        
+        self.profiles: Dict[int, Dict] = {}
+        self.recipes: Dict[int, Dict] = {}
+        self.plans: Dict[int, Dict] = {}
+        self.meals: Dict[int, Dict] = {}
+        self.recommendations: List[Dict] = []
+        self._plan_meals: Dict[int, List[int]] = {}
+        self._recommendation_users: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._seed(max(0, users), max(1, recipes), max(0, plans_per_user), max(0, recommendations_per_user))
+    
+    def record_samples(self, items: List[Dict]) -> Tuple[int, int]:
+        with self._lock:
+            fresh = [item for item in items if self._claim(item)]
+            for item in fresh:
+                day = _day(item.get('timestamp'))
+                if day is not None:
+                    self._totals(day).add_sample(int(item.get('telemetryType', -1)), float(item.get('value') or 0))
+            self.samples.extend(fresh)
+            self.duplicates += len(items) - len(fresh)
+            return len(fresh), len(items) - len(fresh)
+    
+    def record_sleep(self, record: Dict) -> bool:
+        with self._lock:
+            if not self._claim(record):
+                self.duplicates += 1
+                return False
+            day = _day(record.get('date'))
+            if day is not None:
+                self._totals(day).add_sleep(record)
+            self.sleep_records.append(record)
+            return True
+    
+    def daily_statistics(self, date: str) -> Dict:
+        day = _day(date)
+        if day is None:
+            raise StandInError(400, f"Invalid date: {date}")
+        with self._lock:
+            totals = self._days.get(day)
+            return totals.to_dict() if totals is not None else _DayTotals().to_dict()
+    
+    def weekly_statistics(self, start_date: str) -> Dict:
+        start = _day(start_date)
+        if start is None:
+            raise StandInError(400, f"Invalid date: {start_date}")
+        first = datetime.strptime(start, '%Y-%m-%d')
+        days = [self.daily_statistics((first + timedelta(days=offset)).strftime('%Y-%m-%d')) for offset in range(7)]
+        
+        heart_rate_avgs = [day['heartRateAvg'] for day in days if day['heartRateAvg'] is not None]
+        heart_rate_mins = [day['heartRateMin'] for day in days if day['heartRateMin'] is not None]
+        heart_rate_maxs = [day['heartRateMax'] for day in days if day['heartRateMax'] is not None]
+        sleep_qualities = [day['sleepQualityAvg'] for day in days if day['sleepQualityAvg'] is not None]
+        return {
+            "startDate": f"{start}T00:00:00",
+            "endDate": f"{(first + timedelta(days=6)).strftime('%Y-%m-%d')}T00:00:00",
+            "days": days,
+            "totalSteps": sum(day['steps'] for day in days),
+            "heartRateAvg": _average(heart_rate_avgs),
+            "heartRateMin": min(heart_rate_mins) if heart_rate_mins else None,
+            "heartRateMax": max(heart_rate_maxs) if heart_rate_maxs else None,
+            **{field: sum(day[field] for day in days) for field in SLEEP_FIELDS},
+            "sleepQualityAvg": _average(sleep_qualities),
+            "trainingCount": 0,
+            "trainingDurationMinutes": 0,
+            "trainingIntensityAvg": None,
+            "trainingCalories": 0,
+            "stepsTrendPercent": _trend([day['steps'] for day in days]),
+            "heartRateAvgTrendPercent": _trend([day['heartRateAvg'] or 0 for day in days]),
+            "sleepMinutesTrendPercent": _trend([day['totalSleepMinutes'] for day in days]),
+            "trainingDurationTrendPercent": None,
+            "trainingCaloriesTrendPercent": None
+        }
+    
+    def list_plans(self, user_id: Optional[int], limit: Optional[int], order_by: Optional[str]) -> List[Dict]:
+        if limit is not None and limit < 0:
+            raise StandInError(400, "limit must not be negative")
+        with self._lock:
+            plans = list(self.plans.values())
+        
+        if user_id is not None:
+            plans = [plan for plan in plans if plan['userId'] == user_id]
+            plans.sort(key=lambda plan: (plan['dailyPlanCreatedAt'], plan['dailyDietPlanId']), reverse=True)
+        if order_by:
+            field = order_by.lstrip('-').lower()
+            if field not in PLAN_ORDER_FIELDS:
+                raise StandInError(400, f"Unsupported orderBy: {order_by}")
+            if field == 'dailydietplanid':
+                plans.sort(key=lambda plan: plan['dailyDietPlanId'], reverse=order_by.startswith('-'))
+            else:
+                plans.sort(key=lambda plan: (plan['dailyPlanCreatedAt'], plan['dailyDietPlanId']),
+                           reverse=order_by.startswith('-'))
+        return plans[:limit] if limit is not None else plans
+    
+    def get_plan(self, plan_id: int) -> Dict:
+        plan = self.plans.get(plan_id)
+        if plan is None:
+            raise StandInError(404, f"Daily diet plan {plan_id} not found")
+        return plan
+    
+    def get_plan_meals(self, plan_id: int) -> Dict:
+        plan = self.get_plan(plan_id)
+        with self._lock:
+            meals = [self.meals[meal_id] for meal_id in self._plan_meals.get(plan_id, [])]
+        return {
+            "dailyDietPlanId": plan['dailyDietPlanId'],
+            "dailyDietPlanName": plan['dailyDietPlanName'],
+            "dailyPlanCreatedAt": plan['dailyPlanCreatedAt'],
+            "meals": meals
+        }
+    
+    def generate_plan(self, request: Dict) -> Dict:
+        user_id = request.get('userId') if isinstance(request, dict) else None
+        if user_id not in self.profiles:
+            raise StandInError(400, f"User {user_id} not found")
+        date = _day(request.get('date')) or datetime.now().strftime('%Y-%m-%d')
+        
+        with self._lock:
+            plan = self._add_plan(user_id, date, datetime.utcnow().isoformat(), request.get('templateDietPlanId'))
+            meals = [self.meals[meal_id] for meal_id in self._plan_meals[plan['dailyDietPlanId']]]
+        return {
+            "plan": plan,
+            "meals": [
+                {
+                    "meal": meal,
+                    "recipes": [self.get_recipe_details(link['recipeId']) for link in meal['mealRecipes']]
+                }
+                for meal in meals
+            ]
+        }
+    
+    def get_recipe(self, recipe_id: int) -> Dict:
+        recipe = self.recipes.get(recipe_id)
+        if recipe is None:
+            raise StandInError(404, f"Recipe {recipe_id} not found")
+        return recipe
+    
+    def get_recipe_details(self, recipe_id: int) -> Dict:
+        return {**self.get_recipe(recipe_id), "mealRecipes": [], "recipeProducts": []}
+    
+    def list_profiles(self, user_id: Optional[int]) -> List[Dict]:
+        if user_id is None:
+            return list(self.profiles.values())
+        profile = self.profiles.get(user_id)
+        return [profile] if profile is not None else []
+    
+    def get_profile(self, profile_id: int, details: bool = False) -> Dict:
+        profile = next((item for item in self.profiles.values() if item['profileId'] == profile_id), None)
+        if profile is None:
+            raise StandInError(404, f"User profile {profile_id} not found")
+        if not details:
+            return profile
+        return {
+            **profile,
+            "user": {
+                "userId": profile['userId'],
+                "email": f"user{profile['userId']}@example.com",
+                "passwordHash": "",
+                "createdAt": "2024-01-01T00:00:00",
+                "locale": "uk",
+                "role": 0
+            }
+        }
+    
+    def list_corrections(self, user_id: Optional[int], limit: Optional[int]) -> List[Dict]:
+        if limit is not None and limit < 0:
+            raise StandInError(400, "limit must not be negative")
+        corrections = [
+            item for item in self.recommendations
+            if user_id is None or self._recommendation_users.get(item['recommendationId']) == user_id
+        ]
+        if limit is not None:
+            corrections = sorted(corrections, key=lambda item: item['recommendationCreatedAt'], reverse=True)[:limit]
+        return corrections
+    
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "samples": len(self.samples),
+                "sleepRecords": len(self.sleep_records),
+                "duplicates": self.duplicates,
+                "days": len(self._days),
+                "users": len(self.profiles),
+                "recipes": len(self.recipes),
+                "plans": len(self.plans),
+                "recommendations": len(self.recommendations)
+            }
+    
+    def _claim(self, payload: Dict) -> bool:
+        key = payload.get('idempotencyKey') if isinstance(payload, dict) else None
+        if key is None:
+            return True
+        if key in self._keys:
+            return False
+        self._keys.add(key)
+        return True
+    
+    def _totals(self, day: str) -> _DayTotals:
+        totals = self._days.get(day)
+        if totals is None:
+            totals = self._days[day] = _DayTotals()
+        return totals
+    
+    def _seed(self, users: int, recipes: int, plans_per_user: int, recommendations_per_user: int):
+        for recipe_id in range(1, recipes + 1):
+            calories = 150.0 + (recipe_id * 37) % 450
+            self.recipes[recipe_id] = {
+                "recipeId": recipe_id,
+                "recipeName": f"Recipe {recipe_id}",
+                "recipeInstructions": f"Instructions for recipe {recipe_id}",
+                "recipeCaloriesPerPortion": calories,
+                "recipeFatPerPortion": round(calories * 0.3 / 9, 1),
+                "recipeCarbsPerPortion": round(calories * 0.5 / 4, 1),
+                "recipeProteinPerPortion": round(calories * 0.2 / 4, 1),
+                "recipeProductsGrams": 100.0 + (recipe_id * 13) % 250
+            }
+        
+        today = datetime.now().replace(hour=8, minute=0, second=0, microsecond=0)
+        for user_id in range(1, users + 1):
+            self.profiles[user_id] = {
+                "profileId": 100 + user_id,
+                "userId": user_id,
+                "firstName": f"User{user_id}",
+                "lastName": "StandIn",
+                "sex": user_id % 2,
+                "heightCm": 160.0 + user_id % 30,
+                "currentWeightKg": 55.0 + user_id % 40,
+                "activityLevel": user_id % 5,
+                "medicalConditions": None,
+                "preferredUnits": 0,
+                "birthDate": f"{1990 + user_id % 15}-01-01T00:00:00"
+            }
+            for offset in range(plans_per_user, 0, -1):
+                created = today - timedelta(days=offset - 1)
+                self._add_plan(user_id, created.strftime('%Y-%m-%d'), created.isoformat(), None)
+            
+            meal_ids = [meal_id for meal_id, meal in self.meals.items() if meal['dailyDietPlan']['userId'] == user_id]
+            for index in range(recommendations_per_user):
+                recommendation_id = len(self.recommendations) + 1
+                meal_id = meal_ids[-(index % len(meal_ids)) - 1] if meal_ids else None
+                recommendation = {
+                    "recommendationId": recommendation_id,
+                    "mealInstanceId": meal_id,
+                    "recommendationCreatedAt": (today - timedelta(hours=index)).isoformat(),
+                    "recommendationType": DIET_CORRECTION_TYPE,
+                    "recommendationPayload": f'{{"message": "Correction {recommendation_id}"}}',
+                    "recommendationStatus": 0
+                }
+                self.recommendations.append(recommendation)
+                self._recommendation_users[recommendation_id] = user_id
+                if meal_id is not None:
+                    self.meals[meal_id]['recommendations'].append(recommendation)
+    
+    def _add_plan(self, user_id: int, date: str, created_at: str, template_id: Optional[int]) -> Dict:
+        plan_id = len(self.plans) + 1
+        plan = {
+            "dailyDietPlanId": plan_id,
+            "userId": user_id,
+            "templateDietPlanId": template_id,
+            "dailyDietPlanName": f"Meal Plan for {date}",
+            "dailyPlanDescription": None,
+            "dailyPlanCalories": 0.0,
+            "dailyPlanFat": 0.0,
+            "dailyPlanCarbs": 0.0,
+            "dailyPlanProtein": 0.0,
+            "dailyPlanNumberOfMeals": len(MEAL_TIMES),
+            "dailyPlanStatus": 0,
+            "dailyPlanCreatedAt": created_at
+        }
+        self.plans[plan_id] = plan
+        self._plan_meals[plan_id] = []
+        
+        for order, meal_time in enumerate(MEAL_TIMES, start=1):
+            meal_id = len(self.meals) + 1
+            recipe_ids = [(meal_id * 2 + offset) % len(self.recipes) + 1 for offset in range(2)]
+            recipes = [self.recipes[recipe_id] for recipe_id in recipe_ids]
+            meal = {
+                "mealId": meal_id,
+                "dailyDietPlanId": plan_id,
+                "mealTime": meal_time,
+                "mealOrder": order,
+                "mealTargetCalories": sum(recipe['recipeCaloriesPerPortion'] for recipe in recipes),
+                "mealTargetFat": sum(recipe['recipeFatPerPortion'] for recipe in recipes),
+                "mealTargetCarbs": sum(recipe['recipeCarbsPerPortion'] for recipe in recipes),
+                "mealTargetProtein": sum(recipe['recipeProteinPerPortion'] for recipe in recipes),
+                "dailyDietPlan": plan,
+                "mealRecipes": [{"mealId": meal_id, "recipeId": recipe_id} for recipe_id in recipe_ids],
+                "recommendations": []
+            }
+            self.meals[meal_id] = meal
+            self._plan_meals[plan_id].append(meal_id)
+            for field in ('Calories', 'Fat', 'Carbs', 'Protein'):
+                plan[f"dailyPlan{field}"] = round(plan[f"dailyPlan{field}"] + meal[f"mealTarget{field}"], 1)
+        return plan
@@ -0,0 +1,108 @@
+from array import array
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from daily_aggregate import DailyAggregate
+from heart_rate_histogram import MAX_BPM, MIN_BPM, HeartRateHistogram
+from sample_store import SampleStore, from_micros, to_micros
+
+
+BACKEND_PYTHON = 'python'
+BACKEND_NUMPY = 'numpy'
+DAY_MICROS = 86400 * 1000000
+
+
+def default_backend() -> str:
+    return BACKEND_NUMPY if np is not None else BACKEND_PYTHON
+
+
+def resolve_backend(backend: Optional[str]) -> str:
+    if backend is None:
+        return default_backend()
+    if backend not in (BACKEND_PYTHON, BACKEND_NUMPY):
+        raise ValueError(f"Невідомий бекенд статистики: {backend}")
+    if backend == BACKEND_NUMPY and np is None:
+        raise ValueError("Бекенд статистики 'numpy' недоступний: встановіть NumPy (pip install numpy)")
+    return backend
+
+
+def _as_micros(timestamps) -> "np.ndarray":
+    if isinstance(timestamps, np.ndarray) and np.issubdtype(timestamps.dtype, np.datetime64):
+        return timestamps.astype('datetime64[us]').astype(np.int64)
+    return np.fromiter((to_micros(timestamp) for timestamp in timestamps), dtype=np.int64)
+
+
+def _merge(aggregate: DailyAggregate, segment: "np.ndarray"):
+    aggregate.count += len(segment)
+    aggregate.total = float(np.add.accumulate(np.concatenate(([aggregate.total], segment)))[-1])
+    aggregate.sum_squares = float(np.add.accumulate(np.concatenate(([aggregate.sum_squares], segment * segment)))[-1])
+    minimum, maximum = float(segment.min()), float(segment.max())
+    if aggregate.minimum is None or minimum < aggregate.minimum:
+        aggregate.minimum = minimum
+    if aggregate.maximum is None or maximum > aggregate.maximum:
+        aggregate.maximum = maximum
+    aggregate.dirty = True
+
+
+def _count_bins(histogram: HeartRateHistogram, segment: "np.ndarray"):
+    binned = (segment >= MIN_BPM) & (segment <= MAX_BPM) & (segment == np.floor(segment))
+    counts = np.bincount((segment[binned] - MIN_BPM).astype(np.int64), minlength=len(histogram.bins))
+    histogram.bins = [current + int(added) for current, added in zip(histogram.bins, counts)]
+    histogram.count += len(segment)
+    histogram.outliers += len(segment) - int(binned.sum())
+
+
+def ingest_many(samples: SampleStore, days: Dict[str, DailyAggregate], histograms: Dict[str, HeartRateHistogram],
+                timestamps, values) -> int:
+    micros = _as_micros(timestamps)
+    readings = np.asarray(values, dtype=np.float64)
+    if micros.shape != readings.shape:
+        raise ValueError("Кількість міток часу не збігається з кількістю значень")
+    if not len(micros):
+        return 0
+    
+    samples.extend(array('q', micros.tobytes()), array('d', readings.tobytes()))
+    
+    day_numbers = micros // DAY_MICROS
+    order = np.argsort(day_numbers, kind='stable')
+    ordered_days = day_numbers[order]
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(ordered_days)) + 1))
+    ends = np.append(starts[1:], len(order))
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        date_str = from_micros(int(ordered_days[start]) * DAY_MICROS).date().isoformat()
+        segment = readings[order[start:end]]
+        aggregate = days.get(date_str)
+        if aggregate is None:
+            aggregate = days[date_str] = DailyAggregate()
+        histogram = histograms.get(date_str)
+        if histogram is None:
+            histogram = histograms[date_str] = HeartRateHistogram()
+        _merge(aggregate, segment)
+        _count_bins(histogram, segment)
+    return len(micros)
+
+
+def bucket_aggregates(timestamps: array, values: array, origin: int, width: int, count: int) -> List[DailyAggregate]:
+    micros = np.frombuffer(timestamps, dtype=np.int64)
+    readings = np.frombuffer(values, dtype=np.float64)
+    edges = np.searchsorted(micros, origin + np.arange(count + 1, dtype=np.int64) * width).tolist()
+    aggregates = [DailyAggregate() for _ in range(count)]
+    
+    filled = [index for index in range(count) if edges[index + 1] > edges[index]]
+    if filled:
+        offsets = [edges[index] for index in filled]
+        minimums = np.minimum.reduceat(readings, offsets).tolist()
+        maximums = np.maximum.reduceat(readings, offsets).tolist()
+        for index, minimum, maximum in zip(filled, minimums, maximums):
+            segment = readings[edges[index]:edges[index + 1]]
+            aggregate = aggregates[index]
+            aggregate.count = len(segment)
+            aggregate.total = float(np.add.accumulate(segment)[-1])
+            aggregate.sum_squares = float(np.add.accumulate(segment * segment)[-1])
+            aggregate.minimum = minimum
+            aggregate.maximum = maximum
+    return aggregates
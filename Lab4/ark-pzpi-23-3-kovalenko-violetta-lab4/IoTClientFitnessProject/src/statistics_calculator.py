@@ -1,20 +1,52 @@
 
 import statistics
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 from collections import defaultdict
 
+from daily_aggregate import DailyAggregate
+from heart_rate_histogram import DEFAULT_MAX_HEART_RATE, HeartRateHistogram, SortedSamples, zone_bounds
+from sample_store import SampleStore, from_micros, to_micros
+from statistics_backend import BACKEND_NUMPY, bucket_aggregates, ingest_many, resolve_backend
+
+
+METRIC_HEART_RATE = 'heart_rate'
+METRIC_STEPS = 'steps'
+BUCKET_WIDTHS = {
+    '1d': timedelta(days=1),
+    '1h': timedelta(hours=1),
+    '15m': timedelta(minutes=15)
+}
+
 
 class StatisticsCalculator:
     
-    def __init__(self):
-        self.heart_rate_samples = []
-        self.steps_samples = []
+    def __init__(self, backend: Optional[str] = None):
+        self.backend = resolve_backend(backend)
+        self.heart_rate_samples = SampleStore()
+        self.steps_samples = SampleStore()
         self.sleep_records = []
         self.daily_steps_accumulator = {}
+        self.heart_rate_days: Dict[str, DailyAggregate] = {}
+        self.steps_days: Dict[str, DailyAggregate] = {}
+        self.heart_rate_histograms: Dict[str, HeartRateHistogram] = {}
         
     def add_heart_rate(self, value: float, timestamp: datetime):
-        self.heart_rate_samples.append((timestamp, value))
+        self.heart_rate_samples.append(timestamp, value)
+        self._day_entry(self.heart_rate_days, timestamp, DailyAggregate).add(value)
+        self._day_entry(self.heart_rate_histograms, timestamp, HeartRateHistogram).add(value)
+    
+    def add_heart_rate_many(self, timestamps: Iterable[datetime], values: Iterable[float]) -> int:
+        if self.backend == BACKEND_NUMPY:
+            return ingest_many(self.heart_rate_samples, self.heart_rate_days, self.heart_rate_histograms,
+                               timestamps, values)
+        
+        timestamps, values = list(timestamps), list(values)
+        if len(timestamps) != len(values):
+            raise ValueError("Кількість міток часу не збігається з кількістю значень")
+        for timestamp, value in zip(timestamps, values):
+            self.add_heart_rate(value, timestamp)
+        return len(timestamps)
     
     def add_steps(self, value: int, timestamp: datetime):
         date_str = timestamp.date().isoformat()
@@ -28,73 +60,80 @@ class StatisticsCalculator:
         else:
             self.daily_steps_accumulator[date_str] = value
         
-        self.steps_samples.append((timestamp, self.daily_steps_accumulator[date_str]))
+        self.steps_samples.append(timestamp, self.daily_steps_accumulator[date_str])
+        self._day_entry(self.steps_days, timestamp, DailyAggregate).add(self.daily_steps_accumulator[date_str])
     
     def add_sleep_record(self, sleep_data: Dict):
         self.sleep_records.append(sleep_data)
     
     def get_daily_heart_rate_stats(self, date: datetime) -> Optional[Dict]:
-        date_start = date.replace(hour=0, minute=0, second=0, microsecond=0)
-        date_end = date_start + timedelta(days=1)
+        day = self.heart_rate_days.get(date.date().isoformat())
         
-        day_samples = [
-            value for ts, value in self.heart_rate_samples
-            if date_start <= ts < date_end
-        ]
+        if day is None:
+            return None
+        
+        distribution = self._heart_rate_distribution(date)
+        
+        return {
+            "date": date.date().isoformat(),
+            "count": day.count,
+            "min": float(day.minimum),
+            "max": float(day.maximum),
+            "avg": float(day.mean),
+            "median": distribution.median(),
+            "p5": distribution.percentile(5),
+            "p95": distribution.percentile(95),
+            "stdDev": day.std_dev
+        }
+    
+    def get_heart_rate_percentiles(self, date: datetime,
+                                   percentiles: Iterable[float] = (5, 25, 50, 75, 95)) -> Optional[Dict]:
+        distribution = self._heart_rate_distribution(date)
+        
+        if distribution is None:
+            return None
+        
+        return {
+            "date": date.date().isoformat(),
+            "count": distribution.count,
+            "percentiles": {f"p{percent:g}": distribution.percentile(percent) for percent in percentiles}
+        }
+    
+    def get_heart_rate_zones(self, date: datetime, max_heart_rate: float = DEFAULT_MAX_HEART_RATE) -> Optional[Dict]:
+        distribution = self._heart_rate_distribution(date)
         
-        if not day_samples:
+        if distribution is None:
             return None
         
         return {
             "date": date.date().isoformat(),
-            "count": len(day_samples),
-            "min": float(min(day_samples)),
-            "max": float(max(day_samples)),
-            "avg": float(statistics.mean(day_samples)),
-            "median": float(statistics.median(day_samples))
+            "count": distribution.count,
+            "maxHeartRate": max_heart_rate,
+            "zones": distribution.zones(zone_bounds(max_heart_rate))
         }
     
     def get_daily_steps_total(self, date: datetime) -> Optional[Dict]:
         date_str = date.date().isoformat()
+        day = self.steps_days.get(date_str)
         
         if date_str in self.daily_steps_accumulator:
             total_steps = self.daily_steps_accumulator[date_str]
+        elif day is not None:
+            total_steps = day.maximum
         else:
-            date_start = date.replace(hour=0, minute=0, second=0, microsecond=0)
-            date_end = date_start + timedelta(days=1)
-            
-            day_samples = [
-                value for ts, value in self.steps_samples
-                if date_start <= ts < date_end
-            ]
-            
-            if not day_samples:
-                return None
-            
-            total_steps = max(day_samples) if day_samples else 0
-        
-        date_start = date.replace(hour=0, minute=0, second=0, microsecond=0)
-        date_end = date_start + timedelta(days=1)
-        
-        day_samples_count = len([
-            ts for ts, value in self.steps_samples
-            if date_start <= ts < date_end
-        ])
+            return None
         
         return {
             "date": date_str,
             "totalSteps": int(total_steps),
-            "samplesCount": day_samples_count
+            "samplesCount": day.count if day is not None else 0
         }
     
     def get_weekly_heart_rate_trend(self, start_date: datetime) -> Optional[Dict]:
-        week_data = []
-        
-        for day_offset in range(7):
-            current_date = start_date + timedelta(days=day_offset)
-            day_stats = self.get_daily_heart_rate_stats(current_date)
-            if day_stats:
-                week_data.append(day_stats["avg"])
+        week_data = [
+            float(bucket["avg"]) for bucket in self._week_buckets(METRIC_HEART_RATE, start_date)
+            if bucket["count"]
+        ]
         
         if len(week_data) < 2:
             return None
@@ -124,11 +163,12 @@ class StatisticsCalculator:
     def get_weekly_steps_trend(self, start_date: datetime) -> Optional[Dict]:
         week_data = []
         
-        for day_offset in range(7):
-            current_date = start_date + timedelta(days=day_offset)
-            day_stats = self.get_daily_steps_total(current_date)
-            if day_stats:
-                week_data.append(day_stats["totalSteps"])
+        for bucket in self._week_buckets(METRIC_STEPS, start_date):
+            date_str = bucket["start"][:10]
+            if date_str in self.daily_steps_accumulator:
+                week_data.append(int(self.daily_steps_accumulator[date_str]))
+            elif bucket["count"]:
+                week_data.append(int(bucket["max"]))
         
         if len(week_data) < 2:
             return None
@@ -184,13 +224,13 @@ class StatisticsCalculator:
         }
     
     def get_activity_score(self, date: datetime) -> Optional[float]:
-        hr_stats = self.get_daily_heart_rate_stats(date)
+        heart_rate = self.heart_rate_days.get(date.date().isoformat())
         steps_stats = self.get_daily_steps_total(date)
         
-        if not hr_stats or not steps_stats:
+        if heart_rate is None or not steps_stats:
             return None
         
-        hr_score = (hr_stats["avg"] - 60) / 40 * 50
+        hr_score = (float(heart_rate.mean) - 60) / 40 * 50
         steps_score = min(steps_stats["totalSteps"] / 10000 * 50, 50)
         
         total_score = hr_score + steps_score
@@ -199,20 +239,89 @@ class StatisticsCalculator:
     def clear_old_data(self, days_to_keep: int = 30):
         cutoff_date = datetime.now() - timedelta(days=days_to_keep)
         
-        self.heart_rate_samples = [
-            (ts, val) for ts, val in self.heart_rate_samples
-            if ts >= cutoff_date
-        ]
-        
-        self.steps_samples = [
-            (ts, val) for ts, val in self.steps_samples
-            if ts >= cutoff_date
-        ]
+        self._truncate(self.heart_rate_samples, cutoff_date,
+                       (self.heart_rate_days, DailyAggregate), (self.heart_rate_histograms, HeartRateHistogram))
+        self._truncate(self.steps_samples, cutoff_date, (self.steps_days, DailyAggregate))
         
         self.sleep_records = [
             rec for rec in self.sleep_records
             if datetime.fromisoformat(rec.get('date', '2000-01-01')).date() >= cutoff_date.date()
         ]
+    
+    def aggregate(self, metric: str, start: datetime, end: datetime, bucket: str = '1d') -> List[Dict]:
+        if metric == METRIC_HEART_RATE:
+            samples, days = self.heart_rate_samples, self.heart_rate_days
+        elif metric == METRIC_STEPS:
+            samples, days = self.steps_samples, self.steps_days
+        else:
+            raise ValueError(f"Невідома метрика: {metric}")
+        if bucket not in BUCKET_WIDTHS:
+            raise ValueError(f"Невідомий розмір інтервалу: {bucket}")
+        
+        width = BUCKET_WIDTHS[bucket] // timedelta(microseconds=1)
+        origin = to_micros(start) // width * width
+        count = max(0, -(-(to_micros(end) - origin) // width))
+        starts = [from_micros(origin + index * width) for index in range(count)]
+        
+        if bucket == '1d':
+            empty = DailyAggregate()
+            aggregates = [days.get(bucket_start.date().isoformat(), empty) for bucket_start in starts]
+        elif self.backend == BACKEND_NUMPY:
+            low, high = samples.bounds(from_micros(origin), from_micros(origin + count * width))
+            aggregates = bucket_aggregates(samples.timestamps[low:high], samples.values[low:high], origin, width, count)
+        else:
+            aggregates = [DailyAggregate() for _ in starts]
+            low, high = samples.bounds(from_micros(origin), from_micros(origin + count * width))
+            for micros, value in zip(samples.timestamps[low:high], samples.values[low:high]):
+                aggregates[(micros - origin) // width].add(value)
+        
+        return [
+            {
+                "start": bucket_start.isoformat(),
+                "end": (bucket_start + BUCKET_WIDTHS[bucket]).isoformat(),
+                **aggregate.summary()
+            }
+            for bucket_start, aggregate in zip(starts, aggregates)
+        ]
+    
+    def _week_buckets(self, metric: str, start_date: datetime) -> List[Dict]:
+        week_start = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        return self.aggregate(metric, week_start, week_start + timedelta(days=7), '1d')
+    
+    def _heart_rate_distribution(self, date: datetime) -> Optional[Union[HeartRateHistogram, SortedSamples]]:
+        date_str = date.date().isoformat()
+        histogram = self.heart_rate_histograms.get(date_str)
+        if histogram is None or histogram.exact:
+            return histogram
+        
+        day = self.heart_rate_days[date_str]
+        if day.dirty:
+            date_start = date.replace(hour=0, minute=0, second=0, microsecond=0)
+            day_samples = self.heart_rate_samples.slice(date_start, date_start + timedelta(days=1))
+            day.derived["sorted"] = SortedSamples(day_samples)
+            day.dirty = False
+        return day.derived["sorted"]
+    
+    @staticmethod
+    def _day_entry(days: Dict, timestamp: datetime, factory):
+        date_str = timestamp.date().isoformat()
+        day = days.get(date_str)
+        if day is None:
+            day = days[date_str] = factory()
+        return day
+    
+    @staticmethod
+    def _truncate(samples: SampleStore, cutoff_date: datetime, *indexes: Tuple[Dict, type]):
+        samples.truncate_before(cutoff_date)
+        cutoff_day = cutoff_date.date().isoformat()
+        date_start = cutoff_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        day_samples = samples.slice(date_start, date_start + timedelta(days=1))
+        
+        for days, factory in indexes:
+            for date_str in [date_str for date_str in days if date_str <= cutoff_day]:
+                del days[date_str]
+            if day_samples:
+                days[cutoff_day] = factory.from_values(day_samples)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,319 @@
+import logging
+import struct
+import sys
+import threading
+from array import array
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+from payload_builder import decode_json, encode_json
+
+
+logger = logging.getLogger(__name__)
+
+JSON_CONTENT_TYPE = 'application/json'
+COLUMNAR_CONTENT_TYPE = 'application/vnd.fitness.telemetry-batch+columnar'
+MSGPACK_CONTENT_TYPE = 'application/vnd.fitness.telemetry-batch+msgpack'
+
+FORMAT_CONTENT_TYPES = {
+    'json': JSON_CONTENT_TYPE,
+    'columnar': COLUMNAR_CONTENT_TYPE,
+    'msgpack': MSGPACK_CONTENT_TYPE
+}
+
+COLUMNAR_MAGIC = b'FTB1'
+COLUMNAR_VERSION = 1
+COLUMNAR_HEADER = struct.Struct('<4sBBhIq')
+FLAG_WIDE_DELTAS = 0x01
+FLAG_AWARE = 0x02
+FLAG_SINGLE_DEVICE = 0x04
+FLAG_SEQUENCES = 0x08
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+INT32_MIN = -2 ** 31
+INT32_MAX = 2 ** 31 - 1
+
+_metadata = itemgetter('metadata')
+_timestamp = itemgetter('timestamp')
+_device_id = itemgetter('deviceId')
+_telemetry_type = itemgetter('telemetryType')
+_value = itemgetter('value')
+
+
+def available_content_types() -> List[str]:
+    content_types = [COLUMNAR_CONTENT_TYPE]
+    if msgpack is not None:
+        content_types.append(MSGPACK_CONTENT_TYPE)
+    content_types.append(JSON_CONTENT_TYPE)
+    return content_types
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_little_endian(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values
+
+
+def _split_sequences(items: List[Dict], device_ids: List[int]) -> Optional[List[int]]:
+    keys = [item.get('idempotencyKey') for item in items]
+    if all(key is None for key in keys):
+        return None
+    
+    sequences = []
+    for device_id, key in zip(device_ids, keys):
+        prefix, _, sequence = str(key).rpartition('-')
+        if prefix != str(device_id) or not sequence.isdigit():
+            raise ValueError("Ключ ідемпотентності не відповідає формату <deviceId>-<sequence>")
+        sequences.append(int(sequence))
+    return sequences
+
+
+def _split_columns(items: List[Dict]) -> Tuple[Optional[int], List[int], List[int], List[int], List[float]]:
+    if any(metadata is not None for metadata in map(_metadata, items)):
+        raise ValueError("Колонковий формат не підтримує metadata")
+    
+    moments = list(map(datetime.fromisoformat, map(_timestamp, items)))
+    offsets = {moment.utcoffset() for moment in moments}
+    if len(offsets) > 1:
+        raise ValueError("Батч містить мітки часу з різними часовими зонами")
+    
+    offset = offsets.pop() if offsets else None
+    if offset is not None:
+        moments = [moment.replace(tzinfo=None) for moment in moments]
+    
+    timestamps = [(moment - EPOCH) // MICROSECOND for moment in moments]
+    deltas = timestamps[:1] + [current - previous for previous, current in zip(timestamps, timestamps[1:])]
+    return (None if offset is None else int(offset.total_seconds() // 60), deltas,
+            list(map(_device_id, items)),
+            list(map(_telemetry_type, items)),
+            list(map(float, map(_value, items))))
+
+
+def _join_columns(offset: Optional[int], deltas: Iterable[int], device_ids: List[int],
+                  types: Iterable[int], values: Iterable[float],
+                  sequences: Optional[Iterable[int]] = None) -> List[Dict]:
+    start = EPOCH if offset is None else EPOCH.replace(tzinfo=timezone(timedelta(minutes=offset)))
+    timestamps = [(start + timestamp * MICROSECOND).isoformat() for timestamp in accumulate(deltas)]
+    items = [
+        {
+            "deviceId": device_id,
+            "timestamp": timestamp,
+            "telemetryType": telemetry_type,
+            "value": value,
+            "metadata": None
+        }
+        for device_id, timestamp, telemetry_type, value in zip(device_ids, timestamps, types, values)
+    ]
+    if sequences is not None:
+        for item, sequence in zip(items, sequences):
+            item["idempotencyKey"] = f"{item['deviceId']}-{sequence}"
+    return items
+
+
+def encode_columnar(items: List[Dict]) -> bytes:
+    offset, deltas, device_ids, types, values = _split_columns(items)
+    sequences = _split_sequences(items, device_ids)
+    base = deltas[0] if deltas else 0
+    deltas = deltas and [0] + deltas[1:]
+    
+    flags = 0
+    if offset is not None:
+        flags |= FLAG_AWARE
+    if deltas and (min(deltas) < INT32_MIN or max(deltas) > INT32_MAX):
+        flags |= FLAG_WIDE_DELTAS
+    if len(set(device_ids)) <= 1:
+        flags |= FLAG_SINGLE_DEVICE
+        device_ids = device_ids[:1]
+    if types and (min(types) < 0 or max(types) > 255):
+        raise ValueError("Код типу телеметрії не вміщується в один байт")
+    if sequences is not None:
+        flags |= FLAG_SEQUENCES
+    
+    header = COLUMNAR_HEADER.pack(COLUMNAR_MAGIC, COLUMNAR_VERSION, flags, offset or 0, len(items), base)
+    return b''.join((
+        header,
+        _little_endian(array('q' if flags & FLAG_WIDE_DELTAS else 'i', deltas)),
+        _little_endian(array('i', device_ids)),
+        bytes(types),
+        _little_endian(array('d', values)),
+        _little_endian(array('q', sequences)) if sequences is not None else b''
+    ))
+
+
+def decode_columnar(data: bytes) -> List[Dict]:
+    if len(data) < COLUMNAR_HEADER.size:
+        raise ValueError("Занадто короткий батч")
+    
+    magic, version, flags, offset, count, base = COLUMNAR_HEADER.unpack_from(data)
+    if magic != COLUMNAR_MAGIC or version != COLUMNAR_VERSION:
+        raise ValueError("Невідомий формат батчу")
+    
+    delta_code = 'q' if flags & FLAG_WIDE_DELTAS else 'i'
+    device_count = min(count, 1) if flags & FLAG_SINGLE_DEVICE else count
+    sizes = (count * array(delta_code).itemsize, device_count * 4, count, count * 8,
+             count * 8 if flags & FLAG_SEQUENCES else 0)
+    if len(data) != COLUMNAR_HEADER.size + sum(sizes):
+        raise ValueError("Розмір батчу не відповідає заголовку")
+    
+    position = COLUMNAR_HEADER.size
+    columns = []
+    for size in sizes:
+        columns.append(data[position:position + size])
+        position += size
+    
+    deltas = list(_from_little_endian(delta_code, columns[0]))
+    if count:
+        deltas[0] = base
+    device_ids = list(_from_little_endian('i', columns[1]))
+    if flags & FLAG_SINGLE_DEVICE:
+        device_ids = device_ids * count
+    return _join_columns(offset if flags & FLAG_AWARE else None, deltas, device_ids,
+                         columns[2], _from_little_endian('d', columns[3]),
+                         _from_little_endian('q', columns[4]) if flags & FLAG_SEQUENCES else None)
+
+
+def encode_msgpack(items: List[Dict]) -> bytes:
+    if msgpack is None:
+        raise ValueError("Пакет msgpack не встановлено")
+    
+    offset, deltas, device_ids, types, values = _split_columns(items)
+    batch = {
+        "v": COLUMNAR_VERSION,
+        "tz": offset,
+        "dt": deltas,
+        "dev": device_ids[:1] if len(set(device_ids)) <= 1 else device_ids,
+        "type": bytes(types) if not types or (min(types) >= 0 and max(types) <= 255) else types,
+        "val": values
+    }
+    sequences = _split_sequences(items, device_ids)
+    if sequences is not None:
+        batch["seq"] = sequences
+    return msgpack.packb(batch, use_bin_type=True)
+
+
+def decode_msgpack(data: bytes) -> List[Dict]:
+    if msgpack is None:
+        raise ValueError("Пакет msgpack не встановлено")
+    
+    batch = msgpack.unpackb(data, raw=False)
+    if not isinstance(batch, dict) or batch.get('v') != COLUMNAR_VERSION:
+        raise ValueError("Невідомий формат батчу")
+    
+    deltas = batch['dt']
+    device_ids = batch['dev']
+    if len(device_ids) == 1:
+        device_ids = device_ids * len(deltas)
+    return _join_columns(batch.get('tz'), deltas, device_ids, batch['type'], batch['val'], batch.get('seq'))
+
+
+def encode_batch(items: List[Dict], content_type: str) -> bytes:
+    if content_type == COLUMNAR_CONTENT_TYPE:
+        return encode_columnar(items)
+    if content_type == MSGPACK_CONTENT_TYPE:
+        return encode_msgpack(items)
+    return encode_json({"items": items})
+
+
+def decode_batch(data: bytes, content_type: str) -> List[Dict]:
+    content_type = (content_type or JSON_CONTENT_TYPE).split(';')[0].strip().lower()
+    if content_type == COLUMNAR_CONTENT_TYPE:
+        return decode_columnar(data)
+    if content_type == MSGPACK_CONTENT_TYPE:
+        return decode_msgpack(data)
+    if content_type == JSON_CONTENT_TYPE:
+        payload = decode_json(data)
+        return payload.get('items', []) if isinstance(payload, dict) else payload
+    raise ValueError(f"Непідтримуваний тип вмісту: {content_type}")
+
+
+class BatchFormatNegotiator:
+    
+    def __init__(self, server_config: Dict):
+        mode = str(server_config.get('telemetry_batch_format', 'json')).lower()
+        if mode == 'auto':
+            self.preferred = available_content_types()
+        elif mode in FORMAT_CONTENT_TYPES and FORMAT_CONTENT_TYPES[mode] in available_content_types():
+            self.preferred = [FORMAT_CONTENT_TYPES[mode], JSON_CONTENT_TYPE]
+        else:
+            self.preferred = [JSON_CONTENT_TYPE]
+        self.mode = mode
+        
+        self._rejected: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self.fallbacks = 0
+    
+    def content_type_for(self, host: str) -> str:
+        with self._lock:
+            rejected = self._rejected.get(host, ())
+        for content_type in self.preferred:
+            if content_type not in rejected:
+                return content_type
+        return JSON_CONTENT_TYPE
+    
+    def encode(self, host: str, payload: Dict) -> Tuple[bytes, str]:
+        content_type = self.content_type_for(host)
+        items = payload.get('items') if isinstance(payload, dict) else None
+        if content_type != JSON_CONTENT_TYPE and isinstance(items, list):
+            try:
+                return encode_batch(items, content_type), content_type
+            except (KeyError, TypeError, ValueError, OverflowError, struct.error):
+                pass
+        
+        return encode_json(payload), JSON_CONTENT_TYPE
+    
+    def should_reject(self, response_headers, status_code: int, content_type: Optional[str]) -> bool:
+        if status_code != 415 or content_type in (None, JSON_CONTENT_TYPE):
+            return False
+        return 'Accept-Post' in response_headers or 'Accept-Encoding' not in response_headers
+    
+    def reject(self, host: str, content_type: str, accept_post: Optional[str] = None):
+        accepted = None
+        if accept_post:
+            accepted = {item.split(';')[0].strip().lower() for item in accept_post.split(',')}
+        
+        with self._lock:
+            rejected = self._rejected.setdefault(host, set())
+            rejected.add(content_type)
+            if accepted:
+                rejected.update(item for item in self.preferred if item not in accepted)
+            self.fallbacks += 1
+        logger.warning("[API] Сервер %s не приймає формат %s, далі використовується %s",
+                       host, content_type, self.content_type_for(host))
+    
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "fallbacks": self.fallbacks,
+                "hostRejected": {host: sorted(items) for host, items in self._rejected.items()},
+                "formats": {content_type: dict(counters) for content_type, counters in self._counters.items()}
+            }
+    
+    def record(self, payload: Dict, body: bytes, content_type: str):
+        items = payload.get('items') if isinstance(payload, dict) else None
+        self._count(content_type, len(items) if isinstance(items, list) else 1, len(body))
+    
+    def _count(self, content_type: str, items: int, size: int):
+        with self._lock:
+            counters = self._counters.setdefault(content_type, {"batches": 0, "items": 0, "bytes": 0})
+            counters["batches"] += 1
+            counters["items"] += items
+            counters["bytes"] += size
@@ -0,0 +1,214 @@
+import logging
+import os
+import sqlite3
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from payload_builder import decode_json, encode_json
+
+
+logger = logging.getLogger(__name__)
+
+
+class TelemetryOutbox:
+    
+    def __init__(self, path: str, deliver: Callable[[str, List[Dict]], bool],
+                 max_records: int = 100000, max_size_mb: float = 50,
+                 drain_interval: float = 5.0, drain_batch_size: int = 500,
+                 batch_kinds: Tuple[str, ...] = ('telemetry',)):
+        self.path = path
+        self.deliver = deliver
+        self.batch_kinds = batch_kinds
+        self.max_records = max(1, int(max_records))
+        self.max_bytes = max(1, int(float(max_size_mb) * 1024 * 1024))
+        self.drain_interval = max(0.1, float(drain_interval))
+        self.drain_batch_size = max(1, int(drain_batch_size))
+        
+        self.dropped_count = 0
+        self.delivered_count = 0
+        self.last_drain_ok = True
+        
+        outbox_dir = os.path.dirname(path)
+        if outbox_dir and not os.path.exists(outbox_dir):
+            os.makedirs(outbox_dir, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._drain_lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "kind TEXT NOT NULL, "
+            "payload TEXT NOT NULL)"
+        )
+        
+        row = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0) FROM outbox").fetchone()
+        self._count, self._bytes = int(row[0]), int(row[1])
+        if self._count:
+            logger.info("[Outbox] Відновлено %d невідправлених записів з %s", self._count, path)
+        
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._closed = False
+        if self._count:
+            self._wakeup.set()
+        self._thread = threading.Thread(target=self._run, name="TelemetryOutbox", daemon=True)
+        self._thread.start()
+    
+    def append(self, kind: str, payloads: List[Dict]) -> bool:
+        if not payloads:
+            return True
+        
+        rows = [(kind, encode_json(payload).decode('utf-8')) for payload in payloads]
+        added_bytes = sum(len(row[1]) for row in rows)
+        
+        with self._lock:
+            if self._closed:
+                return False
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                self._conn.executemany("INSERT INTO outbox (kind, payload) VALUES (?, ?)", rows)
+                self._count += len(rows)
+                self._bytes += added_bytes
+                self._enforce_bounds()
+                self._conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                self._conn.execute("ROLLBACK")
+                self._reload_totals()
+                logger.error("[Outbox] Не вдалося записати %d записів: %s", len(rows), e)
+                return False
+        
+        self._wakeup.set()
+        return True
+    
+    def pending_count(self) -> int:
+        with self._lock:
+            return self._count
+    
+    def drain(self) -> bool:
+        with self._drain_lock:
+            while True:
+                with self._lock:
+                    if self._conn is None:
+                        return False
+                    chunk = self._next_chunk()
+                if not chunk:
+                    self.last_drain_ok = True
+                    return True
+                
+                kind, row_ids, payloads = chunk
+                try:
+                    delivered = self.deliver(kind, payloads)
+                except Exception as e:
+                    logger.exception("[Outbox] Помилка доставки: %s", e)
+                    delivered = False
+                
+                if not delivered:
+                    self.last_drain_ok = False
+                    return False
+                
+                with self._lock:
+                    self._delete(row_ids)
+                self.delivered_count += len(row_ids)
+    
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.drain_interval + 1)
+        
+        if self.last_drain_ok:
+            self.drain()
+        
+        with self._drain_lock, self._lock:
+            self._conn.close()
+            self._conn = None
+    
+    def _next_chunk(self) -> Tuple:
+        first = self._conn.execute("SELECT kind FROM outbox ORDER BY id LIMIT 1").fetchone()
+        if first is None:
+            return ()
+        
+        kind = first[0]
+        limit = self.drain_batch_size if kind in self.batch_kinds else 1
+        rows = self._conn.execute(
+            "SELECT id, kind, payload FROM outbox ORDER BY id LIMIT ?",
+            (limit,)
+        ).fetchall()
+        
+        row_ids = []
+        payloads = []
+        for row_id, row_kind, payload in rows:
+            if row_kind != kind:
+                break
+            row_ids.append(row_id)
+            payloads.append(decode_json(payload))
+        
+        return kind, row_ids, payloads
+    
+    def _delete(self, row_ids: List[int]):
+        placeholders = ",".join("?" * len(row_ids))
+        removed_bytes = self._conn.execute(
+            f"SELECT COALESCE(SUM(LENGTH(payload)), 0) FROM outbox WHERE id IN ({placeholders})",
+            row_ids
+        ).fetchone()[0]
+        cursor = self._conn.execute(f"DELETE FROM outbox WHERE id IN ({placeholders})", row_ids)
+        self._count -= cursor.rowcount
+        self._bytes -= int(removed_bytes)
+    
+    def _enforce_bounds(self):
+        while self._count > self.max_records or self._bytes > self.max_bytes:
+            overflow = max(self._count - self.max_records, 1)
+            oldest = self._conn.execute(
+                "SELECT id, LENGTH(payload) FROM outbox ORDER BY id LIMIT ?",
+                (overflow,)
+            ).fetchall()
+            if not oldest:
+                break
+            self._conn.execute("DELETE FROM outbox WHERE id <= ?", (oldest[-1][0],))
+            self._count -= len(oldest)
+            self._bytes -= sum(int(size) for _, size in oldest)
+            self.dropped_count += len(oldest)
+            logger.warning("[Outbox] Перевищено ліміт сховища, видалено найстаріших записів: %d", len(oldest))
+    
+    def _reload_totals(self):
+        row = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0) FROM outbox").fetchone()
+        self._count, self._bytes = int(row[0]), int(row[1])
+    
+    def _run(self):
+        while not self._stop.is_set():
+            if self.last_drain_ok:
+                self._wakeup.wait()
+            else:
+                self._stop.wait(self.drain_interval)
+            self._wakeup.clear()
+            
+            if self._stop.is_set():
+                return
+            
+            self.drain()
+
+
+def create_telemetry_outbox(config: Dict, deliver: Callable[[str, List[Dict]], bool]) -> Optional[TelemetryOutbox]:
+    outbox_config = config.get('outbox', {})
+    if not outbox_config.get('enabled', False):
+        return None
+    outbox_path = outbox_config.get('path', 'data/outbox.db')
+    if not os.path.isabs(outbox_path):
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        outbox_path = os.path.join(base_dir, outbox_path)
+    return TelemetryOutbox(
+        outbox_path,
+        deliver,
+        max_records=outbox_config.get('max_records', 100000),
+        max_size_mb=outbox_config.get('max_size_mb', 50),
+        drain_interval=outbox_config.get('drain_interval', 5),
+        drain_batch_size=outbox_config.get('drain_batch_size', 500)
+    )
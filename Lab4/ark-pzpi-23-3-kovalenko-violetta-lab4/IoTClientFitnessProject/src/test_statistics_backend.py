@@ -0,0 +1,93 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from statistics_backend import BACKEND_NUMPY, BACKEND_PYTHON
+from statistics_calculator import METRIC_HEART_RATE, StatisticsCalculator
+
+
+START = datetime(2026, 3, 2)
+DAYS = 7
+APPROX_KEYS = ('avg', 'stdDev')
+
+
+def generate_samples(count: int, integer: bool, seed: int = 7):
+    rng = random.Random(seed)
+    timestamps = [START + timedelta(seconds=rng.randrange(DAYS * 86400)) for _ in range(count)]
+    if integer:
+        values = [rng.randint(40, 200) for _ in range(count)]
+    else:
+        values = [rng.uniform(20.0, 240.0) for _ in range(count)]
+    return timestamps, values
+
+
+def ingest(backend: str, timestamps, values, chunks: int = 3) -> StatisticsCalculator:
+    calculator = StatisticsCalculator(backend)
+    size = -(-len(values) // chunks)
+    for offset in range(0, len(values), size):
+        calculator.add_heart_rate_many(timestamps[offset:offset + size], values[offset:offset + size])
+    calculator.add_heart_rate(72, START + timedelta(days=2, hours=9))
+    return calculator
+
+
+def assert_same(python, numpy, key=None):
+    if isinstance(python, dict):
+        assert isinstance(numpy, dict) and python.keys() == numpy.keys()
+        for name in python:
+            assert_same(python[name], numpy[name], name)
+    elif isinstance(python, list):
+        assert isinstance(numpy, list) and len(python) == len(numpy)
+        for python_item, numpy_item in zip(python, numpy):
+            assert_same(python_item, numpy_item, key)
+    elif key in APPROX_KEYS and python is not None:
+        assert numpy == pytest.approx(python, rel=1e-12)
+    else:
+        assert type(python) is type(numpy), key
+        assert python == numpy, key
+
+
+@pytest.fixture(params=[True, False], ids=['integer', 'float'])
+def calculators(request):
+    timestamps, values = generate_samples(20000, request.param)
+    return ingest(BACKEND_PYTHON, timestamps, values), ingest(BACKEND_NUMPY, timestamps, values)
+
+
+def test_daily_stats_match(calculators):
+    python, numpy = calculators
+    for offset in range(-1, DAYS + 1):
+        date = START + timedelta(days=offset, hours=12)
+        assert_same(python.get_daily_heart_rate_stats(date), numpy.get_daily_heart_rate_stats(date))
+        assert_same(python.get_heart_rate_percentiles(date), numpy.get_heart_rate_percentiles(date))
+        assert_same(python.get_heart_rate_zones(date), numpy.get_heart_rate_zones(date))
+
+
+@pytest.mark.parametrize('bucket', ['1d', '1h', '15m'])
+def test_aggregate_matches(calculators, bucket):
+    python, numpy = calculators
+    start, end = START + timedelta(hours=3, minutes=7), START + timedelta(days=DAYS)
+    python_buckets = python.aggregate(METRIC_HEART_RATE, start, end, bucket)
+    assert python_buckets
+    assert_same(python_buckets, numpy.aggregate(METRIC_HEART_RATE, start, end, bucket))
+
+
+def test_min_max_are_floats_for_integer_input():
+    timestamps, values = generate_samples(500, integer=True)
+    for backend in (BACKEND_PYTHON, BACKEND_NUMPY):
+        calculator = ingest(backend, timestamps, values)
+        for bucket in calculator.aggregate(METRIC_HEART_RATE, START, START + timedelta(days=DAYS), '1d'):
+            if bucket['count']:
+                assert isinstance(bucket['min'], float) and isinstance(bucket['max'], float)
+
+
+def test_numpy_arrays_match_lists():
+    timestamps, values = generate_samples(5000, integer=False)
+    python = ingest(BACKEND_PYTHON, timestamps, values)
+    numpy = StatisticsCalculator(BACKEND_NUMPY)
+    numpy.add_heart_rate_many(np.array(timestamps, dtype='datetime64[us]'), np.array(values))
+    numpy.add_heart_rate(72, START + timedelta(days=2, hours=9))
+    for bucket in ('1d', '1h', '15m'):
+        assert_same(python.aggregate(METRIC_HEART_RATE, START, START + timedelta(days=DAYS), bucket),
+                    numpy.aggregate(METRIC_HEART_RATE, START, START + timedelta(days=DAYS), bucket))
@@ -0,0 +1,89 @@
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from api_payloads import as_list
+
+
+class UserProfileDirectory:
+    
+    def __init__(self, entry_ttl: float = 300, reload_interval: float = 600):
+        self.entry_ttl = max(0.0, float(entry_ttl))
+        self.reload_interval = max(0.0, float(reload_interval))
+        self.server_filters: Optional[bool] = None
+        
+        self._index: Dict[Any, Tuple[Dict, float]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.queries = 0
+        self.reloads = 0
+        self.refreshes = 0
+    
+    def supports_query(self) -> bool:
+        return self.server_filters is not False
+    
+    def resolve_query(self, user_id, profiles: Any) -> Optional[Dict]:
+        profiles = [profile for profile in as_list(profiles) if isinstance(profile, dict)]
+        with self._lock:
+            self.queries += 1
+            if all(profile.get('userId') == user_id for profile in profiles):
+                self.server_filters = True
+                return profiles[0] if profiles else None
+            self.server_filters = False
+        self.load(profiles)
+        return self.lookup(user_id)
+    
+    def lookup(self, user_id) -> Optional[Dict]:
+        with self._lock:
+            entry = self._index.get(user_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[0]
+    
+    def is_stale(self, user_id) -> bool:
+        with self._lock:
+            entry = self._index.get(user_id)
+            return entry is not None and time.monotonic() - entry[1] >= self.entry_ttl
+    
+    def needs_reload(self) -> bool:
+        with self._lock:
+            return self._loaded_at is None or time.monotonic() - self._loaded_at >= self.reload_interval
+    
+    def load(self, profiles: Iterable[Any]):
+        now = time.monotonic()
+        if isinstance(profiles, dict):
+            profiles = ()
+        index = {
+            profile.get('userId'): (profile, now)
+            for profile in profiles or ()
+            if isinstance(profile, dict) and profile.get('userId') is not None
+        }
+        with self._lock:
+            self._index = index
+            self._loaded_at = now
+            self.reloads += 1
+    
+    def update(self, user_id, profile: Optional[Dict]) -> Optional[Dict]:
+        with self._lock:
+            self.refreshes += 1
+            if isinstance(profile, dict) and profile.get('userId') == user_id:
+                self._index[user_id] = (profile, time.monotonic())
+                return profile
+            self._index.pop(user_id, None)
+            return None
+    
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "serverFilters": self.server_filters,
+                "size": len(self._index),
+                "hits": self.hits,
+                "misses": self.misses,
+                "queries": self.queries,
+                "reloads": self.reloads,
+                "refreshes": self.refreshes
+            }
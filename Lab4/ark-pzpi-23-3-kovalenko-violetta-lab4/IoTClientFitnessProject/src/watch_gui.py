@@ -2,16 +2,22 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 from datetime import datetime, timedelta
+import logging
 import threading
 import time
 import random
 from typing import Optional
 from api_client import ApiClient
+from api_payloads import meal_recipe_ids
+from dashboard_snapshot import STATUS_ERROR, STATUS_TIMEOUT
 from sensor_simulator import SensorSimulator
 from statistics_calculator import StatisticsCalculator
 from config_manager import ConfigManager
 
 
+logger = logging.getLogger(__name__)
+
+
 class WatchGUI:
     
     def __init__(self, api_client: ApiClient, sensor_simulator: SensorSimulator, 
@@ -197,7 +203,17 @@ class WatchGUI:
                 return
             
             today = datetime.now()
-            stats = self.api_client.get_daily_statistics(today, user_id)
+            snapshot = self.api_client.get_dashboard_snapshot(user_id, today)
+            if snapshot['failed']:
+                logger.warning("[GUI] Частини панелі не завантажено: %s", ', '.join(snapshot['failed']))
+            self.fill_dashboard_tabs(snapshot)
+            stats = snapshot['daily']
+            
+            if not stats and not self.api_client.is_server_available():
+                self.heart_rate_label.config(text="Сервер недоступний")
+                self.steps_label.config(text="Сервер недоступний")
+                self.activity_label.config(text="Сервер недоступний")
+                return
             
             if not stats:
                 self.heart_rate_label.config(text="Немає даних")
@@ -226,9 +242,7 @@ class WatchGUI:
             self.root.update_idletasks()
             
         except Exception as e:
-            print(f"Помилка оновлення даних: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("[GUI] Помилка оновлення даних: %s", e)
             self.heart_rate_label.config(text="Помилка")
             self.steps_label.config(text="Помилка")
             self.activity_label.config(text="Помилка")
@@ -236,6 +250,38 @@ class WatchGUI:
             self.btn_refresh.config(state=tk.NORMAL, text="Оновити дані")
             self.root.update_idletasks()
     
+    def fill_dashboard_tabs(self, snapshot):
+        if snapshot['recommendations']:
+            self.display_recommendations(snapshot['recommendations'])
+        else:
+            self.recommendations_text.delete(1.0, tk.END)
+            self.recommendations_text.insert(tk.END, self._dashboard_part_text(
+                snapshot, 'recommendations', "Рекомендації не знайдено."))
+        
+        if snapshot['daily']:
+            self.display_daily_statistics(snapshot['daily'])
+        else:
+            self.statistics_text.delete(1.0, tk.END)
+            self.statistics_text.insert(tk.END, self._dashboard_part_text(
+                snapshot, 'daily', "Статистика не знайдена."))
+        
+        self.diet_text.delete(1.0, tk.END)
+        if snapshot['dietPlan']:
+            if snapshot['profile']:
+                self.diet_text.insert(tk.END, self._format_user_profile(snapshot['profile']) + "\n" + "=" * 50 + "\n\n")
+            self.display_diet_plan(snapshot['dietPlan'], snapshot['recipes'])
+        else:
+            self.diet_text.insert(tk.END, self._dashboard_part_text(
+                snapshot, 'dietPlan', "План дієти ще не створено. Натисніть \"Завантажити план\"."))
+    
+    def _dashboard_part_text(self, snapshot, part, empty_text):
+        entry = snapshot['parts'][part]
+        if entry['status'] == STATUS_TIMEOUT:
+            return "Сервер не відповів вчасно, спробуйте оновити дані ще раз."
+        if entry['status'] == STATUS_ERROR:
+            return f"Помилка: {entry.get('error', 'невідома')}"
+        return empty_text
+    
     def _calculate_activity_score(self, stats):
         try:
             hr_avg = stats.get('heartRateAvg')
@@ -260,14 +306,13 @@ class WatchGUI:
         try:
             user_id = self.api_client.user_id
             
-            print(f"[GUI] Завантаження профілю для user_id={user_id}")
             user_profile = self.api_client.get_user_profile(user_id)
             if user_profile:
-                print(f"[GUI] Профіль завантажено: {user_profile.get('firstName', 'N/A')} {user_profile.get('lastName', 'N/A')}")
+                logger.debug("[GUI] Профіль завантажено: %s %s", user_profile.get('firstName', 'N/A'),
+                             user_profile.get('lastName', 'N/A'))
             else:
-                print(f"[GUI] Профіль не знайдено")
+                logger.info("[GUI] Профіль не знайдено для user_id=%s", user_id)
             
-            print(f"[GUI] Генерація нового плану дієти...")
             from datetime import datetime
             today = datetime.now().strftime('%Y-%m-%d')
             
@@ -286,19 +331,12 @@ class WatchGUI:
                 plan_data = generated_plan.get('plan')
                 if isinstance(plan_data, dict):
                     plan_id = plan_data.get('dailyDietPlanId')
-                    print(f"[GUI] Знайдено ID плану в полі 'plan': {plan_id}")
                 if not plan_id:
                     plan_id = generated_plan.get('dailyDietPlanId')
-                    if plan_id:
-                        print(f"[GUI] Знайдено ID плану в корені: {plan_id}")
             
             if not plan_id:
-                print(f"[GUI] Не вдалося отримати ID згенерованого плану. Структура: {list(generated_plan.keys()) if isinstance(generated_plan, dict) else type(generated_plan)}")
-                plans = self.api_client.get_daily_diet_plans(user_id)
-                if plans:
-                    plans_sorted = sorted(plans, key=lambda p: p.get('dailyDietPlanId', 0), reverse=True)
-                    plan_id = plans_sorted[0].get('dailyDietPlanId')
-                    print(f"[GUI] Використано найновіший план зі списку: ID={plan_id}")
+                logger.warning("[GUI] Не вдалося отримати ID згенерованого плану, використовується найновіший план зі списку")
+                plan_id = self.api_client.get_latest_daily_diet_plan_id(user_id)
             
             if not plan_id:
                 self.diet_text.delete(1.0, tk.END)
@@ -308,7 +346,7 @@ class WatchGUI:
                 self.diet_text.insert(tk.END, text)
                 return
             
-            print(f"[GUI] Завантаження деталей плану з прийомами: plan_id={plan_id}")
+            logger.debug("[GUI] Завантаження деталей плану з прийомами: plan_id=%s", plan_id)
             plan_details = self.api_client.get_daily_diet_plan(plan_id)
             
             if not plan_details:
@@ -322,16 +360,12 @@ class WatchGUI:
             profile_text = ""
             if user_profile:
                 profile_text = self._format_user_profile(user_profile) + "\n" + "=" * 50 + "\n\n"
-                print(f"[GUI] Профіль користувача завантажено: {user_profile.get('firstName', 'N/A')}")
-            else:
-                print(f"[GUI] Профіль користувача не знайдено для user_id={user_id}")
             
             self.diet_text.insert(1.0, profile_text)
-            
-            print(f"[GUI] Структура плану: {list(plan_details.keys()) if isinstance(plan_details, dict) else type(plan_details)}")
             self.display_diet_plan(plan_details)
             
         except Exception as e:
+            logger.exception("[GUI] Помилка завантаження плану дієти: %s", e)
             self.diet_text.delete(1.0, tk.END)
             self.diet_text.insert(tk.END, f"Помилка: {str(e)}")
             import traceback
@@ -386,7 +420,7 @@ class WatchGUI:
         
         return text
     
-    def display_diet_plan(self, plan_data):
+    def display_diet_plan(self, plan_data, recipes=None):
         current_text = self.diet_text.get(1.0, tk.END)
         
         date_str = plan_data.get('dailyPlanCreatedAt')
@@ -410,20 +444,8 @@ class WatchGUI:
             elif 'Meals' in plan_data:
                 meals = plan_data.get('Meals', [])
         
-        print(f"[GUI] ========== ОБРОБКА ПЛАНУ ДІЄТИ ==========")
-        print(f"[GUI] Знайдено прийомів їжі: {len(meals)}")
-        print(f"[GUI] Повна структура plan_data: {list(plan_data.keys()) if isinstance(plan_data, dict) else type(plan_data)}")
-        if meals:
-            print(f"[GUI] Перший прийом ключі: {meals[0].keys() if isinstance(meals[0], dict) else type(meals[0])}")
-            print(f"[GUI] Всі прийоми (mealTime): {[meal.get('mealTime', meal.get('MealTime', 'N/A')) for meal in meals]}")
-            print(f"[GUI] Всі прийоми (mealOrder): {[meal.get('mealOrder', meal.get('MealOrder', 'N/A')) for meal in meals]}")
-            for i, meal in enumerate(meals, 1):
-                if isinstance(meal, dict):
-                    print(f"[GUI] Прийом {i}: mealTime={meal.get('mealTime', meal.get('MealTime', 'N/A'))}, "
-                          f"mealOrder={meal.get('mealOrder', meal.get('MealOrder', 'N/A'))}, "
-                          f"calories={meal.get('mealTargetCalories', meal.get('MealTargetCalories', 0))}")
-                else:
-                    print(f"[GUI] Прийом {i}: НЕ СЛОВНИК! Тип: {type(meal)}")
+        logger.debug("[GUI] Обробка плану дієти: прийомів їжі %d, структура %s", len(meals),
+                     list(plan_data.keys()) if isinstance(plan_data, dict) else type(plan_data))
         
         total_calories = 0
         total_protein = 0
@@ -452,19 +474,17 @@ class WatchGUI:
             
             processed_meals = 0
             skipped_meals = 0
-            
-            print(f"[GUI] Початок обробки {len(meals)} прийомів...")
+            if recipes is None:
+                recipes = self.api_client.get_recipes(meal_recipe_ids(meals))
             
             for idx, meal in enumerate(meals, 1):
-                print(f"[GUI] --- Обробка прийому {idx} з {len(meals)} ---")
                 if not isinstance(meal, dict):
-                    print(f"[GUI] Пропущено прийом {idx}: не є словником, тип: {type(meal)}")
+                    logger.debug("[GUI] Пропущено прийом %d: не є словником, тип: %s", idx, type(meal))
                     skipped_meals += 1
                     continue
                 
                 processed_meals += 1
                 meal_time = meal.get('mealTime', meal.get('MealTime', 'Невідомий час'))
-                print(f"[GUI] Обробляється прийом {idx}: mealTime={meal_time}")
                 calories = meal.get('mealTargetCalories', meal.get('MealTargetCalories', 0)) or 0
                 protein = meal.get('mealTargetProtein', meal.get('MealTargetProtein', 0)) or 0
                 fat = meal.get('mealTargetFat', meal.get('MealTargetFat', 0)) or 0
@@ -484,7 +504,7 @@ class WatchGUI:
                 text += f"   Білки: {protein:.1f} г | Жири: {fat:.1f} г | Вуглеводи: {carbs:.1f} г\n"
                 
                 meal_recipes = meal.get('mealRecipes', meal.get('MealRecipes', []))
-                print(f"[GUI] Прийом {idx} ({meal_time}): знайдено {len(meal_recipes)} рецептів")
+                logger.debug("[GUI] Прийом %d (%s): знайдено %d рецептів", idx, meal_time, len(meal_recipes))
                 
                 if meal_recipes:
                     text += "   Страви:\n"
@@ -496,13 +516,9 @@ class WatchGUI:
                             continue
                             
                         recipe_name = f'Рецепт {recipe_id}'
-                        
-                        try:
-                            recipe_details = self.api_client.get_recipe(recipe_id)
-                            if recipe_details:
-                                recipe_name = recipe_details.get('recipeName', recipe_details.get('RecipeName', recipe_name))
-                        except Exception as e:
-                            print(f"[GUI] Помилка завантаження рецепта {recipe_id}: {e}")
+                        recipe_details = recipes.get(recipe_id)
+                        if recipe_details:
+                            recipe_name = recipe_details.get('recipeName', recipe_details.get('RecipeName', recipe_name))
                         
                         portions_metadata = recipe.get('portionsMetadata', recipe.get('PortionsMetadata', ''))
                         
@@ -524,29 +540,17 @@ class WatchGUI:
                         text += f"     - {recipe_name} ({portions} порцій)\n"
                 else:
                     text += "   Страви: не вказано\n"
-                    print(f"[GUI] Прийом {idx} не містить рецептів. Ключі: {list(meal.keys())}")
+                    logger.debug("[GUI] Прийом %d не містить рецептів. Ключі: %s", idx, list(meal.keys()))
             
-            print(f"[GUI] ========== РЕЗУЛЬТАТ ОБРОБКИ ==========")
-            print(f"[GUI] Всього прийомів отримано: {len(meals)}")
-            print(f"[GUI] Оброблено успішно: {processed_meals}")
-            print(f"[GUI] Пропущено: {skipped_meals}")
-            print(f"[GUI] Довжина тексту для відображення: {len(text)} символів")
+            logger.debug("[GUI] Прийомів отримано: %d, оброблено: %d, пропущено: %d, довжина тексту: %d символів",
+                         len(meals), processed_meals, skipped_meals, len(text))
         else:
             text += "Прийоми їжі не знайдено.\n"
             text += f"Структура даних: {list(plan_data.keys())}\n"
         
-        print(f"[GUI] Додавання тексту до віджета. Довжина тексту: {len(text)} символів")
-        print(f"[GUI] Кількість рядків у тексті: {text.count(chr(10))}")
         self.diet_text.insert(tk.END, text)
-        
-        final_text = self.diet_text.get(1.0, tk.END)
-        final_lines = final_text.count('\n')
-        print(f"[GUI] Після додавання: всього рядків у віджеті: {final_lines}")
-        print(f"[GUI] Кількість входжень 'Прийоми їжі': {final_text.count('Прийоми їжі')}")
-        print(f"[GUI] Кількість входжень 'Сніданок': {final_text.count('Сніданок')}")
-        print(f"[GUI] Кількість входжень 'Обід': {final_text.count('Обід')}")
-        print(f"[GUI] Кількість входжень 'Вечеря': {final_text.count('Вечеря')}")
-        print(f"[GUI] Кількість входжень 'Перекус': {final_text.count('Перекус')}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[GUI] Рядків у віджеті плану дієти: %d", self.diet_text.get(1.0, tk.END).count('\n'))
     
     def clear_diet_display(self):
         self.diet_text.delete(1.0, tk.END)
@@ -620,6 +624,13 @@ class WatchGUI:
             
             stats = self.api_client.get_daily_statistics(today, user_id)
             
+            if stats is None and not self.api_client.is_server_available():
+                self.statistics_text.delete(1.0, tk.END)
+                self.statistics_text.insert(tk.END, "Сервер недоступний.\n")
+                self.statistics_text.insert(tk.END, f"Сервер: {self.api_client.base_url}\n")
+                self.statistics_text.insert(tk.END, "Запити тимчасово не надсилаються, спробуйте пізніше.\n")
+                return
+            
             if stats is None:
                 self.statistics_text.delete(1.0, tk.END)
                 self.statistics_text.insert(tk.END, "Статистика не знайдена (сервер повернув None)\n\n")
@@ -642,6 +653,7 @@ class WatchGUI:
             self.display_daily_statistics(stats)
             
         except Exception as e:
+            logger.exception("[GUI] Помилка завантаження статистики: %s", e)
             self.statistics_text.delete(1.0, tk.END)
             self.statistics_text.insert(tk.END, f"Помилка завантаження статистики:\n")
             self.statistics_text.insert(tk.END, f"{str(e)}\n\n")
@@ -5,5 +5,6 @@ namespace FitnessProject.BLL.Services.Interfaces;
 public interface IUserProfileService : IService<Entities.UserProfile, UserProfileCreateDto, UserProfileUpdateDto, UserProfileResponseDto>
 {
     Task<UserProfileDetailsDto?> GetUserProfileDetailsByIdAsync(int id);
+    Task<UserProfileResponseDto?> GetByUserIdAsync(int userId);
 }
 
@@ -29,6 +29,12 @@ public class UserProfileService : IUserProfileService
         return entity == null ? null : _mapper.Map<UserProfileDetailsDto>(entity);
     }
 
+    public async Task<UserProfileResponseDto?> GetByUserIdAsync(int userId)
+    {
+        var entity = await _repository.GetByUserIdAsync(userId);
+        return entity == null ? null : _mapper.Map<UserProfileResponseDto>(entity);
+    }
+
     public async Task<IEnumerable<UserProfileResponseDto>> GetAllAsync()
     {
         var entities = await _repository.GetAllAsync();
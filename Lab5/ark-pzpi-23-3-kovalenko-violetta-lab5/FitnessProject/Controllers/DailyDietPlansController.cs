@@ -38,8 +38,14 @@ public class DailyDietPlansController : ControllerBase
     }
 
     [HttpGet]
-    public async Task<ActionResult<IEnumerable<DailyDietPlanResponseDto>>> GetAll([FromQuery] int? userId = null)
+    public async Task<ActionResult<IEnumerable<DailyDietPlanResponseDto>>> GetAll(
+        [FromQuery] int? userId = null,
+        [FromQuery] int? limit = null,
+        [FromQuery] string? orderBy = null)
     {
+        if (limit.HasValue && limit.Value < 0)
+            return BadRequest(new { error = _localizer["Errors.BadRequest"] });
+
         IEnumerable<DailyDietPlanResponseDto> plans;
         
         if (userId.HasValue)
@@ -53,6 +59,32 @@ public class DailyDietPlansController : ControllerBase
         {
             plans = await _dailyDietPlanService.GetAllAsync();
         }
+
+        if (!string.IsNullOrEmpty(orderBy))
+        {
+            var descending = orderBy.StartsWith('-');
+            var field = orderBy.TrimStart('-');
+
+            if (field.Equals("dailyDietPlanId", StringComparison.OrdinalIgnoreCase))
+            {
+                plans = descending
+                    ? plans.OrderByDescending(p => p.DailyDietPlanId)
+                    : plans.OrderBy(p => p.DailyDietPlanId);
+            }
+            else if (field.Equals("dailyPlanCreatedAt", StringComparison.OrdinalIgnoreCase))
+            {
+                plans = descending
+                    ? plans.OrderByDescending(p => p.DailyPlanCreatedAt).ThenByDescending(p => p.DailyDietPlanId)
+                    : plans.OrderBy(p => p.DailyPlanCreatedAt).ThenBy(p => p.DailyDietPlanId);
+            }
+            else
+            {
+                return BadRequest(new { error = _localizer["Errors.BadRequest"] });
+            }
+        }
+
+        if (limit.HasValue)
+            plans = plans.Take(limit.Value);
         
         return Ok(plans);
     }
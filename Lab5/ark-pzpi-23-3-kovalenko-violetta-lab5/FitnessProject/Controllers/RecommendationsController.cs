@@ -99,13 +99,21 @@ public class RecommendationsController : ControllerBase
     }
 
     [HttpGet("corrections")]
-    public async Task<ActionResult<IEnumerable<RecommendationResponseDto>>> GetCorrectionRecommendations([FromQuery] int? userId)
+    public async Task<ActionResult<IEnumerable<RecommendationResponseDto>>> GetCorrectionRecommendations(
+        [FromQuery] int? userId,
+        [FromQuery] int? limit = null)
     {
+        if (limit.HasValue && limit.Value < 0)
+            return BadRequest(new { error = _localizer["Errors.BadRequest"] });
+
         var corrections = await _recommendationRepository.FindAsync(r =>
             r.RecommendationType == RecommendationType.DietCorrection &&
             r.RecommendationStatus == RecommendationStatus.New &&
             (!userId.HasValue || r.Meal != null && r.Meal.DailyDietPlan.UserId == userId.Value));
 
+        if (limit.HasValue)
+            corrections = corrections.OrderByDescending(r => r.RecommendationCreatedAt).Take(limit.Value);
+
         var response = corrections.Select(r => new RecommendationResponseDto
         {
             RecommendationId = r.RecommendationId,
@@ -16,8 +16,14 @@ public class UserProfilesController : ControllerBase
     }
 
     [HttpGet]
-    public async Task<ActionResult<IEnumerable<UserProfileResponseDto>>> GetAll()
+    public async Task<ActionResult<IEnumerable<UserProfileResponseDto>>> GetAll([FromQuery] int? userId = null)
     {
+        if (userId.HasValue)
+        {
+            var profile = await _userProfileService.GetByUserIdAsync(userId.Value);
+            return Ok(profile == null ? Array.Empty<UserProfileResponseDto>() : new[] { profile });
+        }
+
         var profiles = await _userProfileService.GetAllAsync();
         return Ok(profiles);
     }
@@ -5,5 +5,6 @@ namespace FitnessProject.DAL.Interfaces;
 public interface IUserProfileRepository : IRepository<UserProfile>
 {
     Task<UserProfile?> GetUserProfileDetailsByIdAsync(int id);
+    Task<UserProfile?> GetByUserIdAsync(int userId);
 }
 
@@ -17,5 +17,10 @@ public class UserProfileRepository : Repository<UserProfile>, IUserProfileReposi
             .Include(up => up.User)
             .FirstOrDefaultAsync(up => up.ProfileId == id);
     }
+
+    public async Task<UserProfile?> GetByUserIdAsync(int userId)
+    {
+        return await _dbSet.FirstOrDefaultAsync(up => up.UserId == userId);
+    }
 }
 
@@ -70,6 +70,9 @@ namespace FitnessProject
             }).AddScheme<AuthenticationSchemeOptions, BasicAuthenticationHandler>("Basic", null);
             builder.Services.AddAuthorization();
 
+            builder.Services.AddRequestDecompression();
+            builder.Services.AddResponseCompression();
+
             builder.Services.AddControllers();
             builder.Services.AddEndpointsApiExplorer();
             builder.Services.AddSwaggerGen(c =>
@@ -111,6 +114,9 @@ namespace FitnessProject
             };
             app.UseRequestLocalization(localizationOptions);
 
+            app.UseResponseCompression();
+            app.UseRequestDecompression();
+
             if (app.Environment.IsDevelopment())
             {
                 using (var scope = app.Services.CreateScope())
@@ -0,0 +1,486 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from requests.structures import CaseInsensitiveDict
+
+from base_api_client import BaseApiClient
+from response_cache import ResponseCache
+from payload_builder import TelemetryPayloadBuilder, decode_json
+from request_body import RequestBody
+from request_flow import RequestFlow
+from telemetry_codec import BatchFormatNegotiator
+from telemetry_batcher import AsyncTelemetryBatcher
+from telemetry_outbox import create_telemetry_outbox
+from config_manager import ConfigManager
+from dashboard_snapshot import DashboardSnapshot
+from request_metrics import MetricsSink
+from hedging import HEDGE_PRIMARY, HEDGE_SECONDARY, first_answer
+from api_payloads import (TELEMETRY_RECEIVE_PATH, TELEMETRY_BATCH_PATH, SLEEP_RECORDS_PATH,
+                          DAILY_DIET_PLANS_PATH, GENERATE_DIET_PLAN_PATH, USER_PROFILES_PATH,
+                          RECOMMENDATIONS_PATH, LATEST_DIET_PLAN_ORDER, as_list, list_query_params,
+                          build_telemetry_batch_payload, build_sleep_record_payload,
+                          build_generate_diet_plan_payload, daily_diet_plan_meals_path,
+                          daily_statistics_path, latest_diet_plan_id, recipe_path, user_profile_path,
+                          user_profile_details_path, week_start, weekly_statistics_path)
+
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncApiResponse:
+    
+    def __init__(self, status_code: int, headers: Dict, content: bytes):
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+    
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', errors='replace')
+    
+    def json(self):
+        return decode_json(self.content)
+
+
+class AsyncApiClient(BaseApiClient):
+    
+    timeout_errors = (asyncio.TimeoutError,)
+    connection_errors = (aiohttp.ClientConnectionError,) if aiohttp is not None else ()
+    
+    def __init__(self, config_manager: ConfigManager, metrics: Optional[MetricsSink] = None):
+        if aiohttp is None:
+            raise ImportError("Для AsyncApiClient потрібен пакет aiohttp (pip install aiohttp)")
+        
+        super().__init__(config_manager, metrics)
+        self.payload_builder = TelemetryPayloadBuilder(self.device_id, self.sequence_journal)
+        
+        server_config = self.config['server']
+        self.max_connections = server_config.get('async_max_connections', 100)
+        self.max_connections_per_host = server_config.get('async_max_connections_per_host', 0)
+        self._http_session = None
+        try:
+            self._loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            self._loop = None
+        
+        self.telemetry_outbox = create_telemetry_outbox(self.config, self._deliver_outbox_records)
+        data_config = self.config.get('data', {})
+        self.telemetry_batcher = None
+        if data_config.get('batching_enabled', False):
+            self.telemetry_batcher = AsyncTelemetryBatcher(self.send_telemetry_batch,
+                                                           batch_size=data_config.get('batch_size', 5))
+    
+    def _create_transport(self):
+        return None
+    
+    def _timeout_message(self, limit: Optional[float]) -> str:
+        return f"Таймаут запиту (більше {limit:.1f} секунд)"
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def _get_http_session(self):
+        if self._http_session is None or self._http_session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host
+            )
+            self._http_session = aiohttp.ClientSession(
+                connector=connector,
+                headers={
+                    'Content-Type': 'application/json',
+                    'Accept': 'application/json',
+                    'Accept-Encoding': self.compression.accept_encoding
+                }
+            )
+        return self._http_session
+    
+    async def _make_request(self, method: str, url: str, payload: Optional[Dict] = None,
+                            params: Optional[Dict] = None,
+                            formats: Optional[BatchFormatNegotiator] = None,
+                            data: Optional[bytes] = None) -> Optional[AsyncApiResponse]:
+        if method.upper() == 'GET' and self.single_flight is not None:
+            return await self.single_flight.do_async(
+                ResponseCache.make_key(url, params),
+                lambda: self._execute_request(method, url, payload, params, formats, data)
+            )
+        return await self._execute_request(method, url, payload, params, formats, data)
+    
+    async def _execute_request(self, method: str, url: str, payload: Optional[Dict] = None,
+                               params: Optional[Dict] = None,
+                               formats: Optional[BatchFormatNegotiator] = None,
+                               data: Optional[bytes] = None) -> Optional[AsyncApiResponse]:
+        method = method.upper()
+        if method not in ('GET', 'POST', 'PUT', 'DELETE'):
+            logger.error("[API] Невідомий HTTP метод: %s", method)
+            return None
+        
+        flow = RequestFlow(self, method, url, params)
+        if flow.done:
+            return flow.result
+        
+        session = await self._get_http_session()
+        writes = method in ('POST', 'PUT')
+        while flow.next_attempt():
+            timeout = self.retry_policy.attempt_timeout(flow.started_at, self.timeout)
+            try:
+                response = await self._send_hedged(flow.endpoint, timeout, session, method, url, params,
+                                                    flow.headers, payload if writes else None, formats,
+                                                    data if writes else None)
+            except Exception as e:
+                flow.record_error(e, timeout)
+            else:
+                flow.record_response(response)
+            
+            delay = flow.retry_delay()
+            if delay is not None:
+                await asyncio.sleep(delay)
+        return flow.result
+    
+    async def _send_hedged(self, endpoint: str, timeout: float, *args) -> AsyncApiResponse:
+        delay = self._hedge_delay(endpoint)
+        if delay is None:
+            return await self._send_attempt(endpoint, timeout, *args)
+        
+        started_at = time.monotonic()
+        primary = asyncio.ensure_future(self._send_attempt(endpoint, timeout, *args))
+        attempts = {primary: HEDGE_PRIMARY}
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done or not self._start_hedge(endpoint, delay):
+                return await primary
+            
+            hedge = asyncio.ensure_future(self._send_attempt(endpoint, self._time_left(timeout, started_at), *args,
+                                                             hedge=True))
+            attempts[hedge] = HEDGE_SECONDARY
+            pending = set(attempts)
+            winner = None
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = first_answer(done)
+            
+            self.hedging.record(endpoint, attempts.get(winner), bool(pending))
+            return (winner if winner is not None else primary).result()
+        finally:
+            for task in attempts:
+                task.cancel()
+    
+    async def _send_attempt(self, endpoint: str, timeout: float, session, method: str, url: str,
+                            params: Optional[Dict], headers: Optional[Dict], payload: Optional[Dict],
+                            formats: Optional[BatchFormatNegotiator] = None,
+                            data: Optional[bytes] = None, hedge: bool = False) -> AsyncApiResponse:
+        queue_limit = self._queue_limit(method, timeout, hedge)
+        waited_from = time.monotonic()
+        wait = self.flow_control.reserve(endpoint, queue_limit)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        acquired_at = await self.flow_control.acquire_async(self._time_left(queue_limit, waited_from))
+        if queue_limit is not None:
+            timeout = self._time_left(timeout, waited_from)
+        timeout = aiohttp.ClientTimeout(total=max(0.1, timeout))
+        
+        started_at = self._begin_attempt(endpoint)
+        response = error = None
+        try:
+            response = await self._send_request(session, method, url, params, headers, payload, timeout, formats, data)
+            return response
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._end_attempt(endpoint, acquired_at, started_at, response, error)
+    
+    async def _send_request(self, session, method: str, url: str, params: Optional[Dict],
+                            headers: Optional[Dict], payload: Optional[Dict], timeout,
+                            formats: Optional[BatchFormatNegotiator] = None,
+                            data: Optional[bytes] = None) -> AsyncApiResponse:
+        body = RequestBody(url, self.compression, formats, payload=payload, data=data)
+        while True:
+            request_headers = body.encode(headers)
+            async with session.request(method, url, params=params, headers=request_headers,
+                                       data=body.wire_body, timeout=timeout) as raw_response:
+                response = AsyncApiResponse(raw_response.status, dict(raw_response.headers),
+                                            await raw_response.read())
+            
+            wire_size = len(response.content)
+            if response.headers.get('Content-Encoding'):
+                wire_size = int(response.headers.get('Content-Length') or wire_size)
+            self.compression.record_response(len(response.content), wire_size)
+            self.metrics.add_bytes(self._endpoint_key(method, url),
+                                   sent=len(body.wire_body) if body.wire_body is not None else 0, received=wire_size)
+            
+            if body.accept(response):
+                return response
+    
+    async def send_telemetry(self, telemetry_type: int, value: float,
+                             timestamp: datetime, metadata: Optional[Dict] = None) -> bool:
+        if self.telemetry_batcher is not None or self.telemetry_outbox is not None:
+            payload = self.payload_builder.build(telemetry_type, value, timestamp, metadata)
+            
+            if self.telemetry_batcher is not None and not self.telemetry_batcher.closed:
+                return await self.telemetry_batcher.add(payload)
+            
+            if self._append_to_outbox('telemetry', [payload]):
+                return True
+        
+        body = self.payload_builder.encode(telemetry_type, value, timestamp, metadata)
+        response = await self._make_request('POST', f"{self.base_url}{TELEMETRY_RECEIVE_PATH}", data=body)
+        if response is not None:
+            self._invalidate_statistics([{'timestamp': timestamp}], 'timestamp')
+        return response is not None
+    
+    async def send_telemetry_batch(self, items: List[Dict]) -> bool:
+        items = self.payload_builder.with_keys(items)
+        if self._append_to_outbox('telemetry', items):
+            return True
+        return await self._post_telemetry_batch(items)
+    
+    async def send_sleep_record(self, sleep_data: Dict) -> bool:
+        payload = build_sleep_record_payload(self.device_id, sleep_data, self.payload_builder.next_key())
+        if self._append_to_outbox('sleep', [payload]):
+            return True
+        return await self._post_sleep_record(payload)
+    
+    async def flush(self) -> bool:
+        flushed = True
+        if self.telemetry_batcher is not None:
+            flushed = await self.telemetry_batcher.flush()
+        if self.telemetry_outbox is not None:
+            self._loop = asyncio.get_running_loop()
+            flushed = await self._loop.run_in_executor(None, self.telemetry_outbox.drain) and flushed
+        return flushed
+    
+    def get_pending_telemetry_count(self) -> int:
+        pending = 0
+        if self.telemetry_batcher is not None:
+            pending += self.telemetry_batcher.pending_count()
+        if self.telemetry_outbox is not None:
+            pending += self.telemetry_outbox.pending_count()
+        return pending
+    
+    async def _post_telemetry_batch(self, items: List[Dict]) -> bool:
+        payload = build_telemetry_batch_payload(items)
+        response = await self._make_request('POST', f"{self.base_url}{TELEMETRY_BATCH_PATH}", payload=payload,
+                                            formats=self.batch_formats)
+        if response is not None:
+            self._invalidate_statistics(items, 'timestamp')
+        return response is not None
+    
+    async def _post_sleep_record(self, payload: Dict) -> bool:
+        response = await self._make_request('POST', f"{self.base_url}{SLEEP_RECORDS_PATH}", payload=payload)
+        if response is not None:
+            self._invalidate_statistics([payload], 'date', 'endTime', 'startTime')
+        return response is not None
+    
+    def _append_to_outbox(self, kind: str, payloads: List[Dict]) -> bool:
+        if self.telemetry_outbox is None:
+            return False
+        self._loop = asyncio.get_running_loop()
+        return self.telemetry_outbox.append(kind, payloads)
+    
+    def _deliver_outbox_records(self, kind: str, payloads: List[Dict]) -> bool:
+        loop = self._loop
+        if loop is None or not loop.is_running():
+            return False
+        if kind == 'telemetry':
+            delivery = self._post_telemetry_batch(payloads)
+        elif kind == 'sleep':
+            delivery = self._post_sleep_record(payloads[0])
+        else:
+            logger.error("[Outbox] Невідомий тип запису: %s", kind)
+            return False
+        return asyncio.run_coroutine_threadsafe(delivery, loop).result()
+    
+    async def get_daily_diet_plans(self, user_id: Optional[int] = None, limit: Optional[int] = None,
+                                   order_by: Optional[str] = None) -> List[Dict]:
+        if user_id is None:
+            user_id = self.user_id
+        
+        response = await self._make_request('GET', f"{self.base_url}{DAILY_DIET_PLANS_PATH}",
+                                            params=list_query_params({"userId": user_id}, limit, order_by))
+        return as_list(response.json())[:limit] if response else []
+    
+    async def get_latest_daily_diet_plan_id(self, user_id: Optional[int] = None,
+                                            date: Optional[datetime] = None) -> Optional[int]:
+        if date is not None:
+            return latest_diet_plan_id(await self.get_daily_diet_plans(user_id), date)
+        
+        if user_id is None:
+            user_id = self.user_id
+        response = await self._make_request('GET', f"{self.base_url}{DAILY_DIET_PLANS_PATH}",
+                                            params=list_query_params({"userId": user_id}, 1, LATEST_DIET_PLAN_ORDER))
+        return latest_diet_plan_id(as_list(response.json())) if response else None
+    
+    async def get_daily_diet_plan(self, plan_id: int) -> Optional[Dict]:
+        response = await self._make_request('GET', f"{self.base_url}{daily_diet_plan_meals_path(plan_id)}")
+        return response.json() if response else None
+    
+    async def generate_daily_diet_plan(self, user_id: Optional[int] = None, date: Optional[str] = None) -> Optional[Dict]:
+        if user_id is None:
+            user_id = self.user_id
+        
+        payload = build_generate_diet_plan_payload(user_id, date)
+        response = await self._make_request('POST', f"{self.base_url}{GENERATE_DIET_PLAN_PATH}", payload=payload)
+        if response is None:
+            return None
+        self.invalidate_cache(DAILY_DIET_PLANS_PATH)
+        return response.json()
+    
+    async def get_recipe(self, recipe_id: int) -> Optional[Dict]:
+        response = await self._make_request('GET', f"{self.base_url}{recipe_path(recipe_id)}")
+        return response.json() if response else None
+    
+    async def get_recipes(self, recipe_ids: Iterable[int]) -> Dict[int, Dict]:
+        unique_ids = list(dict.fromkeys(recipe_id for recipe_id in recipe_ids if recipe_id))
+        semaphore = asyncio.Semaphore(self.max_workers)
+        
+        async def fetch(recipe_id: int) -> Optional[Dict]:
+            async with semaphore:
+                return await self._fetch_recipe(recipe_id)
+        
+        results = await asyncio.gather(*(fetch(recipe_id) for recipe_id in unique_ids))
+        return {recipe_id: recipe for recipe_id, recipe in zip(unique_ids, results) if recipe is not None}
+    
+    async def _fetch_recipe(self, recipe_id: int) -> Optional[Dict]:
+        try:
+            return await self.get_recipe(recipe_id)
+        except ValueError as e:
+            logger.warning("[API] Помилка парсингу рецепта %s: %s", recipe_id, e)
+            return None
+    
+    async def get_daily_statistics(self, date: datetime, user_id: Optional[int] = None) -> Optional[Dict]:
+        if user_id is None:
+            user_id = self.user_id
+        
+        if user_id is None:
+            logger.error("[API] Помилка: user_id не визначено!")
+            return None
+        
+        response = await self._make_request('GET', f"{self.base_url}{daily_statistics_path(date)}",
+                                            params={"userId": user_id})
+        if response:
+            try:
+                return response.json()
+            except ValueError as e:
+                logger.error("[API] Помилка парсингу JSON: %s", e)
+        return None
+    
+    async def get_weekly_statistics(self, start_date: datetime, user_id: Optional[int] = None) -> Optional[Dict]:
+        if user_id is None:
+            user_id = self.user_id
+        
+        response = await self._make_request('GET', f"{self.base_url}{weekly_statistics_path(start_date)}",
+                                            params={"userId": user_id})
+        return response.json() if response else None
+    
+    async def get_user_profile(self, user_id: Optional[int] = None) -> Optional[Dict]:
+        if user_id is None:
+            user_id = self.user_id
+        
+        if user_id is None:
+            logger.error("[API] Помилка: user_id не визначено для завантаження профілю")
+            return None
+        
+        try:
+            return await self._find_user_profile(user_id)
+        except ValueError as e:
+            logger.error("[API] Помилка парсингу профілів: %s", e)
+        return None
+    
+    async def _find_user_profile(self, user_id: int) -> Optional[Dict]:
+        directory = self.profile_directory
+        url = f"{self.base_url}{USER_PROFILES_PATH}"
+        
+        if directory.supports_query():
+            response = await self._make_request('GET', url, params={"userId": user_id})
+            return directory.resolve_query(user_id, response.json()) if response else None
+        
+        profile = directory.lookup(user_id)
+        if profile is not None and directory.is_stale(user_id) and profile.get('profileId') is not None:
+            response = await self._make_request('GET', f"{self.base_url}{user_profile_path(profile['profileId'])}")
+            if response:
+                profile = directory.update(user_id, response.json())
+        
+        if profile is None and directory.needs_reload():
+            response = await self._make_request('GET', url)
+            if response:
+                directory.load(response.json())
+                profile = directory.lookup(user_id)
+        return profile
+    
+    async def get_user_profile_details(self, profile_id: int) -> Optional[Dict]:
+        response = await self._make_request('GET', f"{self.base_url}{user_profile_details_path(profile_id)}")
+        return response.json() if response else None
+    
+    async def get_recommendations(self, user_id: Optional[int] = None, limit: Optional[int] = None) -> List[Dict]:
+        if user_id is None:
+            user_id = self.user_id
+        
+        response = await self._make_request('GET', f"{self.base_url}{RECOMMENDATIONS_PATH}",
+                                            params=list_query_params({"userId": user_id}, limit))
+        return as_list(response.json())[:limit] if response else []
+    
+    async def get_dashboard_snapshot(self, user_id: Optional[int] = None, date: Optional[datetime] = None) -> Dict:
+        if user_id is None:
+            user_id = self.user_id
+        if date is None:
+            date = datetime.now()
+        
+        snapshot = DashboardSnapshot(user_id, date, self.dashboard_deadlines)
+        pending: Dict[asyncio.Future, Tuple[str, Optional[int]]] = {
+            asyncio.ensure_future(fetch()): (part, None)
+            for part, fetch in self._dashboard_fetchers(user_id, date).items()
+        }
+        
+        while pending:
+            done, _ = await asyncio.wait(pending, timeout=snapshot.time_left(part for part, _ in pending.values()),
+                                         return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                part, key = pending.pop(task)
+                for recipe_id in snapshot.resolve(part, key, task):
+                    pending[asyncio.ensure_future(self._fetch_recipe(recipe_id))] = ('recipes', recipe_id)
+            
+            for task, (part, _) in list(pending.items()):
+                if snapshot.is_expired(part):
+                    task.cancel()
+                    del pending[task]
+                    snapshot.expire(part)
+        
+        return snapshot.to_dict()
+    
+    def _dashboard_fetchers(self, user_id: int, date: datetime) -> Dict[str, Callable[[], Awaitable]]:
+        return {
+            'daily': lambda: self.get_daily_statistics(date, user_id),
+            'weekly': lambda: self.get_weekly_statistics(week_start(date), user_id),
+            'recommendations': lambda: self.get_recommendations(user_id),
+            'profile': lambda: self.get_user_profile(user_id),
+            'dietPlan': lambda: self._get_latest_diet_plan(user_id, date)
+        }
+    
+    async def _get_latest_diet_plan(self, user_id: int, date: datetime) -> Optional[Dict]:
+        plan_id = await self.get_latest_daily_diet_plan_id(user_id, date)
+        if plan_id is None:
+            return None
+        return await self.get_daily_diet_plan(plan_id)
+    
+    async def close(self):
+        if self.telemetry_batcher is not None:
+            await self.telemetry_batcher.close()
+        if self.telemetry_outbox is not None:
+            self._loop = asyncio.get_running_loop()
+            await self._loop.run_in_executor(None, self.telemetry_outbox.close)
+        self._closing.set()
+        self.flow_control.close()
+        if self._http_session is not None and not self._http_session.closed:
+            await self._http_session.close()
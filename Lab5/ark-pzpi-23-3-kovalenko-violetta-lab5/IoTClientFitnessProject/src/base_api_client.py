@@ -1,14 +1,50 @@
+import logging
+import os
+import re
 import requests
+import threading
 import time
-from typing import Dict, Optional
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
 from config_manager import ConfigManager
+from circuit_breaker import CircuitBreaker
+from retry_policy import RetryPolicy
+from http_transport import HttpTransport
+from compression import CompressionNegotiator
+from telemetry_codec import BatchFormatNegotiator
+from response_cache import CacheEntry, ResponseCache
+from single_flight import SingleFlight
+from user_profile_directory import UserProfileDirectory
+from dashboard_snapshot import dashboard_deadlines
+from json_stream import JsonArrayReader
+from request_metrics import MetricsSink, create_metrics_sink
+from request_flow import RequestFlow
+from flow_control import FlowControl, FlowControlTimeout
+from hedging import HEDGE_PRIMARY, HEDGE_SECONDARY, create_hedge_policy, discard_response, first_answer
+from sequence_journal import SequenceJournal
+from api_payloads import RECOMMENDATIONS_PATH, WEEKLY_STATISTICS_PATH, daily_statistics_path, payload_date
+from logging_setup import configure_logging
+
+
+logger = logging.getLogger(__name__)
+
+STREAM_CHUNK_SIZE = 64 * 1024
 
 
 class BaseApiClient:
     
-    def __init__(self, config_manager: ConfigManager):
+    timeout_errors: Tuple[type, ...] = (requests.exceptions.Timeout,)
+    connection_errors: Tuple[type, ...] = (requests.exceptions.ConnectionError,)
+    
+    def __init__(self, config_manager: ConfigManager, metrics: Optional[MetricsSink] = None):
         self.config_manager = config_manager
         config = config_manager.load_config()
+        self.config = config
+        configure_logging(config)
+        self.metrics = metrics if metrics is not None else create_metrics_sink(config)
         
         self.base_url = config['server']['base_url'].rstrip('/')
         self.timeout = config['server']['timeout']
@@ -18,56 +54,361 @@ class BaseApiClient:
         self.device_id = config['device']['device_id']
         self.user_id = config['device']['user_id']
         
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.retry_policy = RetryPolicy(
+            max_attempts=self.retry_attempts,
+            base_delay=self.retry_delay,
+            max_delay=config['server'].get('retry_max_delay', 30),
+            deadline=config['server'].get('retry_deadline', 15)
+        )
+        self.circuit_failure_threshold = config['server'].get('circuit_failure_threshold', 5)
+        self.circuit_recovery_timeout = config['server'].get('circuit_recovery_timeout', 30)
+        self._circuit_breakers: Dict[str, CircuitBreaker] = {}
+        self._request_stats: Dict[str, Dict[str, int]] = {}
+        self._stats_lock = threading.Lock()
+        self._closing = threading.Event()
+        self.max_workers = max(1, int(config['server'].get('max_workers', 8)))
+        self._worker_pool: Optional[ThreadPoolExecutor] = None
+        self._hedge_pool: Optional[ThreadPoolExecutor] = None
+        
+        self.compression = CompressionNegotiator(config['server'])
+        self.batch_formats = BatchFormatNegotiator(config['server'])
+        self.transport = self._create_transport()
+        self.response_cache = self._create_response_cache()
+        self.single_flight = SingleFlight() if config['server'].get('single_flight', True) else None
+        
+        profiles_config = config.get('profiles', {})
+        self.profile_directory = UserProfileDirectory(
+            entry_ttl=profiles_config.get('entry_ttl', 300),
+            reload_interval=profiles_config.get('reload_interval', 600)
+        )
+        self.dashboard_deadlines = dashboard_deadlines(config)
+        self.flow_control = FlowControl(config.get('rate_limit'), config.get('concurrency'))
+        self.hedging = create_hedge_policy(config)
+        self.sequence_journal = self._create_sequence_journal()
+    
+    def _create_transport(self) -> Optional[HttpTransport]:
+        return HttpTransport(self.config['server'], headers={
             'Content-Type': 'application/json',
             'Accept': 'application/json'
-        })
+        }, compression=self.compression)
+    
+    def _create_response_cache(self) -> Optional[ResponseCache]:
+        cache_config = self.config.get('cache', {})
+        if not cache_config.get('enabled', False):
+            return None
+        return ResponseCache(
+            max_entries=cache_config.get('max_entries', 256),
+            ttls=cache_config.get('ttl', {}),
+            default_ttl=cache_config.get('default_ttl', 0)
+        )
+    
+    def _create_sequence_journal(self) -> Optional[SequenceJournal]:
+        idempotency_config = self.config.get('idempotency', {})
+        if not idempotency_config.get('enabled', True):
+            return None
+        journal_path = idempotency_config.get('journal_path', 'data/sequence_journal.json')
+        if not os.path.isabs(journal_path):
+            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            journal_path = os.path.join(base_dir, journal_path)
+        return SequenceJournal.open(journal_path, idempotency_config.get('reserve_block', 1000))
     
-    def _make_request(self, method: str, url: str, payload: Optional[Dict] = None, 
-                     params: Optional[Dict] = None) -> Optional[requests.Response]:
-        last_error = None
+    @property
+    def session(self) -> requests.Session:
+        return self.transport.session
+    
+    def _make_request(self, method: str, url: str, payload: Optional[Dict] = None,
+                     params: Optional[Dict] = None,
+                     formats: Optional[BatchFormatNegotiator] = None,
+                     data: Optional[bytes] = None) -> Optional[requests.Response]:
+        if method.upper() == 'GET' and self.single_flight is not None:
+            return self.single_flight.do(ResponseCache.make_key(url, params),
+                                         lambda: self._execute_request(method, url, payload, params, formats, data))
+        return self._execute_request(method, url, payload, params, formats, data)
+    
+    def _execute_request(self, method: str, url: str, payload: Optional[Dict] = None,
+                         params: Optional[Dict] = None,
+                         formats: Optional[BatchFormatNegotiator] = None,
+                         data: Optional[bytes] = None,
+                         stream: bool = False) -> Optional[requests.Response]:
+        method = method.upper()
+        if method not in ('GET', 'POST', 'PUT', 'DELETE'):
+            logger.error("[API] Невідомий HTTP метод: %s", method)
+            return None
         
-        for attempt in range(1, self.retry_attempts + 1):
+        flow = RequestFlow(self, method, url, params, cacheable=not stream)
+        while flow.next_attempt():
+            limit = self.retry_policy.remaining(flow.started_at)
             try:
-                if method.upper() == 'GET':
-                    response = self.session.get(url, params=params, timeout=self.timeout)
-                elif method.upper() == 'POST':
-                    response = self.session.post(url, json=payload, timeout=self.timeout)
-                elif method.upper() == 'PUT':
-                    response = self.session.put(url, json=payload, timeout=self.timeout)
-                elif method.upper() == 'DELETE':
-                    response = self.session.delete(url, timeout=self.timeout)
+                if method in ('POST', 'PUT'):
+                    response = self._send_attempt(flow.endpoint, method, url, limit=limit, params=params,
+                                                  json=payload, data=data, formats=formats)
                 else:
-                    print(f"[API] Невідомий HTTP метод: {method}")
-                    return None
-                
-                response.raise_for_status()
-                return response
-                
-            except requests.exceptions.Timeout:
-                last_error = f"Таймаут запиту (більше {self.timeout} секунд)"
-                if attempt < self.retry_attempts:
-                    print(f"[API] Спроба {attempt}/{self.retry_attempts}: {last_error}. Повтор через {self.retry_delay} сек...")
-                    time.sleep(self.retry_delay)
-                    
-            except requests.exceptions.ConnectionError:
-                last_error = "Помилка підключення до сервера"
-                if attempt < self.retry_attempts:
-                    print(f"[API] Спроба {attempt}/{self.retry_attempts}: {last_error}. Повтор через {self.retry_delay} сек...")
-                    time.sleep(self.retry_delay)
-                    
-            except requests.exceptions.HTTPError as e:
-                last_error = f"HTTP помилка {e.response.status_code}: {e.response.text}"
-                print(f"[API] {last_error}")
-                return None
-                
+                    response = self._send_hedged(flow.endpoint, method, url, limit=limit, params=params,
+                                                 headers=flow.headers, stream=stream)
             except Exception as e:
-                last_error = f"Невідома помилка: {str(e)}"
-                if attempt < self.retry_attempts:
-                    print(f"[API] Спроба {attempt}/{self.retry_attempts}: {last_error}. Повтор через {self.retry_delay} сек...")
-                    time.sleep(self.retry_delay)
+                flow.record_error(e, limit)
+            else:
+                flow.record_response(response)
+            
+            delay = flow.retry_delay()
+            if delay is not None:
+                self._closing.wait(delay)
+        return flow.result
+    
+    def _send_hedged(self, endpoint: str, method: str, url: str, **kwargs) -> requests.Response:
+        delay = self._hedge_delay(endpoint)
+        if delay is None:
+            return self._send_attempt(endpoint, method, url, **kwargs)
+        
+        pool = self._get_hedge_pool()
+        started_at = time.monotonic()
+        primary = pool.submit(self._send_attempt, endpoint, method, url, **kwargs)
+        if wait([primary], timeout=delay).done or not self._start_hedge(endpoint, delay):
+            return primary.result()
+        
+        kwargs['limit'] = self._time_left(kwargs.get('limit'), started_at)
+        hedge = pool.submit(self._send_attempt, endpoint, method, url, hedge=True, **kwargs)
+        attempts = {primary: HEDGE_PRIMARY, hedge: HEDGE_SECONDARY}
+        pending = set(attempts)
+        winner = None
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = first_answer(done)
+        
+        chosen = winner if winner is not None else primary
+        cancelled = False
+        for future in attempts:
+            if future is chosen:
+                continue
+            if not future.cancel():
+                cancelled = cancelled or not future.done()
+                future.add_done_callback(discard_response)
+            else:
+                cancelled = True
+        self.hedging.record(endpoint, attempts.get(winner), cancelled)
+        return chosen.result()
+    
+    def _send_attempt(self, endpoint: str, method: str, url: str, hedge: bool = False,
+                      **kwargs) -> requests.Response:
+        limit = kwargs.get('limit')
+        queue_limit = self._queue_limit(method, limit, hedge)
+        waited_from = time.monotonic()
+        wait = self.flow_control.reserve(endpoint, queue_limit)
+        if wait > 0 and self._closing.wait(wait):
+            raise FlowControlTimeout("Клієнт закривається, запит скасовано")
+        acquired_at = self.flow_control.acquire(self._time_left(queue_limit, waited_from))
+        if limit is not None and queue_limit is not None:
+            kwargs['limit'] = self._time_left(limit, waited_from)
+        
+        started_at = self._begin_attempt(endpoint)
+        response = error = None
+        try:
+            response = self.transport.request(method, url, **kwargs)
+            self._record_transfer(endpoint, response, kwargs.get('stream', False))
+            return response
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._end_attempt(endpoint, acquired_at, started_at, response, error)
+    
+    def _timeout_message(self, limit: Optional[float]) -> str:
+        return (f"Таймаут запиту (з'єднання {self.transport.connect_timeout} сек, "
+                f"читання {self.transport.read_timeout} сек)")
+    
+    def _queue_limit(self, method: str, limit: Optional[float], hedge: bool) -> Optional[float]:
+        if hedge:
+            return 0.0
+        return None if method in ('POST', 'PUT') else limit
+    
+    def _hedge_delay(self, endpoint: str) -> Optional[float]:
+        return self.hedging.delay_for(endpoint, self.metrics) if self.hedging is not None else None
+    
+    def _start_hedge(self, endpoint: str, delay: float) -> bool:
+        if not self.hedging.start(endpoint, self.flow_control.has_capacity(endpoint)):
+            return False
+        logger.debug("[API] Немає відповіді від %s за %.3f сек, надсилаємо дублікат запиту", endpoint, delay)
+        return True
+    
+    def _begin_attempt(self, endpoint: str) -> float:
+        self.metrics.track_in_flight(endpoint, 1)
+        return time.perf_counter()
+    
+    def _end_attempt(self, endpoint: str, acquired_at: Optional[float], started_at: float,
+                     response=None, error: Optional[BaseException] = None):
+        if response is not None:
+            outcome = str(response.status_code)
+        elif isinstance(error, self.timeout_errors):
+            outcome = 'timeout'
+        elif isinstance(error, self.connection_errors):
+            outcome = 'connection_error'
+        else:
+            outcome = 'error'
         
-        print(f"[API] Не вдалося виконати запит після {self.retry_attempts} спроб. Остання помилка: {last_error}")
-        return None
+        latency = time.perf_counter() - started_at
+        self.flow_control.release(acquired_at, latency, outcome)
+        self.metrics.track_in_flight(endpoint, -1)
+        self.metrics.observe_latency(endpoint, latency, outcome)
+    
+    def _time_left(self, limit: Optional[float], since: float) -> Optional[float]:
+        if limit is None:
+            return None
+        return limit - (time.monotonic() - since)
+    
+    def _record_transfer(self, endpoint: str, response: requests.Response, stream: bool):
+        body = response.request.body if response.request is not None else None
+        sent = len(body) if isinstance(body, (bytes, str)) else 0
+        received = 0 if stream else int(response.headers.get('Content-Length') or len(response.content))
+        self.metrics.add_bytes(endpoint, sent=sent, received=received)
+    
+    def _open_json_stream(self, url: str, params: Optional[Dict] = None,
+                          limit: Optional[int] = None) -> Optional[Iterator[Any]]:
+        response = self._execute_request('GET', url, params=params, stream=True)
+        if response is None:
+            return None
+        return self._iter_json_response(response, limit)
+    
+    def _iter_json_response(self, response: requests.Response, limit: Optional[int]) -> Iterator[Any]:
+        reader = JsonArrayReader(response.iter_content(STREAM_CHUNK_SIZE))
+        try:
+            yield from islice(reader, limit)
+        finally:
+            wire_size = reader.bytes_read
+            if response.headers.get('Content-Encoding'):
+                try:
+                    wire_size = response.raw.tell()
+                except (AttributeError, ValueError):
+                    pass
+            response.close()
+            self.compression.record_response(reader.bytes_read, wire_size)
+            self.metrics.add_bytes(self._endpoint_key('GET', response.url), received=wire_size)
+            logger.debug("[API] Потік %s: прочитано елементів %d, %d байт", response.url, reader.items,
+                         reader.bytes_read)
+    
+    def is_server_available(self) -> bool:
+        with self._stats_lock:
+            breakers = list(self._circuit_breakers.values())
+        return all(breaker.state != CircuitBreaker.OPEN for breaker in breakers)
+    
+    def get_connection_status(self) -> Dict:
+        with self._stats_lock:
+            breakers = dict(self._circuit_breakers)
+            stats = {endpoint: dict(counters) for endpoint, counters in self._request_stats.items()}
+        
+        metrics = self.metrics.snapshot() or {}
+        endpoints = {}
+        for endpoint, breaker in breakers.items():
+            endpoints[endpoint] = {
+                **breaker.snapshot(),
+                **stats.get(endpoint, {})
+            }
+            if endpoint in metrics:
+                endpoints[endpoint]["latency"] = metrics[endpoint]["latency"]
+        
+        return {
+            "serverAvailable": all(item["state"] != CircuitBreaker.OPEN for item in endpoints.values()),
+            "baseUrl": self.base_url,
+            "pool": self.transport.get_pool_stats() if self.transport is not None else None,
+            "cache": self.get_cache_stats(),
+            "coalescing": self.single_flight.get_stats() if self.single_flight is not None else None,
+            "profiles": self.profile_directory.get_stats(),
+            "transfer": self.compression.get_stats(),
+            "batchFormats": self.batch_formats.get_stats(),
+            "flowControl": self.flow_control.get_stats(),
+            "hedging": self.hedging.get_stats() if self.hedging is not None else None,
+            "idempotency": self.sequence_journal.get_stats() if self.sequence_journal is not None else None,
+            "endpoints": endpoints
+        }
+    
+    def get_metrics(self) -> Optional[Dict]:
+        return self.metrics.snapshot()
+    
+    def export_metrics(self) -> str:
+        return self.metrics.export_prometheus()
+    
+    def invalidate_cache(self, *paths: str) -> int:
+        if self.response_cache is None:
+            return 0
+        return sum(self.response_cache.invalidate(f"{self.base_url}{path}") for path in paths)
+    
+    def _invalidate_statistics(self, payloads: List[Dict], *date_fields: str):
+        if self.response_cache is None:
+            return
+        
+        dates = {payload_date(payload, *date_fields) for payload in payloads}
+        dates.discard(None)
+        if not dates:
+            dates = {datetime.now()}
+        
+        paths = [daily_statistics_path(date) for date in dates]
+        self.invalidate_cache(WEEKLY_STATISTICS_PATH, RECOMMENDATIONS_PATH, *paths)
+    
+    def get_cache_stats(self) -> Optional[Dict]:
+        if self.response_cache is None:
+            return None
+        return self.response_cache.get_stats()
+    
+    def close(self):
+        self._closing.set()
+        self.flow_control.close()
+        with self._stats_lock:
+            worker_pool, self._worker_pool = self._worker_pool, None
+            hedge_pool, self._hedge_pool = self._hedge_pool, None
+        if worker_pool is not None:
+            worker_pool.shutdown(wait=True, cancel_futures=True)
+        if hedge_pool is not None:
+            hedge_pool.shutdown(wait=True, cancel_futures=True)
+        if self.transport is not None:
+            self.transport.close()
+    
+    def _get_worker_pool(self) -> ThreadPoolExecutor:
+        with self._stats_lock:
+            if self._worker_pool is None:
+                self._worker_pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                       thread_name_prefix='api-worker')
+            return self._worker_pool
+    
+    def _get_hedge_pool(self) -> ThreadPoolExecutor:
+        with self._stats_lock:
+            if self._hedge_pool is None:
+                self._hedge_pool = ThreadPoolExecutor(max_workers=self.hedging.max_workers,
+                                                      thread_name_prefix='api-hedge')
+            return self._hedge_pool
+    
+    def _endpoint_key(self, method: str, url: str) -> str:
+        path = urlsplit(url).path
+        path = re.sub(r'/\d{4}-\d{2}-\d{2}(?=/|$)', '/{date}', path)
+        path = re.sub(r'/\d+(?=/|$)', '/{id}', path)
+        return f"{method} {path.lower()}"
+    
+    def _lookup_cached_response(self, method: str, endpoint: str, url: str,
+                                params: Optional[Dict]) -> Tuple[Optional[str], Optional[CacheEntry]]:
+        if method != 'GET' or self.response_cache is None or not self.response_cache.is_cacheable(endpoint):
+            return None, None
+        cache_key = self.response_cache.make_key(url, params)
+        return cache_key, self.response_cache.lookup(endpoint, cache_key)
+    
+    def _store_cached_response(self, endpoint: str, cache_key: Optional[str],
+                               cached: Optional[CacheEntry], response):
+        if cache_key is None:
+            return response
+        if response.status_code == 304 and cached is not None:
+            self.response_cache.revalidate(endpoint, cache_key)
+            return cached.response
+        self.response_cache.store(endpoint, cache_key, response)
+        return response
+    
+    def _get_circuit_breaker(self, endpoint: str) -> CircuitBreaker:
+        with self._stats_lock:
+            breaker = self._circuit_breakers.get(endpoint)
+            if breaker is None:
+                breaker = CircuitBreaker(self.circuit_failure_threshold, self.circuit_recovery_timeout)
+                self._circuit_breakers[endpoint] = breaker
+            return breaker
+    
+    def _count_request_stat(self, endpoint: str, name: str):
+        with self._stats_lock:
+            counters = self._request_stats.setdefault(endpoint, {})
+            counters[name] = counters.get(name, 0) + 1
+        self.metrics.increment(endpoint, name)
 
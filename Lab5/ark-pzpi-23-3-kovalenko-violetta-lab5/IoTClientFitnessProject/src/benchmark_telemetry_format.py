@@ -0,0 +1,68 @@
+import argparse
+import gzip
+import time
+from typing import Callable, Dict, List
+
+from sensor_simulator import SensorSimulator
+from telemetry_codec import (COLUMNAR_CONTENT_TYPE, JSON_CONTENT_TYPE, MSGPACK_CONTENT_TYPE,
+                             available_content_types, decode_batch, encode_batch)
+
+
+FORMAT_NAMES = {
+    JSON_CONTENT_TYPE: 'json',
+    COLUMNAR_CONTENT_TYPE: 'columnar',
+    MSGPACK_CONTENT_TYPE: 'msgpack'
+}
+
+
+def best_time(func: Callable, repeats: int) -> float:
+    best = None
+    for _ in range(repeats):
+        started_at = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started_at
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def benchmark(items: List[Dict], content_type: str, repeats: int) -> Dict:
+    body = encode_batch(items, content_type)
+    if decode_batch(body, content_type) != items:
+        raise AssertionError(f"Декодований батч {content_type} не збігається з вихідним")
+    
+    return {
+        "encode": best_time(lambda: encode_batch(items, content_type), repeats),
+        "decode": best_time(lambda: decode_batch(body, content_type), repeats),
+        "size": len(body),
+        "gzip": len(gzip.compress(body, compresslevel=6))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Порівняння форматів батчів телеметрії")
+    parser.add_argument('--sizes', default='10,1000,100000')
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+    
+    simulator = SensorSimulator()
+    content_types = available_content_types()
+    print(f"{'записів':>8} {'формат':>9} {'кодування, мс':>14} {'декодування, мс':>16} "
+          f"{'байт':>10} {'gzip, байт':>11} {'байт/запис':>11}")
+    
+    for size in [int(item) for item in args.sizes.split(',')]:
+        items = simulator.generate_telemetry_batch(size)
+        repeats = max(1, args.repeats if size < 100000 else args.repeats // 2)
+        baseline = None
+        for content_type in [JSON_CONTENT_TYPE] + [item for item in content_types if item != JSON_CONTENT_TYPE]:
+            result = benchmark(items, content_type, repeats)
+            baseline = baseline or result
+            print(f"{size:>8} {FORMAT_NAMES[content_type]:>9} {result['encode'] * 1000:>14.3f} "
+                  f"{result['decode'] * 1000:>16.3f} {result['size']:>10} {result['gzip']:>11} "
+                  f"{result['size'] / size:>11.1f}"
+                  + ("" if result is baseline else
+                     f"   (x{baseline['encode'] / result['encode']:.1f} швидше, "
+                     f"{result['size'] / baseline['size'] * 100:.0f}% розміру JSON)"))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+import threading
+import time
+from typing import Dict
+
+
+class CircuitBreaker:
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0,
+                 half_open_max_calls: int = 1):
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.recovery_timeout = max(0.0, float(recovery_timeout))
+        self.half_open_max_calls = max(1, int(half_open_max_calls))
+        
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._lock = threading.Lock()
+        
+        self.total_failures = 0
+        self.total_successes = 0
+        self.rejected_count = 0
+        self.opened_count = 0
+    
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+    
+    def allow_request(self) -> bool:
+        with self._lock:
+            state = self._current_state()
+            
+            if state == self.CLOSED:
+                return True
+            
+            if state == self.HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                return True
+            
+            self.rejected_count += 1
+            return False
+    
+    def record_success(self):
+        with self._lock:
+            self.total_successes += 1
+            self._consecutive_failures = 0
+            self._half_open_calls = 0
+            self._state = self.CLOSED
+    
+    def record_failure(self):
+        with self._lock:
+            self.total_failures += 1
+            self._consecutive_failures += 1
+            state = self._current_state()
+            
+            if state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if state != self.OPEN:
+                    self.opened_count += 1
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._half_open_calls = 0
+    
+    def retry_after(self) -> float:
+        with self._lock:
+            if self._current_state() != self.OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.recovery_timeout - time.monotonic())
+    
+    def snapshot(self) -> Dict:
+        with self._lock:
+            state = self._current_state()
+            return {
+                "state": state,
+                "consecutiveFailures": self._consecutive_failures,
+                "totalFailures": self.total_failures,
+                "totalSuccesses": self.total_successes,
+                "rejected": self.rejected_count,
+                "opened": self.opened_count,
+                "retryAfter": round(max(0.0, self._opened_at + self.recovery_timeout - time.monotonic()), 1)
+                if state == self.OPEN else 0.0
+            }
+    
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._half_open_calls = 0
+        return self._state
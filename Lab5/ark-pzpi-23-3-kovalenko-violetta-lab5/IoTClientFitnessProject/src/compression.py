@@ -0,0 +1,126 @@
+import gzip
+import logging
+import threading
+import zlib
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_ENCODINGS = ('gzip', 'deflate')
+
+
+def compress_body(body: bytes, encoding: str, level: int = 6) -> bytes:
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=level)
+    if encoding == 'deflate':
+        return zlib.compress(body, level)
+    raise ValueError(f"Непідтримуване кодування: {encoding}")
+
+
+def parse_accept_encoding(header: Optional[str], exclude: Iterable[str] = ()) -> Optional[str]:
+    if not header:
+        return None
+    
+    for item in header.split(','):
+        parts = [part.strip() for part in item.split(';')]
+        encoding = parts[0].lower()
+        if encoding in exclude or encoding not in SUPPORTED_ENCODINGS:
+            continue
+        
+        quality = 1.0
+        for part in parts[1:]:
+            if part.startswith('q='):
+                try:
+                    quality = float(part[2:])
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            return encoding
+    return None
+
+
+class CompressionNegotiator:
+    
+    def __init__(self, server_config: Dict):
+        mode = str(server_config.get('request_compression', 'off')).lower()
+        self.mode = mode if mode in ('off', 'auto') + SUPPORTED_ENCODINGS else 'off'
+        self.min_bytes = int(server_config.get('request_compression_min_bytes', 1024))
+        self.level = int(server_config.get('request_compression_level', 6))
+        self.accept_compressed = server_config.get('accept_compressed_responses', True)
+        
+        self._host_encodings: Dict[str, Optional[str]] = {}
+        self._rejected: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.request_bytes = 0
+        self.request_wire_bytes = 0
+        self.compressed_requests = 0
+        self.fallbacks = 0
+        self.response_bytes = 0
+        self.response_wire_bytes = 0
+    
+    @property
+    def accept_encoding(self) -> str:
+        return ', '.join(SUPPORTED_ENCODINGS) if self.accept_compressed else 'identity'
+    
+    def encoding_for(self, host: str) -> Optional[str]:
+        if self.mode == 'off':
+            return None
+        with self._lock:
+            if host in self._host_encodings:
+                return self._host_encodings[host]
+        return 'gzip' if self.mode == 'auto' else self.mode
+    
+    def encode(self, host: str, body: bytes) -> Tuple[bytes, Optional[str]]:
+        encoding = self.encoding_for(host)
+        if encoding is None or len(body) < self.min_bytes:
+            return body, None
+        
+        compressed = compress_body(body, encoding, self.level)
+        if len(compressed) >= len(body):
+            return body, None
+        return compressed, encoding
+    
+    def is_rejected(self, response_headers, status_code: int, encoding: str, message: str = '') -> bool:
+        if status_code == 415:
+            return True
+        if status_code != 400:
+            return False
+        message = message.lower()
+        return 'Accept-Encoding' in response_headers or 'content-encoding' in message or encoding in message
+    
+    def reject(self, host: str, encoding: str, accept_encoding: Optional[str] = None) -> Optional[str]:
+        with self._lock:
+            rejected = self._rejected.setdefault(host, set())
+            rejected.add(encoding)
+            alternative = parse_accept_encoding(accept_encoding, exclude=rejected)
+            self._host_encodings[host] = alternative
+            self.fallbacks += 1
+        logger.warning("[API] Сервер %s не приймає стиснення %s, далі використовується %s",
+                       host, encoding, alternative or 'передача без стиснення')
+        return alternative
+    
+    def record_request(self, raw_size: int, wire_size: int, encoding: Optional[str]):
+        with self._lock:
+            self.request_bytes += raw_size
+            self.request_wire_bytes += wire_size
+            if encoding is not None:
+                self.compressed_requests += 1
+    
+    def record_response(self, decoded_size: int, wire_size: int):
+        with self._lock:
+            self.response_bytes += decoded_size
+            self.response_wire_bytes += wire_size
+    
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "hostEncodings": dict(self._host_encodings),
+                "compressedRequests": self.compressed_requests,
+                "fallbacks": self.fallbacks,
+                "requestBytes": self.request_bytes,
+                "requestWireBytes": self.request_wire_bytes,
+                "responseBytes": self.response_bytes,
+                "responseWireBytes": self.response_wire_bytes
+            }
@@ -1,8 +1,12 @@
 import json
+import logging
 import os
 from typing import Dict, Optional
 
 
+logger = logging.getLogger(__name__)
+
+
 class ConfigManager: 
     
     def __init__(self, config_path: str = None):
@@ -15,7 +19,7 @@ class ConfigManager:
             
             if os.getenv('DOCKER_ENV') == 'true' and os.path.exists(docker_config_path):
                 config_path = docker_config_path
-                print(f"Використовується Docker конфігурація: {config_path}")
+                logger.info("Використовується Docker конфігурація: %s", config_path)
         else:
             default_config_path = "config/config.default.json"
         
@@ -27,7 +31,27 @@ class ConfigManager:
                 "base_url": "http://localhost:5006",  
                 "timeout": 10,                        
                 "retry_attempts": 3,                  
-                "retry_delay": 5                      
+                "retry_delay": 5,
+                "retry_max_delay": 30,
+                "retry_deadline": 15,
+                "circuit_failure_threshold": 5,
+                "circuit_recovery_timeout": 30,
+                "async_max_connections": 100,
+                "async_max_connections_per_host": 0,
+                "connect_timeout": 3,
+                "read_timeout": 10,
+                "keep_alive": True,
+                "pool_connections": 4,
+                "pool_maxsize": 16,
+                "pool_block": True,
+                "pool_timeout": 5,
+                "request_compression": "auto",
+                "request_compression_min_bytes": 1024,
+                "request_compression_level": 6,
+                "accept_compressed_responses": True,
+                "telemetry_batch_format": "auto",
+                "single_flight": True,
+                "max_workers": 8
             },
             "device": {
                 "device_id": 1,                       
@@ -41,12 +65,86 @@ class ConfigManager:
                 "blood_pressure_interval": 600        
             },
             "data": {
+                "batching_enabled": False,
                 "batch_size": 5,                      
-                "send_interval": 15                   
+                "send_interval": 15,                  
+                "max_pending": 1000
+            },
+            "outbox": {
+                "enabled": False,
+                "path": "data/outbox.db",
+                "max_records": 100000,
+                "max_size_mb": 50,
+                "drain_interval": 5,
+                "drain_batch_size": 500
+            },
+            "cache": {
+                "enabled": True,
+                "max_entries": 256,
+                "default_ttl": 0,
+                "ttl": {
+                    "GET /api/statistics/daily/{date}": 30,
+                    "GET /api/statistics/weekly/{date}": 300,
+                    "GET /api/recipes/{id}": 3600,
+                    "GET /api/userprofiles": 600,
+                    "GET /api/userprofiles/{id}/details": 600,
+                    "GET /api/recommendations/corrections": 60
+                }
+            },
+            "profiles": {
+                "entry_ttl": 300,
+                "reload_interval": 600
+            },
+            "dashboard": {
+                "deadline": 10,
+                "part_deadlines": {
+                    "dietPlan": 15
+                }
+            },
+            "metrics": {
+                "enabled": True
+            },
+            "rate_limit": {
+                "enabled": False,
+                "max_retry_after": 60,
+                "classes": {
+                    "*": {"rate": 50, "burst": 100},
+                    "POST /api/telemetry": {"rate": 20, "burst": 50},
+                    "GET /api/statistics": {"rate": 10, "burst": 20}
+                }
+            },
+            "concurrency": {
+                "enabled": True,
+                "initial_limit": 16,
+                "min_limit": 1,
+                "max_limit": 100,
+                "latency_target": 2.0,
+                "decrease_factor": 0.5
+            },
+            "hedging": {
+                "enabled": False,
+                "percentile": 0.95,
+                "min_delay": 0.05,
+                "max_delay": 2.0,
+                "min_samples": 20,
+                "max_ratio": 0.1,
+                "max_workers": 16,
+                "endpoints": [
+                    "GET /api/statistics/daily/{date}",
+                    "GET /api/statistics/weekly/{date}"
+                ]
+            },
+            "idempotency": {
+                "enabled": True,
+                "journal_path": "data/sequence_journal.json",
+                "reserve_block": 1000
             },
             "logging": {
                 "level": "INFO",                      
-                "file": "logs/iot_client.log"        
+                "file": "logs/iot_client.log",
+                "console": True,
+                "max_bytes": 5242880,
+                "backup_count": 3
             }
         }
     
@@ -57,24 +155,23 @@ class ConfigManager:
                     default_from_file = json.load(f)
                     self.default_config = self._merge_dicts(self.default_config, default_from_file)
             except Exception as e:
-                print(f"Помилка завантаження дефолтної конфігурації: {e}")
+                logger.error("Помилка завантаження дефолтної конфігурації: %s", e)
         
         if os.path.exists(self.config_path):
             try:
                 with open(self.config_path, 'r', encoding='utf-8') as f:
                     config = json.load(f)
                     merged_config = self._merge_dicts(self.default_config, config)
-                    print(f"Конфігурацію завантажено з {self.config_path}")
+                    logger.debug("Конфігурацію завантажено з %s", self.config_path)
                     return merged_config
             except json.JSONDecodeError as e:
-                print(f" Помилка парсингу JSON у {self.config_path}: {e}")
-                print(" Використовуються дефолтні значення")
+                logger.error("Помилка парсингу JSON у %s: %s. Використовуються дефолтні значення", self.config_path, e)
                 return self.default_config
             except Exception as e:
-                print(f" Помилка завантаження конфігурації: {e}")
+                logger.error("Помилка завантаження конфігурації: %s", e)
                 return self.default_config
         else:
-            print(f"Файл {self.config_path} не знайдено. Використовуються дефолтні значення.")
+            logger.warning("Файл %s не знайдено. Використовуються дефолтні значення.", self.config_path)
             return self.default_config.copy()
     
     def save_config(self, config: Dict):
@@ -85,15 +182,15 @@ class ConfigManager:
         try:
             with open(self.config_path, 'w', encoding='utf-8') as f:
                 json.dump(config, f, indent=2, ensure_ascii=False)
-            print(f"Конфігурацію збережено у {self.config_path}")
+            logger.info("Конфігурацію збережено у %s", self.config_path)
         except Exception as e:
-            print(f"Помилка збереження конфігурації: {e}")
+            logger.error("Помилка збереження конфігурації: %s", e)
     
     def reset_to_defaults(self):
 
         default_config = self.load_config()
         self.save_config(default_config)
-        print("Конфігурацію скинуто до дефолтних значень")
+        logger.info("Конфігурацію скинуто до дефолтних значень")
     
     def update_setting(self, section: str, key: str, value):
         config = self.load_config()
@@ -102,11 +199,11 @@ class ConfigManager:
             if key in config[section]:
                 config[section][key] = value
                 self.save_config(config)
-                print(f"Оновлено {section}.{key} = {value}")
+                logger.info("Оновлено %s.%s = %s", section, key, value)
             else:
-                print(f"Ключ '{key}' не знайдено в секції '{section}'")
+                logger.warning("Ключ '%s' не знайдено в секції '%s'", key, section)
         else:
-            print(f"Секція '{section}' не знайдена в конфігурації")
+            logger.warning("Секція '%s' не знайдена в конфігурації", section)
     
     def get_setting(self, section: str, key: str, default=None):
 
@@ -0,0 +1,62 @@
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+from diet_api_client import DietApiClient
+from statistics_api_client import StatisticsApiClient
+from user_api_client import UserApiClient
+from recommendations_api_client import RecommendationsApiClient
+from dashboard_snapshot import DashboardSnapshot
+from api_payloads import week_start
+
+
+logger = logging.getLogger(__name__)
+
+
+class DashboardApiClient(DietApiClient, StatisticsApiClient, UserApiClient, RecommendationsApiClient):
+    
+    def get_dashboard_snapshot(self, user_id: Optional[int] = None, date: Optional[datetime] = None) -> Dict:
+        if user_id is None:
+            user_id = self.user_id
+        if date is None:
+            date = datetime.now()
+        
+        snapshot = DashboardSnapshot(user_id, date, self.dashboard_deadlines)
+        pool = self._get_worker_pool()
+        pending: Dict[Future, Tuple[str, Optional[int]]] = {
+            pool.submit(fetch): (part, None) for part, fetch in self._dashboard_fetchers(user_id, date).items()
+        }
+        
+        while pending:
+            done, _ = wait(pending, timeout=snapshot.time_left(part for part, _ in pending.values()),
+                           return_when=FIRST_COMPLETED)
+            for future in done:
+                part, key = pending.pop(future)
+                for recipe_id in snapshot.resolve(part, key, future):
+                    pending[pool.submit(self._fetch_recipe, recipe_id)] = ('recipes', recipe_id)
+            
+            for future, (part, _) in list(pending.items()):
+                if snapshot.is_expired(part):
+                    future.cancel()
+                    del pending[future]
+                    snapshot.expire(part)
+        
+        result = snapshot.to_dict()
+        logger.debug("[API] Панель для користувача %s зібрано за %.3f сек, невдалі частини: %s",
+                     user_id, result['elapsed'], result['failed'])
+        return result
+    
+    def _dashboard_fetchers(self, user_id: int, date: datetime) -> Dict[str, Callable]:
+        return {
+            'daily': lambda: self.get_daily_statistics(date, user_id),
+            'weekly': lambda: self.get_weekly_statistics(week_start(date), user_id),
+            'recommendations': lambda: self.get_recommendations(user_id),
+            'profile': lambda: self.get_user_profile(user_id),
+            'dietPlan': lambda: self._get_latest_diet_plan(user_id, date)
+        }
+    
+    def _get_latest_diet_plan(self, user_id: int, date: datetime) -> Optional[Dict]:
+        plan_id = self.get_latest_daily_diet_plan_id(user_id, date)
+        if plan_id is None:
+            return None
+        return self.get_daily_diet_plan(plan_id)
@@ -0,0 +1,320 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional, Tuple
+
+
+THROTTLE_STATUSES = (429, 503)
+OVERLOAD_OUTCOMES = ('timeout', '429', '503', '504')
+DEFAULT_CLASS = '*'
+
+
+class FlowControlTimeout(Exception):
+    pass
+
+
+def parse_retry_after(value: Optional[str], max_delay: Optional[float] = None) -> Optional[float]:
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            moment = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        delay = (moment - datetime.now(timezone.utc)).total_seconds()
+    
+    delay = max(0.0, delay)
+    if max_delay is not None:
+        delay = min(delay, max_delay)
+    return delay
+
+
+class TokenBucket:
+    
+    def __init__(self, rate: float, burst: float):
+        self.rate = float(rate)
+        self.burst = max(1.0, float(burst))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.granted = 0
+        self.delayed = 0
+        self.rejected = 0
+        self.paused = 0
+        self.waited = 0.0
+    
+    def reserve(self, max_wait: Optional[float] = None) -> Optional[float]:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = max(0.0, self._updated - now) + max(0.0, 1.0 - self._tokens) / self.rate
+            if max_wait is not None and wait > max_wait:
+                self.rejected += 1
+                return None
+            
+            self._tokens -= 1.0
+            self.granted += 1
+            if wait > 0:
+                self.delayed += 1
+                self.waited += wait
+            return wait
+    
+    def available(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            return self._updated <= now and self._tokens >= 1.0
+    
+    def pause(self, seconds: float):
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._updated = max(self._updated, now + seconds)
+            self._tokens = min(self._tokens, 0.0)
+            self.paused += 1
+    
+    def snapshot(self) -> Dict:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "tokens": round(self._tokens, 2),
+                "pausedFor": round(max(0.0, self._updated - now), 1),
+                "granted": self.granted,
+                "delayed": self.delayed,
+                "rejected": self.rejected,
+                "paused": self.paused,
+                "waited": round(self.waited, 3)
+            }
+    
+    def _refill(self, now: float):
+        if now > self._updated:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+
+class AdaptiveConcurrencyLimiter:
+    
+    def __init__(self, initial_limit: float = 16, min_limit: int = 1, max_limit: int = 100,
+                 latency_target: float = 2.0, decrease_factor: float = 0.5, increase: float = 1.0):
+        self.min_limit = max(1, int(min_limit))
+        self.max_limit = max(self.min_limit, int(max_limit))
+        self.limit = min(self.max_limit, max(self.min_limit, float(initial_limit)))
+        self.latency_target = float(latency_target)
+        self.decrease_factor = min(0.95, max(0.1, float(decrease_factor)))
+        self.increase = max(0.0, float(increase))
+        
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._closed = False
+        self.increases = 0
+        self.decreases = 0
+        self.waits = 0
+        self.rejected = 0
+        self.max_in_flight = 0
+    
+    def acquire(self, timeout: Optional[float] = None) -> Optional[float]:
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._condition:
+            waited = False
+            while not self._closed and self._in_flight >= int(self.limit):
+                if not waited:
+                    self.waits += 1
+                    waited = True
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    self.rejected += 1
+                    return None
+                self._condition.wait(remaining)
+            if self._closed:
+                return None
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+            return time.monotonic()
+    
+    async def acquire_async(self, timeout: Optional[float] = None) -> Optional[float]:
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        loop = asyncio.get_running_loop()
+        waited = False
+        while True:
+            with self._condition:
+                if self._closed:
+                    return None
+                if self._in_flight < int(self.limit):
+                    self._in_flight += 1
+                    self.max_in_flight = max(self.max_in_flight, self._in_flight)
+                    return time.monotonic()
+                if not waited:
+                    self.waits += 1
+                    waited = True
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    self.rejected += 1
+                    return None
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            
+            try:
+                await asyncio.wait_for(asyncio.shield(waiter), remaining)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                with self._condition:
+                    if (loop, waiter) in self._async_waiters:
+                        self._async_waiters.remove((loop, waiter))
+    
+    def available(self) -> bool:
+        with self._condition:
+            return not self._closed and self._in_flight < int(self.limit)
+    
+    def release(self, acquired_at: float, latency: float, overloaded: bool, healthy: bool):
+        with self._condition:
+            saturated = self._in_flight * 2 >= self.limit
+            self._in_flight -= 1
+            
+            if overloaded or latency > self.latency_target:
+                if acquired_at >= self._last_decrease and self.limit > self.min_limit:
+                    self.limit = max(float(self.min_limit), self.limit * self.decrease_factor)
+                    self._last_decrease = time.monotonic()
+                    self.decreases += 1
+            elif healthy and saturated and self.limit < self.max_limit:
+                self.limit = min(float(self.max_limit), self.limit + self.increase / self.limit)
+                self.increases += 1
+            
+            self._wake_waiters()
+    
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._wake_waiters()
+    
+    def snapshot(self) -> Dict:
+        with self._condition:
+            return {
+                "limit": round(self.limit, 2),
+                "minLimit": self.min_limit,
+                "maxLimit": self.max_limit,
+                "latencyTarget": self.latency_target,
+                "inFlight": self._in_flight,
+                "maxInFlight": self.max_in_flight,
+                "increases": self.increases,
+                "decreases": self.decreases,
+                "waits": self.waits,
+                "rejected": self.rejected
+            }
+    
+    def _wake_waiters(self):
+        self._condition.notify_all()
+        waiters, self._async_waiters = self._async_waiters, []
+        for loop, waiter in waiters:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(_resolve, waiter)
+
+
+def _resolve(waiter: asyncio.Future):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class FlowControl:
+    
+    def __init__(self, rate_limit_config: Optional[Dict] = None, concurrency_config: Optional[Dict] = None):
+        rate_limit_config = rate_limit_config or {}
+        concurrency_config = concurrency_config or {}
+        
+        self.max_retry_after = float(rate_limit_config.get('max_retry_after', 60))
+        self._classes: Dict[str, TokenBucket] = {}
+        if rate_limit_config.get('enabled', False):
+            for name, limits in rate_limit_config.get('classes', {}).items():
+                if float(limits.get('rate', 0)) > 0:
+                    self._classes[name] = TokenBucket(limits['rate'], limits.get('burst', limits['rate']))
+        self._prefixes = sorted((name for name in self._classes if name != DEFAULT_CLASS), key=len, reverse=True)
+        self._endpoint_classes: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+        
+        self.concurrency: Optional[AdaptiveConcurrencyLimiter] = None
+        if concurrency_config.get('enabled', True):
+            self.concurrency = AdaptiveConcurrencyLimiter(
+                initial_limit=concurrency_config.get('initial_limit', 16),
+                min_limit=concurrency_config.get('min_limit', 1),
+                max_limit=concurrency_config.get('max_limit', 100),
+                latency_target=concurrency_config.get('latency_target', 2.0),
+                decrease_factor=concurrency_config.get('decrease_factor', 0.5),
+                increase=concurrency_config.get('increase', 1.0)
+            )
+    
+    def endpoint_class(self, endpoint: str) -> Optional[str]:
+        with self._lock:
+            if endpoint in self._endpoint_classes:
+                return self._endpoint_classes[endpoint]
+            name = next((prefix for prefix in self._prefixes if endpoint.startswith(prefix)), None)
+            if name is None and DEFAULT_CLASS in self._classes:
+                name = DEFAULT_CLASS
+            self._endpoint_classes[endpoint] = name
+            return name
+    
+    def reserve(self, endpoint: str, max_wait: Optional[float]) -> float:
+        name = self.endpoint_class(endpoint)
+        if name is None:
+            return 0.0
+        wait = self._classes[name].reserve(max_wait)
+        if wait is None:
+            raise FlowControlTimeout(f"Ліміт запитів класу '{name}' не дозволяє запит до завершення дедлайну")
+        return wait
+    
+    def has_capacity(self, endpoint: str) -> bool:
+        name = self.endpoint_class(endpoint)
+        if name is not None and not self._classes[name].available():
+            return False
+        return self.concurrency is None or self.concurrency.available()
+    
+    def acquire(self, timeout: Optional[float]) -> Optional[float]:
+        if self.concurrency is None:
+            return None
+        acquired_at = self.concurrency.acquire(timeout)
+        if acquired_at is None:
+            raise FlowControlTimeout("Немає вільних слотів паралельності до завершення дедлайну")
+        return acquired_at
+    
+    async def acquire_async(self, timeout: Optional[float]) -> Optional[float]:
+        if self.concurrency is None:
+            return None
+        acquired_at = await self.concurrency.acquire_async(timeout)
+        if acquired_at is None:
+            raise FlowControlTimeout("Немає вільних слотів паралельності до завершення дедлайну")
+        return acquired_at
+    
+    def release(self, acquired_at: Optional[float], latency: float, outcome: str):
+        if self.concurrency is None or acquired_at is None:
+            return
+        self.concurrency.release(acquired_at, latency, overloaded=outcome in OVERLOAD_OUTCOMES,
+                                 healthy=outcome.isdigit() and int(outcome) < 500)
+    
+    def throttle(self, endpoint: str, retry_after: Optional[float]):
+        name = self.endpoint_class(endpoint)
+        if name is not None and retry_after:
+            self._classes[name].pause(retry_after)
+    
+    def retry_after(self, headers) -> Optional[float]:
+        return parse_retry_after(headers.get('Retry-After'), self.max_retry_after)
+    
+    def close(self):
+        if self.concurrency is not None:
+            self.concurrency.close()
+    
+    def get_stats(self) -> Dict:
+        return {
+            "classes": {name: bucket.snapshot() for name, bucket in sorted(self._classes.items())},
+            "concurrency": self.concurrency.snapshot() if self.concurrency is not None else None
+        }
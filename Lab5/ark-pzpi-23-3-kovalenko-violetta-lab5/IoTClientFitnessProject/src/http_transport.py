@@ -0,0 +1,175 @@
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import EmptyPoolError
+from compression import CompressionNegotiator
+from request_body import RequestBody
+from telemetry_codec import BatchFormatNegotiator
+
+
+class PoolStats:
+    
+    def __init__(self, pool_timeout: Optional[float] = None):
+        self.pool_timeout = pool_timeout
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts = 0
+        self._lock = threading.Lock()
+    
+    def record_checkout(self, waited: bool, wait_seconds: float):
+        with self._lock:
+            self.checkouts += 1
+            if waited:
+                self.waits += 1
+                self.wait_seconds += wait_seconds
+                self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+    
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+    
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "waitSeconds": round(self.wait_seconds, 3),
+                "maxWaitSeconds": round(self.max_wait_seconds, 3),
+                "timeouts": self.timeouts
+            }
+
+
+class _CountingPoolMixin:
+    
+    pool_stats: PoolStats = None
+    
+    def _get_conn(self, timeout: Optional[float] = None):
+        if timeout is None:
+            timeout = self.pool_stats.pool_timeout
+        
+        pool = self.pool
+        must_wait = self.block and pool is not None and pool.empty()
+        started_at = time.monotonic()
+        
+        try:
+            conn = super()._get_conn(timeout=timeout)
+        except EmptyPoolError:
+            self.pool_stats.record_timeout()
+            raise
+        
+        self.pool_stats.record_checkout(must_wait, time.monotonic() - started_at)
+        return conn
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    
+    def __init__(self, pool_stats: PoolStats, pool_connections: int = 10, pool_maxsize: int = 10,
+                 pool_block: bool = True):
+        self.pool_stats = pool_stats
+        super().__init__(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                         pool_block=pool_block)
+    
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+        attributes = {'pool_stats': self.pool_stats}
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': type('CountingHTTPConnectionPool', (_CountingPoolMixin, HTTPConnectionPool), attributes),
+            'https': type('CountingHTTPSConnectionPool', (_CountingPoolMixin, HTTPSConnectionPool), attributes)
+        }
+
+
+class HttpTransport:
+    
+    def __init__(self, server_config: Dict, headers: Optional[Dict] = None,
+                 compression: Optional[CompressionNegotiator] = None):
+        timeout = server_config.get('timeout', 10)
+        self.connect_timeout = float(server_config.get('connect_timeout', timeout))
+        self.read_timeout = float(server_config.get('read_timeout', timeout))
+        self.keep_alive = server_config.get('keep_alive', True)
+        self.pool_connections = int(server_config.get('pool_connections', 10))
+        self.pool_maxsize = int(server_config.get('pool_maxsize', 10))
+        self.pool_block = server_config.get('pool_block', True)
+        
+        self.compression = compression or CompressionNegotiator(server_config)
+        self.headers = dict(headers or {})
+        self.headers['Accept-Encoding'] = self.compression.accept_encoding
+        if not self.keep_alive:
+            self.headers['Connection'] = 'close'
+        
+        self.pool_stats = PoolStats(server_config.get('pool_timeout', self.connect_timeout))
+        self.adapter = PooledHTTPAdapter(
+            self.pool_stats,
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block
+        )
+        
+        self._local = threading.local()
+        self._sessions_created = 0
+        self._sessions_lock = threading.Lock()
+    
+    @property
+    def session(self) -> requests.Session:
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            session.mount('http://', self.adapter)
+            session.mount('https://', self.adapter)
+            self._local.session = session
+            with self._sessions_lock:
+                self._sessions_created += 1
+        return session
+    
+    def timeouts(self, limit: Optional[float] = None) -> Tuple[float, float]:
+        if limit is None:
+            return self.connect_timeout, self.read_timeout
+        limit = max(0.1, limit)
+        return min(self.connect_timeout, limit), min(self.read_timeout, limit)
+    
+    def request(self, method: str, url: str, limit: Optional[float] = None, json=None,
+                data: Optional[bytes] = None, headers: Optional[Dict] = None,
+                formats: Optional[BatchFormatNegotiator] = None, **kwargs) -> requests.Response:
+        if json is None and data is None:
+            response = self.session.request(method, url, timeout=self.timeouts(limit), headers=headers, **kwargs)
+            if not kwargs.get('stream'):
+                self._record_response(response)
+            return response
+        
+        body = RequestBody(url, self.compression, formats, payload=json, data=data)
+        while True:
+            request_headers = body.encode(headers)
+            response = self.session.request(method, url, data=body.wire_body, headers=request_headers,
+                                            timeout=self.timeouts(limit), **kwargs)
+            self._record_response(response)
+            if body.accept(response):
+                return response
+    
+    def _record_response(self, response: requests.Response):
+        decoded_size = len(response.content)
+        wire_size = decoded_size
+        if response.headers.get('Content-Encoding'):
+            try:
+                wire_size = response.raw.tell()
+            except (AttributeError, ValueError):
+                wire_size = int(response.headers.get('Content-Length') or decoded_size)
+        self.compression.record_response(decoded_size, wire_size)
+    
+    def get_pool_stats(self) -> Dict:
+        with self._sessions_lock:
+            sessions_created = self._sessions_created
+        return {
+            "poolConnections": self.pool_connections,
+            "poolMaxsize": self.pool_maxsize,
+            "sessionsCreated": sessions_created,
+            **self.pool_stats.snapshot()
+        }
+    
+    def close(self):
+        self.adapter.close()
@@ -0,0 +1,99 @@
+import codecs
+import json
+from typing import Any, Iterable, Iterator
+
+from payload_builder import decode_json
+
+
+WHITESPACE = ' \t\n\r'
+VALUE_TERMINATORS = WHITESPACE + ',]'
+
+
+class JsonArrayReader:
+    
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._scanner = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+        self.bytes_read = 0
+        self.items = 0
+    
+    def __iter__(self) -> Iterator[Any]:
+        if self._peek() != '[':
+            yield from self._read_whole()
+            return
+        
+        self._pos += 1
+        if self._peek() == ']':
+            return
+        
+        while True:
+            yield self._read_value()
+            self.items += 1
+            delimiter = self._peek()
+            self._pos += 1
+            if delimiter == ']':
+                return
+            if not delimiter:
+                raise ValueError("JSON-масив обірвався до завершення")
+            if delimiter != ',':
+                raise ValueError(f"Очікувалась ',' або ']' у JSON-масиві, отримано {delimiter!r}")
+    
+    def _peek(self) -> str:
+        while True:
+            buffer = self._buffer
+            length = len(buffer)
+            pos = self._pos
+            while pos < length and buffer[pos] in WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < length:
+                return buffer[pos]
+            if self._eof:
+                return ''
+            self._fill()
+    
+    def _read_value(self) -> Any:
+        while True:
+            if not self._peek():
+                raise ValueError("JSON-масив обірвався до завершення")
+            try:
+                value, end = self._scanner.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as e:
+                if self._eof:
+                    raise ValueError(f"Некоректний елемент JSON-масиву: {e}") from e
+                self._fill()
+                continue
+            
+            if not self._eof and (end == len(self._buffer) or self._buffer[end] not in VALUE_TERMINATORS):
+                self._fill()
+                continue
+            self._pos = end
+            return value
+    
+    def _read_whole(self) -> Iterator[Any]:
+        parts = [self._buffer[self._pos:]]
+        while not self._eof:
+            self._buffer, self._pos = '', 0
+            self._fill()
+            parts.append(self._buffer)
+        
+        text = ''.join(parts).strip()
+        data = decode_json(text) if text else None
+        if isinstance(data, list):
+            self.items = len(data)
+            yield from data
+    
+    def _fill(self):
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            text = self._decoder.decode(b'', final=True)
+        else:
+            self.bytes_read += len(chunk)
+            text = self._decoder.decode(chunk)
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
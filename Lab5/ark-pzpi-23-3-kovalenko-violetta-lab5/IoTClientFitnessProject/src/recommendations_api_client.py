@@ -1,5 +1,6 @@
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 from base_api_client import BaseApiClient
+from api_payloads import RECOMMENDATIONS_PATH, as_list, list_query_params
 
 
 class RecommendationsApiClient(BaseApiClient):
@@ -8,12 +9,20 @@ class RecommendationsApiClient(BaseApiClient):
         if user_id is None:
             user_id = self.user_id
         
-        url = f"{self.base_url}/api/recommendations/corrections"
+        url = f"{self.base_url}{RECOMMENDATIONS_PATH}"
         params = {"userId": user_id}
         
         response = self._make_request('GET', url, params=params)
         
         if response:
-            return response.json()
+            return as_list(response.json())
         return []
+    
+    def iter_recommendations(self, user_id: Optional[int] = None, limit: Optional[int] = None) -> Iterator[Dict]:
+        if user_id is None:
+            user_id = self.user_id
+        
+        url = f"{self.base_url}{RECOMMENDATIONS_PATH}"
+        recommendations = self._open_json_stream(url, list_query_params({"userId": user_id}, limit), limit)
+        return recommendations if recommendations is not None else iter(())
 
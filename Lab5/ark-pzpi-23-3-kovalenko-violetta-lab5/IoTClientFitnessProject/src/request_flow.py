@@ -0,0 +1,139 @@
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from circuit_breaker import CircuitBreaker
+from flow_control import THROTTLE_STATUSES, FlowControlTimeout
+
+
+logger = logging.getLogger(__name__)
+
+
+class RequestFlow:
+    
+    def __init__(self, client, method: str, url: str, params: Optional[Dict] = None, cacheable: bool = True):
+        self.client = client
+        self.endpoint = client._endpoint_key(method, url)
+        self.breaker = client._get_circuit_breaker(self.endpoint)
+        self.cache_key = None
+        self.cached = None
+        self.headers: Optional[Dict] = None
+        self.started_at = time.monotonic()
+        self.attempt = 0
+        self.last_error: Optional[str] = None
+        self.retry_after: Optional[float] = None
+        self.retryable = True
+        self.done = False
+        self.result: Any = None
+        self._admit(method, url, params, cacheable)
+    
+    def _admit(self, method: str, url: str, params: Optional[Dict], cacheable: bool):
+        client = self.client
+        client._count_request_stat(self.endpoint, 'requests')
+        
+        if not self.breaker.allow_request():
+            client._count_request_stat(self.endpoint, 'rejected')
+            logger.warning("[API] Сервер недоступний (%s), запит відхилено без очікування. "
+                           "Наступна спроба через %.0f сек", self.endpoint, self.breaker.retry_after())
+            self.done = True
+            return
+        
+        if cacheable:
+            self.cache_key, self.cached = client._lookup_cached_response(method, self.endpoint, url, params)
+        if self.cached is not None:
+            if self.cached.is_fresh():
+                self._finish(self.cached.response)
+                return
+            self.headers = self.cached.conditional_headers()
+        self.started_at = time.monotonic()
+    
+    def next_attempt(self) -> bool:
+        if self.done:
+            return False
+        
+        if self.attempt:
+            if self.client._closing.is_set():
+                self._fail()
+                return False
+            if not self.breaker.allow_request():
+                self.client._count_request_stat(self.endpoint, 'rejected')
+                self._fail()
+                return False
+        
+        self.attempt += 1
+        self.retry_after = None
+        return True
+    
+    def record_response(self, response):
+        client = self.client
+        status_code = response.status_code
+        if status_code < 400:
+            self.breaker.record_success()
+            self._finish(client._store_cached_response(self.endpoint, self.cache_key, self.cached, response))
+            return
+        
+        self.last_error = f"HTTP помилка {status_code}: {response.text}"
+        if status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        client._count_request_stat(self.endpoint, 'http_errors')
+        if status_code not in THROTTLE_STATUSES:
+            logger.warning("[API] %s", self.last_error)
+            self._finish(None)
+            return
+        
+        self.retry_after = client.flow_control.retry_after(response.headers)
+        client.flow_control.throttle(self.endpoint, self.retry_after)
+        client._count_request_stat(self.endpoint, 'throttled')
+    
+    def record_error(self, error: Exception, limit: Optional[float] = None):
+        client = self.client
+        if isinstance(error, FlowControlTimeout):
+            self.last_error = str(error)
+            client._count_request_stat(self.endpoint, 'rate_limited')
+            self.retryable = False
+            return
+        
+        if isinstance(error, client.timeout_errors):
+            self.last_error = client._timeout_message(limit)
+            client._count_request_stat(self.endpoint, 'timeouts')
+        elif isinstance(error, client.connection_errors):
+            self.last_error = "Помилка підключення до сервера"
+            client._count_request_stat(self.endpoint, 'connection_errors')
+        else:
+            self.last_error = f"Невідома помилка: {str(error)}"
+        self.breaker.record_failure()
+    
+    def retry_delay(self) -> Optional[float]:
+        if self.done:
+            return None
+        
+        client = self.client
+        delay = None
+        if self.retryable:
+            delay = client.retry_policy.next_delay(self.attempt, self.started_at, self.retry_after)
+        if delay is None or client._closing.is_set():
+            self._fail()
+            return None
+        
+        if self.breaker.state == CircuitBreaker.OPEN:
+            logger.warning("[API] Спроба %d/%d: %s. Сервер позначено недоступним, повтори припинено",
+                           self.attempt, client.retry_attempts, self.last_error)
+            self._fail()
+            return None
+        
+        logger.warning("[API] Спроба %d/%d: %s. Повтор через %.1f сек...",
+                       self.attempt, client.retry_attempts, self.last_error, delay)
+        client._count_request_stat(self.endpoint, 'retries')
+        return delay
+    
+    def _finish(self, result: Any):
+        self.done = True
+        self.result = result
+    
+    def _fail(self):
+        self.client._count_request_stat(self.endpoint, 'failures')
+        logger.error("[API] Не вдалося виконати запит після %d спроб. Остання помилка: %s",
+                     self.attempt, self.last_error)
+        self._finish(None)
@@ -0,0 +1,74 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from itertools import chain
+from operator import itemgetter
+from typing import Iterator, Tuple
+
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def to_micros(timestamp: datetime) -> int:
+    return (timestamp.replace(tzinfo=None) - EPOCH) // MICROSECOND
+
+
+def from_micros(micros: int) -> datetime:
+    return EPOCH + micros * MICROSECOND
+
+
+class SampleStore:
+    
+    def __init__(self):
+        self.timestamps = array('q')
+        self.values = array('d')
+    
+    def __len__(self) -> int:
+        return len(self.timestamps)
+    
+    def __iter__(self) -> Iterator[Tuple[datetime, float]]:
+        return ((from_micros(micros), value) for micros, value in zip(self.timestamps, self.values))
+    
+    def append(self, timestamp: datetime, value: float):
+        micros = to_micros(timestamp)
+        if not self.timestamps or micros >= self.timestamps[-1]:
+            self.timestamps.append(micros)
+            self.values.append(value)
+            return
+        
+        index = bisect_right(self.timestamps, micros)
+        self.timestamps.insert(index, micros)
+        self.values.insert(index, value)
+    
+    def extend(self, timestamps: array, values: array):
+        if not timestamps:
+            return
+        ordered = all(map(int.__le__, timestamps, timestamps[1:]))
+        if ordered and (not self.timestamps or timestamps[0] >= self.timestamps[-1]):
+            self.timestamps.extend(timestamps)
+            self.values.extend(values)
+            return
+        
+        merged = sorted(zip(chain(self.timestamps, timestamps), chain(self.values, values)), key=itemgetter(0))
+        self.timestamps = array('q', map(itemgetter(0), merged))
+        self.values = array('d', map(itemgetter(1), merged))
+    
+    def bounds(self, start: datetime, end: datetime) -> Tuple[int, int]:
+        low = bisect_left(self.timestamps, to_micros(start))
+        high = bisect_left(self.timestamps, to_micros(end), low)
+        return low, high
+    
+    def count(self, start: datetime, end: datetime) -> int:
+        low, high = self.bounds(start, end)
+        return high - low
+    
+    def slice(self, start: datetime, end: datetime) -> array:
+        low, high = self.bounds(start, end)
+        return self.values[low:high]
+    
+    def truncate_before(self, cutoff: datetime):
+        index = bisect_left(self.timestamps, to_micros(cutoff))
+        if index:
+            del self.timestamps[:index]
+            del self.values[:index]
@@ -1,8 +1,12 @@
+import logging
 import random
 from datetime import datetime, timedelta
 from typing import Dict, List
 
 
+logger = logging.getLogger(__name__)
+
+
 class SensorSimulator:
 
     def __init__(self):
@@ -19,7 +23,7 @@ class SensorSimulator:
     
     def reset_steps(self):
         self.steps_count = 0
-        print("Лічильник кроків скинуто")
+        logger.info("Лічильник кроків скинуто")
     
     def generate_sleep_data(self, date: datetime) -> Dict:
         total_sleep = random.randint(360, 540)
@@ -52,6 +56,7 @@ class SensorSimulator:
     def generate_telemetry_batch(self, count: int = 10) -> List[Dict]:
         batch = []
         now = datetime.now()
+        timestamps = {}
         
         for i in range(count):
             telemetry_type = random.choice([0, 1])
@@ -61,11 +66,14 @@ class SensorSimulator:
             else:
                 value = self.read_steps()
             
-            timestamp = now - timedelta(minutes=random.randint(0, 30), seconds=random.randint(0, 59))
+            offset = random.randint(0, 30) * 60 + random.randint(0, 59)
+            timestamp = timestamps.get(offset)
+            if timestamp is None:
+                timestamp = timestamps[offset] = (now - timedelta(seconds=offset)).isoformat()
             
             item = {
                 "deviceId": 1,
-                "timestamp": timestamp.isoformat(),
+                "timestamp": timestamp,
                 "telemetryType": telemetry_type,
                 "value": float(value),
                 "metadata": None
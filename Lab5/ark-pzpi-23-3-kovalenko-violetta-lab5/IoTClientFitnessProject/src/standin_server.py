@@ -0,0 +1,355 @@
+import argparse
+import gzip
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from api_payloads import SLEEP_RECORDS_PATH, TELEMETRY_BATCH_PATH, TELEMETRY_RECEIVE_PATH
+from payload_builder import decode_json, encode_json
+from standin_faults import FaultInjector, RequestAccounting, parse_fault_profiles
+from standin_state import StandInError, StandInState
+from telemetry_codec import FORMAT_CONTENT_TYPES, JSON_CONTENT_TYPE, available_content_types, decode_batch
+
+
+ADMIN_PREFIX = '/standin'
+
+
+def _int_param(query: Dict[str, List[str]], name: str) -> Optional[int]:
+    values = query.get(name)
+    if not values:
+        return None
+    try:
+        return int(values[0])
+    except ValueError:
+        raise StandInError(400, f"Invalid {name}: {values[0]}")
+
+
+def _int_segment(value: str) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        raise StandInError(404, f"Not found: {value}")
+
+
+class StandInRequestHandler(BaseHTTPRequestHandler):
+    
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    server: "StandInHttpServer"
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def do_GET(self):
+        self._handle('GET')
+    
+    def do_POST(self):
+        self._handle('POST')
+    
+    def _handle(self, method: str):
+        started = time.perf_counter()
+        path, _, query = self.path.partition('?')
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        
+        route, action, args = self._resolve(method, path.rstrip('/').lower())
+        delay, error = (0.0, None) if route.startswith(f"{method} {ADMIN_PREFIX}") else self.server.faults.decide(route)
+        if delay:
+            time.sleep(delay)
+        
+        headers = None
+        if error is not None:
+            status, data = error, {"error": "Injected fault"}
+            retry_after = self.server.faults.retry_after(route)
+            if retry_after is not None:
+                headers = {"Retry-After": str(retry_after)}
+        else:
+            try:
+                status, data = action(body, parse_qs(query) if query else {}, *args)
+            except StandInError as e:
+                status, data, headers = e.status, {"error": str(e)}, e.headers
+        
+        sent = self._send_json(status, data, headers)
+        content_type = self.headers.get('Content-Type') if method == 'POST' else None
+        self.server.accounting.record(route, status, len(body), sent, time.perf_counter() - started,
+                                      injected=error is not None,
+                                      content_type=content_type.split(';')[0].strip().lower() if content_type else None)
+    
+    def _resolve(self, method: str, path: str) -> Tuple[str, Callable, Tuple]:
+        segments = path.strip('/').split('/')
+        head, tail = '/'.join(segments[:3]), segments[3:]
+        
+        if method == 'GET':
+            if head in ('api/statistics/daily', 'api/statistics/weekly') and len(tail) == 1:
+                return f"GET /{head}/{{date}}", self._get_statistics, (segments[2], tail[0])
+            if segments[:2] == ['api', 'dailydietplans']:
+                if len(segments) == 2:
+                    return "GET /api/dailydietplans", self._list_plans, ()
+                if len(segments) == 3:
+                    return "GET /api/dailydietplans/{id}", self._get_plan, (segments[2],)
+                if len(segments) == 4 and segments[3] == 'meals':
+                    return "GET /api/dailydietplans/{id}/meals", self._get_plan_meals, (segments[2],)
+            if segments[:2] == ['api', 'recipes'] and len(segments) == 3:
+                return "GET /api/recipes/{id}", self._get_recipe, (segments[2],)
+            if segments[:2] == ['api', 'userprofiles']:
+                if len(segments) == 2:
+                    return "GET /api/userprofiles", self._list_profiles, ()
+                if len(segments) == 3:
+                    return "GET /api/userprofiles/{id}", self._get_profile, (segments[2], False)
+                if len(segments) == 4 and segments[3] == 'details':
+                    return "GET /api/userprofiles/{id}/details", self._get_profile, (segments[2], True)
+            if path == '/api/recommendations/corrections':
+                return "GET /api/recommendations/corrections", self._list_corrections, ()
+            if path == f"{ADMIN_PREFIX}/stats":
+                return f"GET {ADMIN_PREFIX}/stats", self._get_stats, ()
+        elif method == 'POST':
+            if path == TELEMETRY_BATCH_PATH.lower():
+                return f"POST {TELEMETRY_BATCH_PATH}", self._receive_batch, ()
+            if path == TELEMETRY_RECEIVE_PATH.lower():
+                return f"POST {TELEMETRY_RECEIVE_PATH}", self._receive_single, ()
+            if path == SLEEP_RECORDS_PATH.lower():
+                return f"POST {SLEEP_RECORDS_PATH}", self._receive_sleep_record, ()
+            if path == '/api/dailydietplans/generate':
+                return "POST /api/dailydietplans/generate", self._generate_plan, ()
+            if path == f"{ADMIN_PREFIX}/faults":
+                return f"POST {ADMIN_PREFIX}/faults", self._set_faults, ()
+            if path == f"{ADMIN_PREFIX}/reset":
+                return f"POST {ADMIN_PREFIX}/reset", self._reset_accounting, ()
+        
+        return f"{method} (unmatched)", self._not_found, ()
+    
+    def _not_found(self, body: bytes, query: Dict):
+        raise StandInError(404, "Not found")
+    
+    def _decode_body(self, body: bytes) -> bytes:
+        encoding = (self.headers.get('Content-Encoding') or 'identity').lower()
+        try:
+            if encoding == 'gzip':
+                return gzip.decompress(body)
+            if encoding == 'deflate':
+                return zlib.decompress(body)
+        except (OSError, EOFError, zlib.error) as e:
+            raise StandInError(400, f"Invalid {encoding} body: {e}")
+        if encoding == 'identity':
+            return body
+        raise StandInError(415, f"Unsupported Content-Encoding: {encoding}", {"Accept-Encoding": "gzip, deflate"})
+    
+    def _decode_json_body(self, body: bytes):
+        try:
+            return decode_json(self._decode_body(body))
+        except ValueError as e:
+            raise StandInError(400, str(e))
+    
+    def _receive_batch(self, body: bytes, query: Dict):
+        body = self._decode_body(body)
+        content_type = (self.headers.get('Content-Type') or JSON_CONTENT_TYPE).split(';')[0].strip().lower()
+        if content_type not in self.server.accepted_content_types:
+            raise StandInError(415, f"Unsupported Content-Type: {content_type}",
+                               {"Accept-Post": ', '.join(self.server.accepted_content_types)})
+        
+        try:
+            items = decode_batch(body, content_type)
+        except (ValueError, KeyError, TypeError) as e:
+            raise StandInError(400, str(e))
+        
+        accepted, duplicates = self.server.record_samples(items, content_type, len(body))
+        return 200, {"received": accepted, "duplicates": duplicates}
+    
+    def _receive_single(self, body: bytes, query: Dict):
+        item = self._decode_json_body(body)
+        accepted, duplicates = self.server.record_samples([item], JSON_CONTENT_TYPE, len(body))
+        return 200, {"received": accepted, "duplicates": duplicates}
+    
+    def _receive_sleep_record(self, body: bytes, query: Dict):
+        record = self._decode_json_body(body)
+        if not isinstance(record, dict):
+            raise StandInError(400, "Sleep record must be an object")
+        if self.server.record_sleep(record):
+            return 201, record
+        return 200, {**record, "duplicate": True}
+    
+    def _get_statistics(self, body: bytes, query: Dict, period: str, date: str):
+        _int_param(query, 'userId')
+        if period == 'daily':
+            return 200, self.server.state.daily_statistics(date)
+        return 200, self.server.state.weekly_statistics(date)
+    
+    def _list_plans(self, body: bytes, query: Dict):
+        order_by = query.get('orderBy', [None])[0]
+        return 200, self.server.state.list_plans(_int_param(query, 'userId'), _int_param(query, 'limit'), order_by)
+    
+    def _get_plan(self, body: bytes, query: Dict, plan_id: str):
+        return 200, self.server.state.get_plan(_int_segment(plan_id))
+    
+    def _get_plan_meals(self, body: bytes, query: Dict, plan_id: str):
+        return 200, self.server.state.get_plan_meals(_int_segment(plan_id))
+    
+    def _generate_plan(self, body: bytes, query: Dict):
+        return 201, self.server.state.generate_plan(self._decode_json_body(body))
+    
+    def _get_recipe(self, body: bytes, query: Dict, recipe_id: str):
+        return 200, self.server.state.get_recipe(_int_segment(recipe_id))
+    
+    def _list_profiles(self, body: bytes, query: Dict):
+        return 200, self.server.state.list_profiles(_int_param(query, 'userId'))
+    
+    def _get_profile(self, body: bytes, query: Dict, profile_id: str, details: bool):
+        return 200, self.server.state.get_profile(_int_segment(profile_id), details)
+    
+    def _list_corrections(self, body: bytes, query: Dict):
+        return 200, self.server.state.list_corrections(_int_param(query, 'userId'), _int_param(query, 'limit'))
+    
+    def _get_stats(self, body: bytes, query: Dict):
+        return 200, self.server.get_stats()
+    
+    def _set_faults(self, body: bytes, query: Dict):
+        config = self._decode_json_body(body)
+        if not isinstance(config, dict):
+            raise StandInError(400, "Fault configuration must be an object")
+        self.server.faults.configure(parse_fault_profiles(config))
+        return 200, self.server.faults.get_stats()
+    
+    def _reset_accounting(self, body: bytes, query: Dict):
+        self.server.accounting.reset()
+        return 200, self.server.accounting.get_stats()
+    
+    def _send_json(self, status: int, data, headers: Optional[Dict[str, str]] = None) -> int:
+        body = encode_json(data)
+        lines = [
+            f"{self.protocol_version} {status} {self.responses.get(status, ('',))[0]}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(body)}"
+        ]
+        lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+        if self.close_connection:
+            lines.append("Connection: close")
+        self.wfile.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+        return len(body)
+
+
+class StandInHttpServer(ThreadingHTTPServer):
+    
+    daemon_threads = True
+    request_queue_size = 256
+    
+    def __init__(self, address: Tuple[str, int], accepted_content_types: Optional[List[str]] = None,
+                 state: Optional[StandInState] = None, faults: Optional[FaultInjector] = None):
+        super().__init__(address, StandInRequestHandler)
+        self.accepted_content_types = [item.lower() for item in (accepted_content_types or available_content_types())]
+        self.state = state or StandInState()
+        self.faults = faults or FaultInjector()
+        self.accounting = RequestAccounting()
+        self.request_counts: Dict[str, int] = {}
+        self.bytes_received = 0
+        self._lock = threading.Lock()
+        self._thread = None
+    
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    @property
+    def samples(self) -> List[Dict]:
+        return self.state.samples
+    
+    @property
+    def sleep_records(self) -> List[Dict]:
+        return self.state.sleep_records
+    
+    @property
+    def duplicates(self) -> int:
+        return self.state.duplicates
+    
+    def record_samples(self, items: List[Dict], content_type: str, size: int) -> Tuple[int, int]:
+        with self._lock:
+            self.request_counts[content_type] = self.request_counts.get(content_type, 0) + 1
+            self.bytes_received += size
+        return self.state.record_samples(items)
+    
+    def record_sleep(self, record: Dict) -> bool:
+        return self.state.record_sleep(record)
+    
+    def get_stats(self) -> Dict:
+        with self._lock:
+            formats = {"requests": dict(self.request_counts), "bytesReceived": self.bytes_received}
+        return {
+            "state": self.state.get_stats(),
+            "formats": formats,
+            "faults": self.faults.get_stats(),
+            "accounting": self.accounting.get_stats()
+        }
+    
+    def start(self) -> "StandInHttpServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Локальний сервер-замінник FitnessProject для тестів і бенчмарків")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5006)
+    parser.add_argument('--formats', default='columnar,msgpack,json',
+                        help="Формати батчів (json, columnar, msgpack або тип вмісту) через кому")
+    parser.add_argument('--users', type=int, default=3, help="Кількість користувачів з профілями та планами")
+    parser.add_argument('--recipes', type=int, default=24, help="Кількість рецептів у каталозі")
+    parser.add_argument('--latency', type=float, default=0.0, help="Фіксована затримка відповіді, сек")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Випадкова додаткова затримка до N сек")
+    parser.add_argument('--slow-rate', type=float, default=0.0, help="Частка повільних відповідей (0..1)")
+    parser.add_argument('--slow-latency', type=float, default=0.0, help="Додаткова затримка повільних відповідей, сек")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Частка відповідей з помилкою (0..1)")
+    parser.add_argument('--error-status', type=int, default=503, help="HTTP-статус штучних помилок")
+    parser.add_argument('--retry-after', type=float, default=None, help="Значення Retry-After для штучних помилок")
+    parser.add_argument('--faults', default=None,
+                        help="JSON-файл з налаштуваннями збоїв, зокрема 'routes' для окремих маршрутів")
+    parser.add_argument('--seed', type=int, default=None, help="Зерно генератора збоїв")
+    args = parser.parse_args()
+    
+    fault_config = {
+        "latency": args.latency,
+        "jitter": args.jitter,
+        "slow_rate": args.slow_rate,
+        "slow_latency": args.slow_latency,
+        "error_rate": args.error_rate,
+        "error_status": args.error_status,
+        "retry_after": args.retry_after
+    }
+    if args.faults:
+        with open(args.faults, 'r', encoding='utf-8') as f:
+            fault_config.update(json.load(f))
+    
+    formats = [item.strip() for item in args.formats.split(',') if item.strip()]
+    server = StandInHttpServer(
+        (args.host, args.port),
+        [FORMAT_CONTENT_TYPES.get(item, item) for item in formats],
+        state=StandInState(users=args.users, recipes=args.recipes),
+        faults=FaultInjector(parse_fault_profiles(fault_config), seed=args.seed)
+    )
+    print(f"[StandIn] Сервер слухає {server.base_url}")
+    print(f"[StandIn] Формати батчів: {', '.join(server.accepted_content_types)}")
+    print(f"[StandIn] Збої: {json.dumps(server.faults.get_stats(), ensure_ascii=False)}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        accounting = server.accounting.get_stats()
+        print(f"[StandIn] Отримано записів: {len(server.samples)}, запитів: {accounting['requests']} "
+              f"({accounting['requestsPerSecond']}/сек), штучних помилок: {accounting['injectedErrors']}, "
+              f"відхилено дублікатів: {server.duplicates}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,11 @@
+import logging
 from typing import Dict, Optional
 from datetime import datetime
 from base_api_client import BaseApiClient
+from api_payloads import daily_statistics_path, weekly_statistics_path
+
+
+logger = logging.getLogger(__name__)
 
 
 class StatisticsApiClient(BaseApiClient):
@@ -10,45 +15,36 @@ class StatisticsApiClient(BaseApiClient):
             user_id = self.user_id
         
         if user_id is None:
-            print(f"[API] Помилка: user_id не визначено!")
+            logger.error("[API] Помилка: user_id не визначено!")
             return None
         
-        date_str = date.strftime("%Y-%m-%d")
-        url = f"{self.base_url}/api/statistics/daily/{date_str}"
+        url = f"{self.base_url}{daily_statistics_path(date)}"
         params = {"userId": user_id}
         
-        print(f"[API] Запит статистики за день:")
-        print(f"[API]   URL: {url}")
-        print(f"[API]   Параметри: {params}")
-        print(f"[API]   User ID: {user_id} (тип: {type(user_id)})")
+        logger.debug("[API] Запит статистики за день: %s, параметри: %s", url, params)
         
         response = self._make_request('GET', url, params=params)
         
         if response:
             try:
-                print(f"[API] Статус відповіді: {response.status_code}")
                 data = response.json()
-                print(f"[API] Отримано статистику: {len(str(data))} символів")
-                print(f"[API] Структура даних: {list(data.keys()) if isinstance(data, dict) else type(data)}")
+                logger.debug("[API] Отримано статистику (статус %s): %s", response.status_code,
+                             list(data.keys()) if isinstance(data, dict) else type(data))
                 return data
             except Exception as e:
-                print(f"[API] Помилка парсингу JSON: {e}")
-                print(f"[API] Відповідь (перші 500 символів): {response.text[:500]}")
+                logger.error("[API] Помилка парсингу JSON: %s. Відповідь (перші 500 символів): %s",
+                             e, response.text[:500])
                 return None
         else:
-            print(f"[API] Не вдалося отримати статистику (response=None)")
-            print(f"[API] Перевірте:")
-            print(f"[API] 1. Чи працює сервер на {self.base_url}")
-            print(f"[API] 2. Чи правильний user_id: {user_id}")
-            print(f"[API] 3. Чи є дані для цього користувача на сервері")
+            logger.warning("[API] Не вдалося отримати статистику: перевірте, чи працює сервер на %s, "
+                           "чи правильний user_id (%s) і чи є дані для цього користувача", self.base_url, user_id)
             return None
     
     def get_weekly_statistics(self, start_date: datetime, user_id: Optional[int] = None) -> Optional[Dict]:
         if user_id is None:
             user_id = self.user_id
         
-        date_str = start_date.strftime("%Y-%m-%d")
-        url = f"{self.base_url}/api/statistics/weekly/{date_str}"
+        url = f"{self.base_url}{weekly_statistics_path(start_date)}"
         params = {"userId": user_id}
         
         response = self._make_request('GET', url, params=params)
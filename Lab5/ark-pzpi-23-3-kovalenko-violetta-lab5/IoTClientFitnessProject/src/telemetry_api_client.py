@@ -1,68 +1,137 @@
+import logging
 from typing import Dict, List, Optional
 from datetime import datetime
 from base_api_client import BaseApiClient
+from api_payloads import (TELEMETRY_RECEIVE_PATH, TELEMETRY_BATCH_PATH, SLEEP_RECORDS_PATH,
+                          build_telemetry_batch_payload,
+                          build_sleep_record_payload)
+from config_manager import ConfigManager
+from request_metrics import MetricsSink
+from payload_builder import TelemetryPayloadBuilder
+from telemetry_batcher import TelemetryBatcher
+from telemetry_outbox import create_telemetry_outbox
+
+
+logger = logging.getLogger(__name__)
 
 
 class TelemetryApiClient(BaseApiClient):
     
+    def __init__(self, config_manager: ConfigManager, metrics: Optional[MetricsSink] = None):
+        super().__init__(config_manager, metrics)
+        self.payload_builder = TelemetryPayloadBuilder(self.device_id, self.sequence_journal)
+        
+        self.telemetry_outbox = create_telemetry_outbox(self.config, self._deliver_outbox_records)
+        
+        data_config = self.config.get('data', {})
+        self.telemetry_batcher = None
+        if data_config.get('batching_enabled', False):
+            self.telemetry_batcher = TelemetryBatcher(
+                self.send_telemetry_batch,
+                batch_size=data_config.get('batch_size', 5),
+                max_age=data_config.get('send_interval', 15),
+                max_pending=data_config.get('max_pending', 1000)
+            )
+    
     def send_telemetry(self, telemetry_type: int, value: float, 
                       timestamp: datetime, metadata: Optional[Dict] = None) -> bool:
-        url = f"{self.base_url}/api/telemetry/receive"
+        url = f"{self.base_url}{TELEMETRY_RECEIVE_PATH}"
         
-        payload = {
-            "deviceId": self.device_id,
-            "timestamp": timestamp.isoformat(),
-            "telemetryType": telemetry_type,
-            "value": float(value),
-            "metadata": metadata
-        }
+        if self.telemetry_batcher is not None or self.telemetry_outbox is not None:
+            payload = self.payload_builder.build(telemetry_type, value, timestamp, metadata)
+            
+            if self.telemetry_batcher is not None and self.telemetry_batcher.add(payload):
+                logger.debug("[API] Телеметрію додано до батчу: тип=%s, значення=%s", telemetry_type, value)
+                return True
+            
+            if self.telemetry_outbox is not None and self.telemetry_outbox.append('telemetry', [payload]):
+                logger.debug("[API] Телеметрію збережено у черзі відправки: тип=%s, значення=%s", telemetry_type, value)
+                return True
         
-        response = self._make_request('POST', url, payload=payload)
+        body = self.payload_builder.encode(telemetry_type, value, timestamp, metadata)
+        response = self._make_request('POST', url, data=body)
         
         if response:
-            print(f"[API] Телеметрія відправлена: тип={telemetry_type}, значення={value}")
+            self._invalidate_statistics([{'timestamp': timestamp}], 'timestamp')
+            logger.debug("[API] Телеметрія відправлена: тип=%s, значення=%s", telemetry_type, value)
             return True
         else:
-            print(f"[API] Не вдалося відправити телеметрію: тип={telemetry_type}, значення={value}")
+            logger.warning("[API] Не вдалося відправити телеметрію: тип=%s, значення=%s", telemetry_type, value)
             return False
     
     def send_telemetry_batch(self, items: List[Dict]) -> bool:
-        url = f"{self.base_url}/api/telemetry/receive/batch"
+        items = self.payload_builder.with_keys(items)
+        if self.telemetry_outbox is not None and self.telemetry_outbox.append('telemetry', items):
+            logger.debug("[API] Батч телеметрії збережено у черзі відправки: %d записів", len(items))
+            return True
         
-        payload = {
-            "items": items
-        }
+        return self._post_telemetry_batch(items)
+    
+    def send_sleep_record(self, sleep_data: Dict) -> bool:
+        payload = build_sleep_record_payload(self.device_id, sleep_data, self.payload_builder.next_key())
         
-        response = self._make_request('POST', url, payload=payload)
+        if self.telemetry_outbox is not None and self.telemetry_outbox.append('sleep', [payload]):
+            logger.info("[API] Дані про сон збережено у черзі відправки: %s хвилин", sleep_data.get('totalSleepMinutes', 0))
+            return True
+        
+        return self._post_sleep_record(payload)
+    
+    def flush(self) -> bool:
+        flushed = True
+        if self.telemetry_batcher is not None:
+            flushed = self.telemetry_batcher.flush()
+        if self.telemetry_outbox is not None:
+            flushed = self.telemetry_outbox.drain() and flushed
+        return flushed
+    
+    def get_pending_telemetry_count(self) -> int:
+        pending = 0
+        if self.telemetry_batcher is not None:
+            pending += self.telemetry_batcher.pending_count()
+        if self.telemetry_outbox is not None:
+            pending += self.telemetry_outbox.pending_count()
+        return pending
+    
+    def close(self):
+        if self.telemetry_batcher is not None:
+            self.telemetry_batcher.close()
+        if self.telemetry_outbox is not None:
+            self.telemetry_outbox.close()
+        super().close()
+    
+    def _post_telemetry_batch(self, items: List[Dict]) -> bool:
+        url = f"{self.base_url}{TELEMETRY_BATCH_PATH}"
+        
+        payload = build_telemetry_batch_payload(items)
+        
+        response = self._make_request('POST', url, payload=payload, formats=self.batch_formats)
         
         if response:
-            print(f"[API] Батч телеметрії відправлено: {len(items)} записів")
+            self._invalidate_statistics(items, 'timestamp')
+            logger.info("[API] Батч телеметрії відправлено: %d записів", len(items))
             return True
         else:
-            print(f"[API] Не вдалося відправити батч телеметрії: {len(items)} записів")
+            logger.warning("[API] Не вдалося відправити батч телеметрії: %d записів", len(items))
             return False
     
-    def send_sleep_record(self, sleep_data: Dict) -> bool:
-        url = f"{self.base_url}/api/SleepRecords"
-        
-        payload = {
-            "deviceId": self.device_id,
-            **sleep_data
-        }
-        
-        if 'date' in payload and isinstance(payload['date'], datetime):
-            payload['date'] = payload['date'].date().isoformat()
-        if 'startTime' in payload and isinstance(payload['startTime'], datetime):
-            payload['startTime'] = payload['startTime'].isoformat()
-        if 'endTime' in payload and isinstance(payload['endTime'], datetime):
-            payload['endTime'] = payload['endTime'].isoformat()
+    def _post_sleep_record(self, payload: Dict) -> bool:
+        url = f"{self.base_url}{SLEEP_RECORDS_PATH}"
         
         response = self._make_request('POST', url, payload=payload)
         
         if response:
-            print(f"[API] Дані про сон відправлено: {sleep_data.get('totalSleepMinutes', 0)} хвилин")
+            self._invalidate_statistics([payload], 'date', 'endTime', 'startTime')
+            logger.info("[API] Дані про сон відправлено: %s хвилин", payload.get('totalSleepMinutes', 0))
             return True
         else:
-            print(f"[API] Не вдалося відправити дані про сон")
+            logger.warning("[API] Не вдалося відправити дані про сон")
             return False
+    
+    def _deliver_outbox_records(self, kind: str, payloads: List[Dict]) -> bool:
+        if kind == 'telemetry':
+            return self._post_telemetry_batch(payloads)
+        if kind == 'sleep':
+            return self._post_sleep_record(payloads[0])
+        logger.error("[Outbox] Невідомий тип запису: %s", kind)
+        return False
 
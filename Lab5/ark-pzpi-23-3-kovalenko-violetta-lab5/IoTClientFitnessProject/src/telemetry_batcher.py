@@ -0,0 +1,200 @@
+import asyncio
+import atexit
+import logging
+import threading
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+class TelemetryBatcher:
+    
+    def __init__(self, send_batch: Callable[[List[Dict]], bool], batch_size: int = 5,
+                 max_age: float = 15.0, max_pending: int = 1000):
+        self.send_batch = send_batch
+        self.batch_size = max(1, int(batch_size))
+        self.max_age = max(0.0, float(max_age))
+        self.max_pending = max(self.batch_size, int(max_pending))
+        self.dropped_count = 0
+        
+        self._buffer: List[Dict] = []
+        self._oldest_at: Optional[float] = None
+        self._retry_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        
+        self._thread = threading.Thread(target=self._run, name="TelemetryBatcher", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+    
+    def add(self, item: Dict) -> bool:
+        with self._lock:
+            if self._closed:
+                return False
+            self._buffer.append(item)
+            self._trim_locked()
+            is_first = self._oldest_at is None
+            if is_first:
+                self._oldest_at = time.monotonic()
+            is_full = len(self._buffer) >= self.batch_size
+        
+        if is_first or is_full:
+            self._wakeup.set()
+        return True
+    
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._buffer)
+    
+    def flush(self) -> bool:
+        with self._flush_lock:
+            with self._lock:
+                items = self._buffer
+                self._buffer = []
+                self._oldest_at = None
+            
+            if not items:
+                return True
+            
+            try:
+                sent = self.send_batch(items)
+            except Exception:
+                self._requeue(items)
+                raise
+            
+            if sent:
+                with self._lock:
+                    self._retry_at = None
+            else:
+                self._requeue(items)
+            return sent
+    
+    def close(self) -> bool:
+        with self._lock:
+            if self._closed:
+                return True
+            self._closed = True
+        
+        self._wakeup.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.max_age + 1)
+        
+        try:
+            flushed = self.flush()
+        except Exception as e:
+            logger.exception("[API] Помилка відправки батчу телеметрії під час закриття: %s", e)
+            flushed = False
+        
+        lost = self.pending_count()
+        if lost:
+            logger.error("[API] Батчер телеметрії закрито, не відправлено %d записів", lost)
+        if self.dropped_count:
+            logger.error("[API] За час роботи батчера відкинуто %d записів телеметрії через переповнення буфера",
+                         self.dropped_count)
+        return flushed and not lost and not self.dropped_count
+    
+    def _seconds_until_due(self) -> Optional[float]:
+        with self._lock:
+            if not self._buffer:
+                return None
+            now = time.monotonic()
+            if self._retry_at is not None and self._retry_at > now:
+                return self._retry_at - now
+            if len(self._buffer) >= self.batch_size:
+                return 0.0
+            return max(0.0, self._oldest_at + self.max_age - now)
+    
+    def _requeue(self, items: List[Dict]):
+        with self._lock:
+            self._buffer = items + self._buffer
+            self._trim_locked()
+            if self._oldest_at is None:
+                self._oldest_at = time.monotonic()
+            self._retry_at = time.monotonic() + max(1.0, self.max_age)
+        logger.warning("[API] Батч телеметрії не відправлено, %d записів повернуто до буфера для повторної спроби",
+                       len(items))
+    
+    def _trim_locked(self):
+        dropped = len(self._buffer) - self.max_pending
+        if dropped > 0:
+            del self._buffer[:dropped]
+            self.dropped_count += dropped
+            logger.warning("[API] Буфер телеметрії переповнено, відкинуто %d найстаріших записів", dropped)
+    
+    def _run(self):
+        while True:
+            self._wakeup.wait(self._seconds_until_due())
+            self._wakeup.clear()
+            
+            with self._lock:
+                if self._closed:
+                    return
+            
+            if self._seconds_until_due() == 0.0:
+                try:
+                    self.flush()
+                except Exception as e:
+                    logger.exception("[API] Помилка фонової відправки батчу телеметрії: %s", e)
+
+
+class AsyncTelemetryBatcher:
+    
+    def __init__(self, send_batch: Callable[[List[Dict]], Awaitable[bool]], batch_size: int = 5):
+        self.send_batch = send_batch
+        self.batch_size = max(1, int(batch_size))
+        self.closed = False
+        
+        self._pending: List[Tuple[Dict, asyncio.Future]] = []
+        self._scheduled: Optional[asyncio.Handle] = None
+        self._sending: Set[asyncio.Future] = set()
+    
+    async def add(self, item: Dict) -> bool:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.batch_size:
+            self._dispatch()
+        elif self._scheduled is None:
+            self._scheduled = loop.call_soon(self._dispatch)
+        return await future
+    
+    def pending_count(self) -> int:
+        return len(self._pending)
+    
+    async def flush(self) -> bool:
+        self._dispatch()
+        if not self._sending:
+            return True
+        return all(await asyncio.gather(*self._sending))
+    
+    async def close(self) -> bool:
+        self.closed = True
+        return await self.flush()
+    
+    def _dispatch(self):
+        if self._scheduled is not None:
+            self._scheduled.cancel()
+            self._scheduled = None
+        
+        while self._pending:
+            batch = self._pending[:self.batch_size]
+            del self._pending[:self.batch_size]
+            task = asyncio.ensure_future(self._send(batch))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+    
+    async def _send(self, batch: List[Tuple[Dict, asyncio.Future]]) -> bool:
+        try:
+            sent = await self.send_batch([item for item, _ in batch])
+        except Exception as e:
+            logger.exception("[API] Помилка відправки батчу телеметрії: %s", e)
+            sent = False
+        
+        for _, future in batch:
+            if not future.done():
+                future.set_result(sent)
+        return sent
@@ -1,5 +1,10 @@
-from typing import Dict, Optional
+import logging
+from typing import Dict, Iterator, Optional
 from base_api_client import BaseApiClient
+from api_payloads import USER_PROFILES_PATH, list_query_params, user_profile_details_path, user_profile_path
+
+
+logger = logging.getLogger(__name__)
 
 
 class UserApiClient(BaseApiClient):
@@ -9,33 +14,48 @@ class UserApiClient(BaseApiClient):
             user_id = self.user_id
         
         if user_id is None:
-            print(f"[API] Помилка: user_id не визначено для завантаження профілю")
+            logger.error("[API] Помилка: user_id не визначено для завантаження профілю")
             return None
         
-        url = f"{self.base_url}/api/userprofiles"
-        params = {}
+        try:
+            profile = self._find_user_profile(user_id)
+        except ValueError as e:
+            logger.error("[API] Помилка парсингу профілів: %s", e)
+            return None
         
-        print(f"[API] Запит профілю користувача: user_id={user_id}")
-        response = self._make_request('GET', url, params=params)
+        if profile is None:
+            logger.warning("[API] Профіль для користувача %s не знайдено", user_id)
+        return profile
+    
+    def _find_user_profile(self, user_id: int) -> Optional[Dict]:
+        directory = self.profile_directory
+        url = f"{self.base_url}{USER_PROFILES_PATH}"
         
-        if response:
-            try:
-                profiles = response.json()
-                print(f"[API] Отримано профілів: {len(profiles) if isinstance(profiles, list) else 'не список'}")
-                if isinstance(profiles, list):
-                    for profile in profiles:
-                        profile_user_id = profile.get('userId')
-                        print(f"[API] Перевірка профілю: userId={profile_user_id}, шукаємо {user_id}")
-                        if profile_user_id == user_id:
-                            print(f"[API] Знайдено профіль для користувача {user_id}")
-                            return profile
-                print(f"[API] Профіль для користувача {user_id} не знайдено")
-            except Exception as e:
-                print(f"[API] Помилка парсингу профілів: {e}")
-        return None
+        if directory.supports_query():
+            response = self._make_request('GET', url, params={"userId": user_id})
+            return directory.resolve_query(user_id, response.json()) if response else None
+        
+        profile = directory.lookup(user_id)
+        if profile is not None and directory.is_stale(user_id) and profile.get('profileId') is not None:
+            response = self._make_request('GET', f"{self.base_url}{user_profile_path(profile['profileId'])}")
+            if response:
+                profile = directory.update(user_id, response.json())
+        
+        if profile is None and directory.needs_reload():
+            logger.debug("[API] Оновлення індексу профілів користувачів")
+            profiles = self._open_json_stream(url)
+            if profiles is not None:
+                directory.load(profiles)
+                profile = directory.lookup(user_id)
+        return profile
+    
+    def iter_user_profiles(self, limit: Optional[int] = None, order_by: Optional[str] = None) -> Iterator[Dict]:
+        url = f"{self.base_url}{USER_PROFILES_PATH}"
+        profiles = self._open_json_stream(url, list_query_params({}, limit, order_by), limit)
+        return profiles if profiles is not None else iter(())
     
     def get_user_profile_details(self, profile_id: int) -> Optional[Dict]:
-        url = f"{self.base_url}/api/userprofiles/{profile_id}/details"
+        url = f"{self.base_url}{user_profile_details_path(profile_id)}"
         
         response = self._make_request('GET', url)
         
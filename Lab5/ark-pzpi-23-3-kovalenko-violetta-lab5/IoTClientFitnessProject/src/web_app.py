@@ -1,14 +1,20 @@
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request
 from flask_cors import CORS
 from datetime import datetime, timedelta
+import logging
+import math
 import threading
 import time
 import random
 from api_client import ApiClient
+from api_payloads import meal_recipe_ids
+from heart_rate_histogram import DEFAULT_MAX_HEART_RATE
 from sensor_simulator import SensorSimulator
 from statistics_calculator import StatisticsCalculator
 from config_manager import ConfigManager
 
+logger = logging.getLogger(__name__)
+
 app = Flask(__name__)
 CORS(app)
 
@@ -17,8 +23,8 @@ api_client = ApiClient(config_manager)
 sensor_simulator = SensorSimulator()
 stats_calculator = StatisticsCalculator()
 
-print(f"[WebApp] Config loaded, API base URL: {api_client.base_url}")
-print(f"[WebApp] User ID: {api_client.user_id}")
+logger.info("[WebApp] Config loaded, API base URL: %s", api_client.base_url)
+logger.info("[WebApp] User ID: %s", api_client.user_id)
 
 simulation_running = False
 simulation_thread = None
@@ -44,26 +50,55 @@ def get_home_data():
         
         today = datetime.now()
         stats = api_client.get_daily_statistics(today, user_id)
+        return jsonify(_home_view(stats))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/dashboard')
+def get_dashboard():
+    try:
+        user_id = api_client.user_id
+        if user_id is None:
+            return jsonify({'error': 'user_id not defined'}), 400
         
-        if not stats:
-            return jsonify({
-                'heartRate': 'Немає даних',
-                'steps': 'Немає даних',
-                'activity': 'Немає даних'
-            })
-        
-        steps = stats.get('steps', 0)
-        hr_avg = stats.get('heartRateAvg')
-        activity_score = _calculate_activity_score(stats)
+        snapshot = api_client.get_dashboard_snapshot(user_id, datetime.now())
+        if snapshot['failed']:
+            logger.warning("[WebApp] Dashboard parts failed: %s", ', '.join(snapshot['failed']))
         
-        return jsonify({
-            'heartRate': f"{float(hr_avg):.0f} bpm" if hr_avg is not None else "Немає даних",
-            'steps': f"{int(steps):,}" if steps else "0",
-            'activity': f"{activity_score}/100" if activity_score is not None else "Немає даних"
-        })
+        recipes = snapshot.get('recipes') or {}
+        snapshot['recipes'] = {str(recipe_id): recipe for recipe_id, recipe in recipes.items()}
+        snapshot['home'] = _home_view(snapshot.get('daily'))
+        return jsonify(snapshot)
     except Exception as e:
+        logger.exception("[WebApp] Error in dashboard: %s", e)
         return jsonify({'error': str(e)}), 500
 
+def _home_view(stats):
+    if not stats and not api_client.is_server_available():
+        return {
+            'heartRate': 'Сервер недоступний',
+            'steps': 'Сервер недоступний',
+            'activity': 'Сервер недоступний',
+            'serverAvailable': False
+        }
+    
+    if not stats:
+        return {
+            'heartRate': 'Немає даних',
+            'steps': 'Немає даних',
+            'activity': 'Немає даних'
+        }
+    
+    steps = stats.get('steps', 0)
+    hr_avg = stats.get('heartRateAvg')
+    activity_score = _calculate_activity_score(stats)
+    
+    return {
+        'heartRate': f"{float(hr_avg):.0f} bpm" if hr_avg is not None else "Немає даних",
+        'steps': f"{int(steps):,}" if steps else "0",
+        'activity': f"{activity_score}/100" if activity_score is not None else "Немає даних"
+    }
+
 def _calculate_activity_score(stats):
     try:
         hr_avg = stats.get('heartRateAvg')
@@ -103,16 +138,19 @@ def diet_plan():
                     plan_id = generated_plan.get('dailyDietPlanId')
             
             if not plan_id:
-                plans = api_client.get_daily_diet_plans(user_id)
-                if plans:
-                    plans_sorted = sorted(plans, key=lambda p: p.get('dailyDietPlanId', 0), reverse=True)
-                    plan_id = plans_sorted[0].get('dailyDietPlanId')
+                plan_id = api_client.get_latest_daily_diet_plan_id(user_id)
             
             if not plan_id:
                 return jsonify({'error': 'Failed to get plan ID', 'profile': user_profile}), 500
             
             plan_details = api_client.get_daily_diet_plan(plan_id)
-            return jsonify({'plan': plan_details, 'profile': user_profile})
+            meals = plan_details.get('meals', []) if isinstance(plan_details, dict) else []
+            recipes = api_client.get_recipes(meal_recipe_ids(meals))
+            return jsonify({
+                'plan': plan_details,
+                'profile': user_profile,
+                'recipes': {str(recipe_id): recipe for recipe_id, recipe in recipes.items()}
+            })
         except Exception as e:
             return jsonify({'error': str(e)}), 500
     
@@ -143,10 +181,21 @@ def statistics(period):
         
         return jsonify(stats or {})
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("[WebApp] Error in statistics: %s", e)
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/server-status')
+def server_status():
+    return jsonify(api_client.get_connection_status())
+
+@app.route('/api/metrics')
+def client_metrics():
+    return jsonify(api_client.get_metrics() or {})
+
+@app.route('/metrics')
+def prometheus_metrics():
+    return Response(api_client.export_metrics(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
 @app.route('/api/simulation/start', methods=['POST'])
 def start_simulation():
     global simulation_running, simulation_thread, simulation_logs
@@ -159,7 +208,7 @@ def start_simulation():
     simulation_thread = threading.Thread(target=simulation_loop, daemon=True)
     simulation_thread.start()
     
-    print(f"[API] Simulation started")
+    logger.info("[WebApp] Simulation started")
     return jsonify({'status': 'started'})
 
 @app.route('/api/simulation/stop', methods=['POST'])
@@ -183,9 +232,8 @@ def measure_heart_rate():
     try:
         now = datetime.now()
         hr = sensor_simulator.read_heart_rate()
-        print(f"[API] Sending heart rate: {hr} to {api_client.base_url}")
         success = api_client.send_telemetry(0, hr, now)
-        print(f"[API] Heart rate send result: {success}")
+        logger.debug("[WebApp] Heart rate %s sent to %s: %s", hr, api_client.base_url, success)
         
         if success:
             stats_calculator.add_heart_rate(hr, now)
@@ -197,19 +245,38 @@ def measure_heart_rate():
         else:
             return jsonify({'success': False, 'error': 'Failed to send telemetry'}), 500
     except Exception as e:
-        print(f"[API] Error in measure_heart_rate: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("[WebApp] Error in measure_heart_rate: %s", e)
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/heart-rate/distribution')
+def heart_rate_distribution():
+    try:
+        today = datetime.now()
+        max_heart_rate = DEFAULT_MAX_HEART_RATE
+        if 'maxHeartRate' in request.args:
+            try:
+                max_heart_rate = float(request.args['maxHeartRate'])
+            except ValueError:
+                max_heart_rate = math.nan
+        if not math.isfinite(max_heart_rate) or max_heart_rate <= 0:
+            return jsonify({'error': 'Invalid maxHeartRate'}), 400
+        
+        return jsonify({
+            'stats': stats_calculator.get_daily_heart_rate_stats(today),
+            'percentiles': stats_calculator.get_heart_rate_percentiles(today),
+            'zones': stats_calculator.get_heart_rate_zones(today, max_heart_rate)
+        })
+    except Exception as e:
+        logger.exception("[WebApp] Error in heart_rate_distribution: %s", e)
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/sleep', methods=['POST'])
 def send_sleep_data():
     try:
         today = datetime.now()
         sleep_data = sensor_simulator.generate_sleep_data(today)
-        print(f"[API] Sending sleep data to {api_client.base_url}")
         success = api_client.send_sleep_record(sleep_data)
-        print(f"[API] Sleep data send result: {success}")
+        logger.debug("[WebApp] Sleep data sent to %s: %s", api_client.base_url, success)
         
         if success:
             stats_calculator.add_sleep_record(sleep_data)
@@ -220,9 +287,7 @@ def send_sleep_data():
         else:
             return jsonify({'success': False, 'error': 'Failed to send sleep record'}), 500
     except Exception as e:
-        print(f"[API] Error in send_sleep_data: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("[WebApp] Error in send_sleep_data: %s", e)
         return jsonify({'success': False, 'error': str(e)}), 500
 
 def simulation_loop():
@@ -231,7 +296,7 @@ def simulation_loop():
     steps_interval = float(config['sensors']['steps_interval'])
     last_steps_send = time.time()
     
-    print(f"[Simulation] Loop started, interval: {steps_interval}s")
+    logger.info("[Simulation] Loop started, interval: %ss", steps_interval)
     simulation_logs.append(f"[{datetime.now().strftime('%H:%M:%S')}] Симуляція запущена")
     simulation_logs.append(f"[{datetime.now().strftime('%H:%M:%S')}] [Налаштування] Кроки: окрема телеметрія кожні {steps_interval}с (1-7 кроків)")
     
@@ -242,9 +307,8 @@ def simulation_loop():
         
         if steps_elapsed >= steps_interval:
             random_steps = random.randint(1, 7)
-            print(f"[Simulation] Sending {random_steps} steps to {api_client.base_url}")
             success = api_client.send_telemetry(1, float(random_steps), now)
-            print(f"[Simulation] Steps send result: {success}")
+            logger.debug("[Simulation] %d steps sent to %s: %s", random_steps, api_client.base_url, success)
             
             log_msg = f"[{now.strftime('%H:%M:%S')}] Кроки відправлено: {random_steps} кроків"
             if not success: